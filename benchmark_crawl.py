@@ -0,0 +1,131 @@
+"""End-to-end crawl benchmark against the local legalnews.com stand-in (replay_server.py).
+
+Starts the stand-in, runs requests-sessions.py once per crawl mode in a scratch
+folder and reports notices/sec, requests/sec and the peak memory of each run:
+
+    python benchmark_crawl.py --notices 2000 --latency-ms 50
+    python benchmark_crawl.py --modes threads,async --error-rate 0.01 --output before.json
+
+The Groq stage is skipped (no API key is passed), so only the crawl is measured.
+Its time runs from the first to the last request the server saw, which leaves
+out interpreter startup.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from replay_server import ReplayServer
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "requests-sessions.py")
+
+# Crawl modes: extra environment and command line arguments for each
+MODES = {
+    "threads": ({"CRAWL_ENGINE": "threads"}, ["--counties", "All Counties"]),
+    "async": ({"CRAWL_ENGINE": "async"}, ["--counties", "All Counties"]),
+    "counties": ({"CRAWL_ENGINE": "threads"}, ["--counties", "all-individually"]),
+    "shard": ({"CRAWL_ENGINE": "threads"}, ["--counties", "All Counties", "--shard"]),
+}
+
+
+def run_crawl(server, mode, args):
+    """Run one crawl in a scratch folder. Returns the measurements as a dict."""
+    mode_env, mode_args = MODES[mode]
+    with tempfile.TemporaryDirectory() as work_dir:
+        env = {
+            **os.environ,
+            "LEGALNEWS_BASE_URL": server.base_url,
+            "USER_NAME": "benchmark",
+            "PASSWORD": "benchmark",
+            "REQUESTS_PER_SECOND": str(args.requests_per_second),
+            "DETAIL_WORKERS": str(args.detail_workers),
+            "SHARD_MAX_RESULTS": str(max(10, args.notices // 8)),
+            # Nothing from earlier runs or a local .env may change what is fetched
+            "DETAIL_CACHE": "", "SESSION_FILE": "", "STATE_DB": "", "NOTICE_DB": "", "PARQUET_DIR": "",
+            "LLM_CACHE": "", "GROQ_API_KEY": "",
+            **mode_env,
+        }
+        command = [sys.executable, SCRIPT, *mode_args, "--start", "01/01/2025", "--end", "06/30/2025"]
+        server.reset_stats()
+        with open(os.path.join(work_dir, "crawl.log"), "w") as log:
+            process = subprocess.Popen(command, cwd=work_dir, env=env, stdout=log, stderr=subprocess.STDOUT,
+                                       stdin=subprocess.DEVNULL)
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+
+        jsonl_path = os.path.join(work_dir, "foreclosures.jsonl")
+        notices = 0
+        if os.path.exists(jsonl_path):
+            with open(jsonl_path, 'r', encoding='utf-8') as f:
+                notices = sum(1 for line in f if line.strip())
+        if process.returncode != 0:
+            with open(os.path.join(work_dir, "crawl.log"), 'r') as f:
+                print(f"{mode} crawl exited with {process.returncode}:\n{f.read()[-2000:]}")
+
+    stats = dict(server.stats)
+    elapsed = (stats["last_request_at"] or 0) - (stats["first_request_at"] or 0)
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak_mb = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return {
+        "mode": mode,
+        "notices": notices,
+        "seconds": round(elapsed, 3),
+        "notices_per_sec": round(notices / elapsed, 1) if elapsed else 0,
+        "requests": stats["requests"],
+        "requests_per_sec": round(stats["requests"] / elapsed, 1) if elapsed else 0,
+        "errors": stats["errors"],
+        "peak_memory_mb": round(peak_mb, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the crawl modes against a local legalnews.com stand-in")
+    parser.add_argument("--notices", type=int, default=1000, help="Synthetic notices served (default 1000)")
+    parser.add_argument("--modes", default="threads,async,counties,shard",
+                        help=f"Comma-separated crawl modes to run ({', '.join(MODES)})")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Server delay per response (default 20)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Up to this much extra random delay")
+    parser.add_argument("--error-rate", type=float, default=0,
+                        help="Fraction of search and page requests answered with 503")
+    parser.add_argument("--requests-per-second", type=float, default=0,
+                        help="REQUESTS_PER_SECOND for the crawl (default 0, no limit)")
+    parser.add_argument("--detail-workers", type=int, default=8, help="DETAIL_WORKERS for the crawl (default 8)")
+    parser.add_argument("--output", help="Also save the results as JSON to this file")
+    args = parser.parse_args()
+
+    modes = [mode.strip() for mode in args.modes.split(",")]
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(unknown)}")
+    if "async" in modes:
+        try:
+            import aiohttp  # noqa: F401
+        except ImportError:
+            print("aiohttp not installed, skipping the async mode. Install it with: pip install aiohttp")
+            modes.remove("async")
+
+    server = ReplayServer(notices=args.notices, latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                          error_rate=args.error_rate).start()
+    print(f"Crawling {args.notices} notices from {server.base_url} "
+          f"({args.latency_ms:g} ms latency, {args.error_rate:.1%} errors)\n")
+    print(f"{'mode':10} {'notices':>8} {'seconds':>8} {'notices/s':>10} {'requests/s':>11} {'errors':>7} {'peak MB':>8}")
+    results = []
+    try:
+        for mode in modes:
+            result = run_crawl(server, mode, args)
+            results.append(result)
+            print(f"{mode:10} {result['notices']:8} {result['seconds']:8.2f} {result['notices_per_sec']:10.1f} "
+                  f"{result['requests_per_sec']:11.1f} {result['errors']:7} {result['peak_memory_mb']:8.1f}")
+    finally:
+        server.stop()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"settings": vars(args), "results": results}, f, indent=2)
+        print(f"\nSaved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
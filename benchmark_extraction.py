@@ -0,0 +1,138 @@
+"""Throughput benchmark of the Groq extraction stage against mock_groq_server.py.
+
+Starts the local legalnews.com stand-in and the mock Groq API, then runs
+requests-sessions.py once per GROQ_WORKERS setting: the crawl produces the
+notices and the extraction stage sends them to the mock. Reports records/sec,
+Groq calls per record and the share of replies that failed to parse:
+
+    python benchmark_extraction.py --notices 500 --latency-ms 400 --workers 1,4,8
+    python benchmark_extraction.py --rate-limit-rate 0.1 --malformed-rate 0.05 --drop-rate 0.02
+
+The extraction cache is disabled so every run sends every notice.
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+from mock_groq_server import MockGroqServer
+from replay_server import ReplayServer
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "requests-sessions.py")
+
+# Lines requests-sessions.py prints when it can't use a Groq reply
+PARSE_FAILURE_RE = re.compile(r'^(Error parsing Groq response|Received text response from Groq'
+                              r'|Could not parse response|Error parsing response)', re.MULTILINE)
+
+
+def count_rows(path, csv_file=False):
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if csv_file:
+            return sum(1 for _ in csv.reader(f)) - 1
+        return sum(1 for line in f if line.strip())
+
+
+def run_extraction(legalnews, groq, workers, args):
+    """Crawl the stand-in and extract the notices with GROQ_WORKERS=workers. Returns the measurements."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        env = {
+            **os.environ,
+            "LEGALNEWS_BASE_URL": legalnews.base_url,
+            "USER_NAME": "benchmark",
+            "PASSWORD": "benchmark",
+            "REQUESTS_PER_SECOND": "0",
+            "GROQ_BASE_URL": groq.base_url,
+            "GROQ_API_KEY": "mock",
+            "GROQ_WORKERS": str(workers),
+            "GROQ_REQUESTS_PER_MINUTE": str(args.requests_per_minute),
+            "GROQ_TOKENS_PER_MINUTE": str(args.tokens_per_minute),
+            # Nothing from earlier runs or a local .env may change what is sent
+            "DETAIL_CACHE": "", "SESSION_FILE": "", "STATE_DB": "", "NOTICE_DB": "", "PARQUET_DIR": "",
+            "LLM_CACHE": "",
+        }
+        command = [sys.executable, SCRIPT, "--counties", "All Counties", "--start", "01/01/2025", "--end", "06/30/2025"]
+        groq.reset_stats()
+        log_path = os.path.join(work_dir, "run.log")
+        with open(log_path, "w") as log:
+            returncode = subprocess.call(command, cwd=work_dir, env=env, stdout=log, stderr=subprocess.STDOUT,
+                                         stdin=subprocess.DEVNULL)
+        with open(log_path, 'r', encoding='utf-8') as f:
+            log_text = f.read()
+        if returncode != 0:
+            print(f"Run with {workers} workers exited with {returncode}:\n{log_text[-2000:]}")
+
+        records = count_rows(os.path.join(work_dir, "foreclosures.jsonl"))
+        processed = count_rows(os.path.join(work_dir, "foreclosures_processed.csv"), csv_file=True)
+
+    stats = dict(groq.stats)
+    elapsed = (stats["last_reply_at"] or 0) - (stats["first_call_at"] or 0)
+    parse_failures = len(PARSE_FAILURE_RE.findall(log_text))
+    return {
+        "workers": workers,
+        "records": records,
+        "processed": processed,
+        "seconds": round(elapsed, 3),
+        "records_per_sec": round(processed / elapsed, 1) if elapsed else 0,
+        "calls": stats["calls"],
+        "calls_per_record": round(stats["calls"] / records, 3) if records else 0,
+        "rate_limited": stats["rate_limited"],
+        "parse_failures": parse_failures,
+        "parse_failure_rate": round(parse_failures / stats["completions"], 4) if stats["completions"] else 0,
+        "max_in_flight": stats["max_in_flight"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Groq extraction stage against a mock Groq API")
+    parser.add_argument("--notices", type=int, default=300, help="Notices crawled and extracted (default 300)")
+    parser.add_argument("--workers", default="1,4", help="Comma-separated GROQ_WORKERS values to compare")
+    parser.add_argument("--latency-ms", type=float, default=300, help="Mock delay per call (default 300)")
+    parser.add_argument("--ms-per-record", type=float, default=20, help="Mock delay per notice in a batch")
+    parser.add_argument("--rate-limit-rate", type=float, default=0, help="Fraction of calls answered with 429")
+    parser.add_argument("--retry-after", type=float, default=0.5, help="retry-after seconds sent with a 429")
+    parser.add_argument("--drop-rate", type=float, default=0, help="Fraction of notices left out of replies")
+    parser.add_argument("--malformed-rate", type=float, default=0, help="Fraction of replies that aren't valid JSON")
+    parser.add_argument("--requests-per-minute", type=int, default=6000,
+                        help="Groq request limit, for the mock and GROQ_REQUESTS_PER_MINUTE (default 6000)")
+    parser.add_argument("--tokens-per-minute", type=int, default=10000000,
+                        help="Groq token limit, for the mock and GROQ_TOKENS_PER_MINUTE (default 10000000)")
+    parser.add_argument("--output", help="Also save the results as JSON to this file")
+    args = parser.parse_args()
+
+    legalnews = ReplayServer(notices=args.notices).start()
+    groq = MockGroqServer(latency=args.latency_ms / 1000, per_record=args.ms_per_record / 1000,
+                          rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after,
+                          drop_rate=args.drop_rate, malformed_rate=args.malformed_rate,
+                          requests_per_minute=args.requests_per_minute,
+                          tokens_per_minute=args.tokens_per_minute).start()
+    print(f"Extracting {args.notices} notices with a mock Groq API at {groq.base_url} "
+          f"({args.latency_ms:g} ms + {args.ms_per_record:g} ms/notice per call, {args.rate_limit_rate:.0%} 429s, "
+          f"{args.malformed_rate:.0%} malformed, {args.drop_rate:.0%} dropped)\n")
+    print(f"{'workers':>7} {'processed':>10} {'seconds':>8} {'records/s':>10} {'calls/record':>13} {'429s':>5} "
+          f"{'parse failures':>15}")
+    results = []
+    try:
+        for workers in [int(value) for value in args.workers.split(",")]:
+            result = run_extraction(legalnews, groq, workers, args)
+            results.append(result)
+            print(f"{workers:7} {result['processed']:5}/{result['records']:<4} {result['seconds']:8.2f} "
+                  f"{result['records_per_sec']:10.1f} {result['calls_per_record']:13.3f} {result['rate_limited']:5} "
+                  f"{result['parse_failures']:6} ({result['parse_failure_rate']:.1%})")
+    finally:
+        legalnews.stop()
+        groq.stop()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"settings": vars(args), "results": results}, f, indent=2)
+        print(f"\nSaved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Micro-benchmark comparing the detail page parser backends.
+
+Point it at a folder of saved notice detail pages (the HTML of
+/Home/PublicNoticesDetails/<id>, one page per .html file):
+
+    python benchmark_parsers.py detail_pages --repeat 20
+"""
+import argparse
+import glob
+import os
+import time
+
+from legalnews_scraper.parsing import available_detail_parsers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare detail page parser backends on saved pages")
+    parser.add_argument("pages_dir", help="Folder containing saved detail pages (*.html)")
+    parser.add_argument("--repeat", type=int, default=10, help="Times each page is parsed per backend")
+    args = parser.parse_args()
+
+    pages = []
+    for path in sorted(glob.glob(os.path.join(args.pages_dir, "*.html"))):
+        with open(path, 'r', encoding='utf-8') as f:
+            pages.append(f.read())
+    if not pages:
+        print(f"No .html files found in {args.pages_dir}")
+        return
+
+    backends = available_detail_parsers()
+    reference = [backends['html.parser'](html) for html in pages]
+    print(f"Parsing {len(pages)} pages x {args.repeat} with {len(backends)} backends\n")
+
+    baseline = None
+    for name, parse in backends.items():
+        # Check the backend agrees with html.parser before timing it
+        mismatches = sum(
+            1 for html, expected in zip(pages, reference)
+            if tuple(field.strip() for field in parse(html)) != tuple(field.strip() for field in expected)
+        )
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for html in pages:
+                parse(html)
+        elapsed = time.perf_counter() - start
+
+        pages_per_sec = len(pages) * args.repeat / elapsed
+        baseline = baseline or pages_per_sec
+        print(f"{name:12} {pages_per_sec:10.1f} pages/sec  {pages_per_sec / baseline:5.2f}x  "
+              f"mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
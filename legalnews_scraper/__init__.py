@@ -0,0 +1,71 @@
+"""legalnews.com foreclosure scraper as a library.
+
+    from legalnews_scraper import Extractor, Scraper, Settings
+
+    settings = Settings(notice_db="foreclosures.db")
+    scraper = Scraper(settings)
+    auth = scraper.session_pool.acquire()
+    scraper.scrape(auth, ["Oakland"], "01/01/2025", "01/31/2025")
+    Extractor(settings, scraper.state_store, scraper.notice_db).run()
+    scraper.close()
+
+Names are imported on first use, so `import legalnews_scraper` doesn't load
+requests, the HTML parsers or groq until something needs them.
+"""
+import importlib
+
+# Public name -> module it lives in
+_EXPORTS = {
+    "Settings": "legalnews_scraper.settings",
+    "Scraper": "legalnews_scraper.crawl",
+    "merge_parts": "legalnews_scraper.crawl",
+    "Extractor": "legalnews_scraper.extract",
+    "groq_prompt": "legalnews_scraper.extract",
+    "requests_prompt": "legalnews_scraper.extract",
+    "main": "legalnews_scraper.cli",
+    # Session and search
+    "SessionExpiredError": "legalnews_scraper.legalnews_session",
+    "login": "legalnews_scraper.legalnews_session",
+    "new_session": "legalnews_scraper.legalnews_session",
+    "open_search_form": "legalnews_scraper.legalnews_session",
+    "build_search_form": "legalnews_scraper.legalnews_session",
+    "SessionPool": "legalnews_scraper.session_pool",
+    "ShardPlanner": "legalnews_scraper.shard_planner",
+    # Pagination and detail pages
+    "ThreadedCrawler": "legalnews_scraper.threaded_crawler",
+    "AsyncCrawler": "legalnews_scraper.async_crawler",
+    "parse_results_page": "legalnews_scraper.parsing",
+    "parse_foreclosure_details": "legalnews_scraper.parsing",
+    "notice_id_from_url": "legalnews_scraper.parsing",
+    "DetailCache": "legalnews_scraper.detail_cache",
+    "StateStore": "legalnews_scraper.state_store",
+    "RateLimiter": "legalnews_scraper.rate_limit",
+    "AdaptiveConcurrency": "legalnews_scraper.rate_limit",
+    "GroqRateLimiter": "legalnews_scraper.rate_limit",
+    # Extraction
+    "RuleExtractor": "legalnews_scraper.rule_extraction",
+    "ExtractionCache": "legalnews_scraper.extraction_cache",
+    # Sinks
+    "RawRecordSink": "legalnews_scraper.sinks",
+    "ProcessedCsvSink": "legalnews_scraper.sinks",
+    "iter_records": "legalnews_scraper.sinks",
+    "ParquetSink": "legalnews_scraper.parquet_sink",
+    "NoticeDatabase": "legalnews_scraper.notice_db",
+    # Instrumentation
+    "metrics": "legalnews_scraper.metrics",
+    "profiler": "legalnews_scraper.profiling",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,3 @@
+from legalnews_scraper.cli import main
+
+main()
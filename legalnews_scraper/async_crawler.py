@@ -0,0 +1,359 @@
+import asyncio
+import time
+
+import aiohttp
+
+from .legalnews_session import REQUEST_TIMEOUT, FetchError, SessionExpiredError, check_logged_in
+from .metrics import endpoint_name, metrics
+from .parsing import notice_id_from_url, parse_foreclosure_details, parse_results_page
+from .profiling import profiler
+from .rate_limit import AdaptiveConcurrency, backoff_delay, retry_after_seconds, server_overloaded
+
+# Longest wait between two attempts of a detail fetch, in seconds
+RETRY_MAX_DELAY = 30
+
+
+class AsyncCrawler:
+    """Runs the search, pagination and detail fetches over one pooled aiohttp session.
+
+    The crawler picks up an already logged-in requests session: its cookies are
+    copied into the aiohttp cookie jar and the search form (including the
+    __RequestVerificationToken) is posted as-is, so login stays in one place.
+
+    Detail fetches also go through the shared concurrency controller and are
+    retried and re-queued like in ThreadedCrawler; the ones that never
+    succeed are left in `failed`. A search or results page that still fails
+    after its retries raises FetchError once the pages before it are committed.
+    A request sent back to the login page stops the crawl the same way: the
+    queued requests are dropped, the detail fetches still running cancelled,
+    and SessionExpiredError raised for crawl_search to log in again.
+    """
+
+    def __init__(self, base_url, headers, cookies, max_concurrency, limiter, detail_cache=None,
+                 state_store=None, page_window=4, concurrency=None, max_retries=3, retry_base=0.5,
+                 timeout=REQUEST_TIMEOUT, search_response_file=None):
+        self.base_url = base_url
+        self.headers = headers
+        self.cookies = cookies
+        self.max_concurrency = max_concurrency
+        # Shared RateLimiter, so threads and event loops respect the same request rate
+        self.limiter = limiter
+        self.detail_cache = detail_cache
+        self.state_store = state_store
+        # Incremental runs fetch this many results pages at a time so they can stop early
+        self.page_window = page_window
+        self.concurrency = concurrency or AdaptiveConcurrency(max_concurrency, adaptive=False)
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.timeout = timeout
+        # The search response is saved here for inspection (None to skip)
+        self.search_response_file = search_response_file
+        self.semaphore = None
+        self.session_expired = False
+        self.requeue = []  # (detail_url, foreclosure_number) of fetches that ran out of retries
+        self.failed = []
+
+    async def fetch(self, http, method, url, concurrency=None, **kwargs):
+        # Every request goes through the global concurrency cap and the rate limiter;
+        # detail fetches first wait for a slot from the concurrency controller, and only
+        # then reserve a rate slot, as in ThreadedCrawler
+        if concurrency:
+            await concurrency.acquire_async()
+        start = None
+        status, headers = None, {}
+        try:
+            async with self.semaphore:
+                # Once one request found the session logged out, the queued ones fail without being sent
+                if self.session_expired:
+                    raise SessionExpiredError("legalnews.com session is no longer logged in")
+                await asyncio.sleep(self.limiter.reserve())
+                start = time.perf_counter()
+                async with http.request(method, url, **kwargs) as response:
+                    try:
+                        check_logged_in(response.url)
+                    except SessionExpiredError:
+                        self.session_expired = True
+                        raise
+                    text = await response.text()
+                    status, headers = response.status, response.headers
+                    metrics.observe_request(endpoint_name(method, url), time.perf_counter() - start, status,
+                                            len(text))
+                    return status, text, headers
+        finally:
+            if concurrency and start is None:
+                concurrency.release_unsent()
+            elif concurrency:
+                failed = status is None or server_overloaded(status)
+                concurrency.release(time.perf_counter() - start if start else 0.0, failed,
+                                    retry_after_seconds(headers) if failed else None, status == 429)
+
+    async def fetch_detail_page(self, http, detail_url, headers):
+        """GET a detail page, retrying 429/5xx and network errors. Returns None once the retries run out."""
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                status, html, response_headers = await self.fetch(http, 'GET', detail_url, self.concurrency,
+                                                                  headers=headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = str(e) or type(e).__name__
+            else:
+                if not server_overloaded(status):
+                    return status, html, response_headers
+                error, retry_after = f"status {status}", retry_after_seconds(response_headers)
+
+            if attempt < self.max_retries:
+                delay = backoff_delay(attempt, self.retry_base, RETRY_MAX_DELAY, retry_after)
+                print(f"Detail page {detail_url} failed ({error}), retrying in {delay:.1f}s...")
+                metrics.retry("detail_fetch")
+                await asyncio.sleep(delay)
+        print(f"Failed to access detail page: {detail_url} ({error}), re-queued")
+        return None
+
+    @metrics.timed("detail_fetch")
+    async def scrape_foreclosure_details(self, http, detail_url, foreclosure_number):
+        print(f"Scraping Foreclosure {foreclosure_number}: {detail_url}")
+
+        # Serve the page from the on-disk cache when possible
+        cached_body, conditional_headers = self.detail_cache.lookup(detail_url) if self.detail_cache else (None, {})
+        if cached_body is not None:
+            return self.parse_details(cached_body, detail_url, foreclosure_number)
+
+        fetched = await self.fetch_detail_page(http, detail_url, {**self.headers, **conditional_headers})
+        if fetched is None:
+            self.requeue.append((detail_url, foreclosure_number))
+            return None
+        status, html, response_headers = fetched
+
+        if self.detail_cache:
+            html = self.detail_cache.store_response(detail_url, status, html, response_headers)
+        elif status != 200:
+            html = None
+
+        if html is not None:
+            return self.parse_details(html, detail_url, foreclosure_number)
+        print(f"Failed to access detail page: {detail_url}")
+        return None
+
+    @staticmethod
+    def parse_details(html, detail_url, foreclosure_number):
+        # Parsing is the detail fetch's own work on the event loop, so that is what gets profiled
+        with profiler.stage("detail_fetch"):
+            return parse_foreclosure_details(html, detail_url, foreclosure_number)
+
+    async def fetch_with_retries(self, http, method, url, description, retry_name, **kwargs):
+        """Send the search or a results page request, retrying 429/5xx and network errors.
+
+        Raises FetchError when the retries run out or the server answers with
+        another error status, rather than handing back an error page that would
+        parse as a page without results.
+        """
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                status, text, response_headers = await self.fetch(http, method, url, **kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = str(e) or type(e).__name__
+            else:
+                if status < 400:
+                    return status, text, response_headers
+                error = f"status {status}"
+                if not server_overloaded(status):
+                    break
+                retry_after = retry_after_seconds(response_headers)
+
+            if attempt < self.max_retries:
+                delay = backoff_delay(attempt, self.retry_base, RETRY_MAX_DELAY, retry_after)
+                print(f"{description} failed ({error}), retrying in {delay:.1f}s...")
+                metrics.retry(retry_name)
+                await asyncio.sleep(delay)
+        raise FetchError(f"{description} failed ({error})")
+
+    @metrics.timed("results_fetch")
+    async def fetch_results_page(self, http, public_notices_url, page_number):
+        _, page_content, _ = await self.fetch_with_retries(http, 'GET', f"{public_notices_url}?page={page_number}",
+                                                           f"Results page {page_number}", "results_page",
+                                                           headers=self.headers)
+        with profiler.stage("pagination"):
+            return parse_results_page(page_content, self.base_url)
+
+    @metrics.timed("pagination")
+    async def crawl(self, public_notices_url, form_data, search_headers, on_page_done, start_page=1, first_number=1):
+        """Submit the search and hand every scraped foreclosure, numbered in result order, to on_page_done.
+
+        Pages before `start_page` are skipped (they were scraped by an interrupted
+        run) and numbering continues from `first_number`. `on_page_done(page,
+        last_foreclosure_number, records)` is called in page order once all of a
+        page's detail fetches have finished, so nothing accumulates in memory.
+        Re-queued detail fetches get one more try after the last page.
+        """
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.session_expired = False
+        self.requeue, self.failed = [], []
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        async with aiohttp.ClientSession(connector=connector, cookies=self.cookies, timeout=timeout) as http:
+            print("Submitting search form...")
+            status, page_content, _ = await self.fetch_with_retries(
+                http, 'POST', public_notices_url, "Search", "search", data=form_data, headers=search_headers
+            )
+            print(f"Search response status code: {status}")
+
+            if self.search_response_file:
+                with open(self.search_response_file, "w", encoding="utf-8") as f:
+                    f.write(page_content)
+                print(f"Saved search response to {self.search_response_file} for inspection")
+
+            # Detail fetches for a page are scheduled as soon as the page is parsed,
+            # so they overlap with fetching the following results pages. Each page's
+            # tasks are queued for the committer, which finishes pages in order.
+            finished_pages = asyncio.Queue()
+            committer = asyncio.create_task(self.commit_pages(finished_pages, first_number, on_page_done))
+            scheduled = 0
+            # Detail fetches still running or failed, so they can be cancelled and collected when the crawl stops early
+            detail_tasks = set()
+
+            def forget_detail_task(detail_task):
+                if detail_task.cancelled() or detail_task.exception() is None:
+                    detail_tasks.discard(detail_task)
+
+            # Returns True when every notice on the page was already scraped
+            @profiler.profiled("pagination")
+            def schedule_details(detail_urls, current_page):
+                nonlocal scheduled
+                # The committer only ends before the end marker when a page failed (e.g. the
+                # session expired); stop walking the results with its error
+                if committer.done():
+                    committer.result()
+                print(f"Found {len(detail_urls)} results on page {current_page}")
+                if self.state_store:
+                    known = self.state_store.known_ids(notice_id_from_url(url) for url in detail_urls)
+                    if detail_urls and all(notice_id_from_url(url) in known for url in detail_urls):
+                        print(f"All {len(detail_urls)} notices on page {current_page} were already scraped")
+                        return True
+                    detail_urls = [url for url in detail_urls if notice_id_from_url(url) not in known]
+                    print(f"{len(known)} known notices skipped on page {current_page}")
+
+                page_tasks = []
+                for detail_url in detail_urls:
+                    detail_task = asyncio.create_task(
+                        self.scrape_foreclosure_details(http, detail_url, first_number + scheduled)
+                    )
+                    detail_tasks.add(detail_task)
+                    detail_task.add_done_callback(forget_detail_task)
+                    page_tasks.append(detail_task)
+                    scheduled += 1
+                finished_pages.put_nowait((current_page, page_tasks))
+                return False
+
+            page_tasks = []
+            try:
+                with profiler.stage("pagination"):
+                    detail_urls, total_pages, has_next = parse_results_page(page_content, self.base_url)
+                if start_page == 1:
+                    print("Processing page 1...")
+                    all_known = schedule_details(detail_urls, 1)
+                else:
+                    print(f"Skipping pages 1-{start_page - 1}, already scraped")
+                    all_known = False
+
+                if all_known:
+                    print("Stopping: no new notices on the first page")
+                elif total_pages:
+                    # Fetch the remaining pages concurrently; they are still handled in page order
+                    print(f"Search returned {total_pages} pages of results")
+                    window = self.page_window if self.state_store else total_pages
+                    for window_start in range(max(2, start_page), total_pages + 1, window):
+                        page_numbers = range(window_start, min(window_start + window, total_pages + 1))
+                        page_tasks = [
+                            asyncio.create_task(self.fetch_results_page(http, public_notices_url, page_number))
+                            for page_number in page_numbers
+                        ]
+                        for current_page, page_task in zip(page_numbers, page_tasks):
+                            print(f"Processing page {current_page}...")
+                            detail_urls, _, _ = await page_task
+                            all_known = schedule_details(detail_urls, current_page)
+                            if all_known:
+                                break
+                        if all_known:
+                            print(f"Stopping at page {current_page}: the remaining pages hold older notices")
+                            for page_task in page_tasks:
+                                page_task.cancel()
+                            break
+                else:
+                    # No page count on the page: follow the "Next" link one page at a time
+                    current_page = start_page - 1
+                    has_next = has_next or start_page > 1
+                    while has_next:
+                        current_page += 1
+                        print(f"Processing page {current_page}...")
+                        detail_urls, _, has_next = await self.fetch_results_page(http, public_notices_url, current_page)
+                        if schedule_details(detail_urls, current_page):
+                            print(f"Stopping at page {current_page}: the remaining pages hold older notices")
+                            break
+
+                finished_pages.put_nowait(None)
+                last_page, last_foreclosure_number = await committer
+            except Exception:
+                # Stop fetching, commit the pages finished so far, and list the re-queued
+                # fetches (their pages are committed already) as failed
+                for page_task in page_tasks:
+                    page_task.cancel()
+                finished_pages.put_nowait(None)
+                try:
+                    await committer
+                finally:
+                    # A failed committer leaves the later pages' detail fetches running;
+                    # they must not outlive the aiohttp session
+                    for detail_task in list(detail_tasks):
+                        detail_task.cancel()
+                    await asyncio.gather(*page_tasks, *detail_tasks, return_exceptions=True)
+                    self.failed = [detail_url for detail_url, _ in self.requeue]
+                raise
+
+            await self.retry_requeued(http, last_page or start_page - 1, last_foreclosure_number, on_page_done)
+
+    async def retry_requeued(self, http, last_page, last_foreclosure_number, on_page_done):
+        """Fetch the re-queued detail pages once more and hand the results on with the last page."""
+        if not self.requeue:
+            return
+        requeued, self.requeue = self.requeue, []
+        print(f"Retrying {len(requeued)} detail pages that failed during the crawl...")
+        metrics.retry("detail_requeue", len(requeued))
+        next_number = last_foreclosure_number + 1
+        page_records = []
+        results = await asyncio.gather(*(self.scrape_foreclosure_details(http, detail_url, foreclosure_number)
+                                         for detail_url, foreclosure_number in requeued))
+        for foreclosure_data in results:
+            if foreclosure_data:
+                foreclosure_data["foreclosure_number"] = next_number
+                page_records.append(foreclosure_data)
+                next_number += 1
+        self.failed, self.requeue = [detail_url for detail_url, _ in self.requeue], []
+        print(f"Recovered {len(page_records)} of {len(requeued)} re-queued detail pages")
+        on_page_done(last_page, next_number - 1, page_records)
+
+    async def commit_pages(self, finished_pages, first_number, on_page_done):
+        """Wait for each page's detail fetches in page order and number the results.
+
+        Returns the last page committed (None if there was none) and its last foreclosure number.
+        """
+        next_number = first_number
+        current_page = None
+        while True:
+            item = await finished_pages.get()
+            if item is None:
+                return current_page, next_number - 1
+            current_page, page_tasks = item
+
+            # Number in result order, skipping failed fetches as the threaded crawl does
+            page_records = []
+            for foreclosure_data in await asyncio.gather(*page_tasks):
+                if foreclosure_data:
+                    foreclosure_data["foreclosure_number"] = next_number
+                    page_records.append(foreclosure_data)
+                    next_number += 1
+
+            with profiler.stage("results_page"):
+                on_page_done(current_page, next_number - 1, page_records)
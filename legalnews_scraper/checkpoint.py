@@ -0,0 +1,60 @@
+import json
+import os
+
+
+class CrawlCheckpoint:
+    """Crash-safe progress record for a crawl, used by --resume.
+
+    The checkpoint JSON holds the search parameters, the last fully processed
+    results page, the last foreclosure_number handed out and the size of each
+    output file once that page was written. On resume the outputs are truncated
+    back to those sizes, so a page that was interrupted half-way is discarded
+    and fetched again.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.state = None
+
+    def load(self):
+        """Return the saved checkpoint, or None if there is none or no page was finished."""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if not state["output_offsets"]:
+            return None
+        self.state = state
+        return self.state
+
+    def start(self, search):
+        """Begin a checkpoint for `search` (county and dates), continuing the loaded one if it matches.
+
+        Returns True when an earlier crawl of the same search is being resumed.
+        """
+        if self.state is not None and self.state["search"] == search:
+            return True
+        self.state = {"search": search, "last_page": 0, "last_foreclosure_number": 0, "output_offsets": None}
+        self._write_state()
+        return False
+
+    def page_done(self, page, last_foreclosure_number, output_offsets):
+        """Commit a fully processed and written results page."""
+        self.state["last_page"] = page
+        self.state["last_foreclosure_number"] = last_foreclosure_number
+        self.state["output_offsets"] = output_offsets
+        self._write_state()
+
+    def _write_state(self):
+        # Write to a temporary file and rename it so a crash never leaves a torn checkpoint
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Remove the checkpoint once the crawl has finished."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,154 @@
+"""Command line entry point: python -m legalnews_scraper (or requests-sessions.py).
+
+Only argparse is imported up front; requests, the parsers and groq are
+loaded once the arguments are known, so --help returns straight away.
+"""
+import argparse
+import json
+import os
+
+
+def build_parser():
+    # Without --counties the county and dates are asked for interactively
+    parser = argparse.ArgumentParser(description="Scrape foreclosure notices from legalnews.com")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted crawl from its checkpoint instead of starting over")
+    parser.add_argument("--counties",
+                        help='Comma-separated county names to crawl in parallel, or "all-individually" '
+                             'for every county as its own search')
+    parser.add_argument("--start", help="Start date (MM/DD/YYYY) for --counties")
+    parser.add_argument("--end", help="End date (MM/DD/YYYY) for --counties")
+    parser.add_argument("--shard", action="store_true",
+                        help="Split the date range into week/day shards by result count and crawl them in parallel")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile the crawl and Groq stages with cProfile and write the results to PROFILE_DIR")
+    return parser
+
+
+def select_counties(counties_arg, counties):
+    """Resolve --counties against the site's county list."""
+    if counties_arg.strip().lower() == "all-individually":
+        return [county for county in counties if county != "All Counties"]
+    county_lookup = {county.lower(): county for county in counties}
+    selected_counties = []
+    for name in counties_arg.split(","):
+        if name.strip().lower() not in county_lookup:
+            raise SystemExit(f"Unknown county: {name.strip()}")
+        selected_counties.append(county_lookup[name.strip().lower()])
+    return selected_counties
+
+
+def prompt_search(counties):
+    """Ask for a county and a date range. Returns (county, start_date, end_date)."""
+    # Display county options to user
+    print("\nAvailable counties:")
+    for i, county in enumerate(counties, 1):
+        print(f"{i}. {county}")
+
+    # Get county selection from user
+    selected_county_index = 0
+    while selected_county_index < 1 or selected_county_index > len(counties):
+        try:
+            selected_county_index = int(input(f"\nSelect a county (1-{len(counties)}): "))
+            if selected_county_index < 1 or selected_county_index > len(counties):
+                print(f"Please enter a number between 1 and {len(counties)}")
+        except ValueError:
+            print("Please enter a valid number")
+
+    selected_county = counties[selected_county_index - 1]
+    print(f"Selected county: {selected_county}")
+
+    # Ask user for date range
+    start_date = input("Enter start date (MM/DD/YYYY): ")
+    end_date = input("Enter end date (MM/DD/YYYY): ")
+    return selected_county, start_date, end_date
+
+
+def main(argv=None):
+    arg_parser = build_parser()
+    args = arg_parser.parse_args(argv)
+    if args.counties and not (args.start and args.end):
+        arg_parser.error("--counties needs --start and --end")
+
+    from dotenv import load_dotenv
+
+    from .checkpoint import CrawlCheckpoint
+    from .crawl import Scraper
+    from .extract import Extractor
+    from .metrics import metrics
+    from .profiling import profiler
+    from .settings import Settings
+
+    # Load environment variables from .env file
+    load_dotenv()
+    settings = Settings()
+    if args.profile:
+        profiler.enable()
+
+    scraper = Scraper(settings)
+    main_session = scraper.session_pool.acquire()
+
+    # Check if login was successful
+    if main_session is not None:
+        counties = main_session.counties
+
+        # Progress of a single crawl is checkpointed after every results page
+        checkpoint = CrawlCheckpoint(settings.checkpoint_file)
+        resume_state = checkpoint.load() if args.resume else None
+
+        # A resumed parallel run repeats the searches it planned, without asking again
+        parts = None
+        start_date = end_date = None
+        selected_counties = []
+        if args.resume and os.path.exists(settings.parts_plan_file):
+            with open(settings.parts_plan_file, 'r', encoding='utf-8') as f:
+                parts = json.load(f)
+            print(f"Resuming {len(parts)} parallel searches from {settings.parts_plan_file}")
+        elif args.counties:
+            # Non-interactive mode: one search per county, each in its own session
+            selected_counties = select_counties(args.counties, counties)
+            print(f"Selected counties: {', '.join(selected_counties)}")
+            start_date, end_date = args.start, args.end
+        else:
+            if args.resume:
+                if resume_state:
+                    print(f"Resuming crawl after page {resume_state['last_page']} "
+                          f"({resume_state['last_foreclosure_number']} foreclosures already scraped)")
+                else:
+                    print("No checkpoint found, starting a new crawl")
+
+            if resume_state:
+                # Repeat the interrupted search instead of prompting again
+                selected_county = resume_state["search"]["county"]
+                start_date = resume_state["search"]["start_date"]
+                end_date = resume_state["search"]["end_date"]
+                print(f"Selected county: {selected_county} (from checkpoint)")
+            else:
+                selected_county, start_date, end_date = prompt_search(counties)
+            selected_counties = [selected_county]
+
+        total_scraped = scraper.scrape(main_session, selected_counties, start_date, end_date,
+                                       shard=args.shard and not resume_state, parts=parts, checkpoint=checkpoint,
+                                       resume=args.resume)
+        print(f"Scraping completed. Scraped {total_scraped} foreclosures to {settings.jsonl_filename} "
+              f"and {settings.csv_filename}.")
+
+        # Data cleaning using Groq
+        Extractor(settings, scraper.state_store, scraper.notice_db).run()
+    else:
+        print("Could not log in to legalnews.com; check USER_NAME and PASSWORD in .env")
+
+    scraper.close()
+
+    # Where the run's time went, plus the metrics files for monitoring
+    print("Time per stage (summed over workers):")
+    print(metrics.stage_report())
+    if settings.metrics_textfile:
+        metrics.write_textfile(settings.metrics_textfile)
+        print(f"Wrote Prometheus metrics to {settings.metrics_textfile}")
+    if settings.metrics_summary:
+        metrics.write_summary(settings.metrics_summary)
+        print(f"Wrote the metrics summary to {settings.metrics_summary}")
+    if args.profile:
+        print(profiler.write(settings.profile_dir, settings.profile_top))
+        print(f"Wrote per-stage profiles to {settings.profile_dir}/ (open them with snakeviz or python -m pstats)")
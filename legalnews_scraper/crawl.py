@@ -0,0 +1,293 @@
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .checkpoint import CrawlCheckpoint
+from .detail_cache import DetailCache
+from .legalnews_session import (HEADERS, SessionExpiredError, build_search_form, format_search_dates,
+                                public_notices_url, search_headers)
+from .metrics import metrics
+from .notice_db import NoticeDatabase
+from .parsing import notice_id_from_url, set_detail_parser
+from .rate_limit import AdaptiveConcurrency, RateLimiter
+from .session_pool import SessionPool
+from .settings import Settings
+from .shard_planner import ShardPlanner
+from .sinks import RawRecordSink, iter_batches, iter_records
+from .state_store import StateStore
+from .threaded_crawler import ThreadedCrawler
+
+
+def merge_parts(part_paths, jsonl_filename, csv_filename):
+    """Concatenate the parts into the output files, dropping repeated notices and renumbering foreclosure_number."""
+    raw_sink = RawRecordSink(jsonl_filename, csv_filename)
+    seen_ids = set()
+    foreclosure_number = 0
+    for part_path in part_paths:
+        for batch in iter_batches(iter_records(part_path), 500):
+            new_records = []
+            for record in batch:
+                notice_id = notice_id_from_url(record["url"])
+                if notice_id in seen_ids:
+                    continue
+                seen_ids.add(notice_id)
+                foreclosure_number += 1
+                record["foreclosure_number"] = foreclosure_number
+                new_records.append(record)
+            raw_sink.write(new_records)
+    raw_sink.close()
+
+    for part_path in part_paths:
+        os.remove(part_path)
+        os.remove(os.path.splitext(part_path)[0] + ".csv")
+    return foreclosure_number
+
+
+class Scraper:
+    """Logs in to legalnews.com and crawls searches into the raw output files.
+
+    Every search of a run shares the rate limiter, the detail-fetch
+    concurrency controller, the detail cache and the pool of logged-in
+    sessions, so one Scraper can be kept around by a long-running worker.
+    """
+
+    def __init__(self, settings=None):
+        self.settings = settings = settings or Settings()
+        self.limiter = RateLimiter(settings.requests_per_second)
+        set_detail_parser(settings.detail_parser)
+
+        self.detail_cache = None
+        if settings.detail_cache:
+            self.detail_cache = DetailCache(settings.detail_cache, settings.detail_cache_ttl_days * 86400,
+                                            settings.detail_cache_max_mb * 1024 * 1024)
+        self.state_store = StateStore(settings.state_db) if settings.state_db else None
+        self.notice_db = NoticeDatabase(settings.notice_db) if settings.notice_db else None
+
+        self.crawl_engine = settings.crawl_engine
+        if self.crawl_engine == "async":
+            try:
+                import aiohttp  # noqa: F401
+            except ImportError:
+                print("aiohttp not installed, falling back to the threaded crawl. Install it with: pip install aiohttp")
+                self.crawl_engine = "threads"
+
+        # One controller for every search, since they all fetch from the same server
+        if settings.adaptive_concurrency:
+            self.concurrency = AdaptiveConcurrency(
+                settings.max_concurrency if self.crawl_engine == "async" else settings.detail_max_workers,
+                settings.detail_workers, spike_factor=settings.latency_spike_factor
+            )
+        else:
+            self.concurrency = AdaptiveConcurrency(
+                settings.max_concurrency if self.crawl_engine == "async" else settings.detail_workers, adaptive=False
+            )
+        self.failed_details_lock = threading.Lock()
+
+        # Logged-in sessions, one per parallel search, restored from the session file when possible
+        self.session_pool = SessionPool(max(1, settings.search_workers), settings.user_name, settings.password,
+                                        settings.base_url, self.concurrency.max_limit, settings.session_file or None,
+                                        settings.session_check_minutes * 60)
+
+    def close(self):
+        """Close the detail cache, state store and notice database. Run the Extractor sharing them first."""
+        for store in (self.detail_cache, self.state_store, self.notice_db):
+            if store:
+                store.close()
+
+    def save_failed_details(self, detail_urls, county, start_date, end_date):
+        """Append detail pages that could not be fetched to the failed details file, so they are not lost."""
+        if not detail_urls:
+            return
+        path = self.settings.failed_details_file
+        print(f"{len(detail_urls)} detail pages of {county} could not be fetched; listed in {path}")
+        with self.failed_details_lock, open(path, 'a', encoding='utf-8') as f:
+            for detail_url in detail_urls:
+                f.write(json.dumps({"url": detail_url, "county": county, "start_date": start_date,
+                                    "end_date": end_date}) + "\n")
+
+    def crawl_search(self, auth, county, start_date, end_date, jsonl_filename, csv_filename, checkpoint,
+                     search_response_file=None):
+        """Crawl one search with a pooled session, logging it in again once if the server expires it mid-crawl."""
+        try:
+            return self.run_search(auth, county, start_date, end_date, jsonl_filename, csv_filename, checkpoint,
+                                   search_response_file)
+        except SessionExpiredError:
+            # The checkpoint lets the second attempt continue after the last finished page
+            metrics.retry("session_relogin")
+            self.session_pool.refresh(auth)
+            return self.run_search(auth, county, start_date, end_date, jsonl_filename, csv_filename, checkpoint,
+                                   search_response_file)
+
+    def run_search(self, auth, county, start_date, end_date, jsonl_filename, csv_filename, checkpoint,
+                   search_response_file=None):
+        """Run one county / date range search and stream its records to jsonl_filename and csv_filename.
+
+        Continues from `checkpoint` when it holds a loaded checkpoint for the same
+        search. The search response is saved to `search_response_file` when
+        given. Returns the number of foreclosures scraped.
+        """
+        settings = self.settings
+        county_value = auth.counties_values.get(county, county)
+        formatted_start_date, formatted_end_date = format_search_dates(start_date, end_date)
+
+        # Prepare search form data
+        print(f"Using county value: {county_value} for {county}")
+        form_data = build_search_form(auth.search_token, county_value, formatted_start_date, formatted_end_date)
+
+        # Print the search data for debugging
+        print("Search form data:", form_data)
+
+        # Called in page order once every detail fetch of a page has finished: the
+        # records are streamed straight to the output files and the page is checkpointed
+        def commit_page(current_page, last_foreclosure_number, page_records):
+            for record in page_records:
+                record["county"] = county
+            with metrics.stage("raw_write"):
+                raw_sink.write(page_records)
+                if self.state_store:
+                    self.state_store.mark_scraped(page_records)
+                if self.notice_db:
+                    self.notice_db.upsert_scraped(page_records)
+            metrics.count_records("scraped", len(page_records))
+            checkpoint.page_done(current_page, last_foreclosure_number, raw_sink.offsets())
+
+        # Scraped records go to JSONL and CSV as they arrive instead of an in-memory list
+        resuming = checkpoint.start({"county": county, "start_date": start_date, "end_date": end_date})
+        raw_sink = RawRecordSink(jsonl_filename, csv_filename,
+                                 checkpoint.state["output_offsets"] if resuming else None)
+        start_page = checkpoint.state["last_page"] + 1
+        first_number = checkpoint.state["last_foreclosure_number"] + 1
+
+        # Submit the search form and walk the results
+        notices_url = public_notices_url(settings.base_url)
+        crawler = None
+        try:
+            if self.crawl_engine == "async":
+                from .async_crawler import AsyncCrawler
+                print(f"Crawling with the asyncio engine (up to {settings.max_concurrency} requests in flight)")
+                crawler = AsyncCrawler(settings.base_url, HEADERS, auth.session.cookies.get_dict(),
+                                       settings.max_concurrency, self.limiter, self.detail_cache, self.state_store,
+                                       settings.page_workers, self.concurrency, settings.detail_max_retries,
+                                       settings.detail_retry_seconds, settings.request_timeout, search_response_file)
+                asyncio.run(crawler.crawl(notices_url, form_data, search_headers(settings.base_url), commit_page,
+                                          start_page, first_number))
+            else:
+                crawler = ThreadedCrawler(auth.session, settings.base_url, HEADERS, self.limiter,
+                                          settings.detail_workers, settings.page_workers, self.detail_cache,
+                                          self.state_store, self.concurrency, settings.detail_max_retries,
+                                          settings.detail_retry_seconds, settings.request_timeout,
+                                          search_response_file)
+                crawler.crawl(notices_url, form_data, search_headers(settings.base_url), commit_page,
+                              start_page, first_number)
+        except SessionExpiredError:
+            # The next attempt resumes after the committed pages, so their failed fetches are listed now
+            if crawler:
+                self.save_failed_details(crawler.failed, county, start_date, end_date)
+            raw_sink.close()
+            raise
+        except BaseException:
+            # Network errors and Ctrl-C leave the checkpoint in place for --resume
+            if crawler:
+                self.save_failed_details(crawler.failed, county, start_date, end_date)
+            print(f"Crawl of {county} stopped early. Progress is saved in {checkpoint.path}; "
+                  f"run with --resume to continue.")
+            raise
+
+        self.save_failed_details(crawler.failed, county, start_date, end_date)
+
+        # The crawl finished, so the next run starts from scratch
+        total_scraped = checkpoint.state["last_foreclosure_number"]
+        raw_sink.close()
+        checkpoint.clear()
+        return total_scraped
+
+    def crawl_part(self, part, resume=False):
+        """Crawl one search of a parallel run (a county, or a date shard of one) with a session borrowed from the pool.
+
+        Each part writes its own files (and checkpoint) under the parts folder;
+        they are merged once every part is done. Returns the part's JSONL path.
+        """
+        parts_dir = self.settings.parts_dir
+        county, start_date, end_date = part["county"], part["start_date"], part["end_date"]
+        part_name = re.sub(r'[^A-Za-z0-9]+', '_', f"{county} {start_date} {end_date}").strip('_').lower()
+        part_jsonl = os.path.join(parts_dir, f"{part_name}.jsonl")
+        part_csv = os.path.join(parts_dir, f"{part_name}.csv")
+        checkpoint = CrawlCheckpoint(os.path.join(parts_dir, f"{part_name}_checkpoint.json"))
+
+        if resume:
+            if os.path.exists(part_jsonl) and not os.path.exists(checkpoint.path):
+                print(f"{county} {start_date} - {end_date}: already finished, reusing {part_jsonl}")
+                return part_jsonl
+            checkpoint.load()
+
+        part_auth = self.session_pool.acquire()
+        if part_auth is None:
+            raise RuntimeError(f"Login failed for the {county} search")
+        try:
+            total = self.crawl_search(part_auth, county, start_date, end_date, part_jsonl, part_csv, checkpoint)
+        finally:
+            self.session_pool.release(part_auth)
+        print(f"{county} {start_date} - {end_date}: scraped {total} foreclosures")
+        return part_jsonl
+
+    def plan_shards(self, auth, counties, start_date, end_date):
+        """Probe the result counts and cut each county's date range into shards. Returns the parts to crawl."""
+        print(f"Planning date shards of at most {self.settings.shard_max_results} results...")
+        planner = ShardPlanner(auth.session, self.settings.base_url, auth.search_token, self.limiter,
+                               self.settings.shard_max_results, self.settings.detail_max_retries,
+                               self.settings.detail_retry_seconds, self.settings.request_timeout)
+        parts = []
+        for county in counties:
+            for shard_start, shard_end in planner.plan(county, auth.counties_values.get(county, county),
+                                                       start_date, end_date):
+                parts.append({"county": county, "start_date": shard_start, "end_date": shard_end})
+        print(f"Planned {len(parts)} shards")
+        return parts
+
+    def scrape(self, auth, counties, start_date, end_date, shard=False, parts=None, checkpoint=None, resume=False):
+        """Crawl `counties` between the dates into the JSONL and CSV output files. Returns the foreclosures scraped.
+
+        `auth` is a logged-in session from session_pool, handed back when done.
+        One county is crawled as a single search, continuing from `checkpoint`
+        when given. Several counties, `shard` or explicit `parts` (the searches
+        of an interrupted parallel run) are crawled in parallel and merged.
+        """
+        settings = self.settings
+        crawl_started = time.perf_counter()
+        if parts is None:
+            if shard:
+                parts = self.plan_shards(auth, counties, start_date, end_date)
+            elif len(counties) > 1:
+                parts = [{"county": county, "start_date": start_date, "end_date": end_date} for county in counties]
+
+        if parts is None:
+            checkpoint = checkpoint or CrawlCheckpoint(settings.checkpoint_file)
+            try:
+                # Parallel parts don't save theirs, they would overwrite each other's
+                total_scraped = self.crawl_search(auth, counties[0], start_date, end_date, settings.jsonl_filename,
+                                                  settings.csv_filename, checkpoint, "search_response.html")
+            finally:
+                self.session_pool.release(auth)
+        else:
+            # Several searches: crawl them in parallel into part files, then merge. The
+            # main session goes back to the pool so one of the workers can use it.
+            self.session_pool.release(auth)
+            os.makedirs(settings.parts_dir, exist_ok=True)
+            with open(settings.parts_plan_file, 'w', encoding='utf-8') as f:
+                json.dump(parts, f)
+            with ThreadPoolExecutor(max_workers=settings.search_workers) as executor:
+                part_paths = list(executor.map(lambda part: self.crawl_part(part, resume), parts))
+            total_scraped = merge_parts(part_paths, settings.jsonl_filename, settings.csv_filename)
+            os.remove(settings.parts_plan_file)
+            if not os.listdir(settings.parts_dir):
+                os.rmdir(settings.parts_dir)
+        metrics.add_stage("crawl", time.perf_counter() - crawl_started)
+
+        if self.detail_cache:
+            print(self.detail_cache.summary())
+        print(self.concurrency.summary())
+        return total_scraped
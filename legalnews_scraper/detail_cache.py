@@ -0,0 +1,131 @@
+import sqlite3
+import threading
+import time
+
+from .parsing import notice_id_from_url
+
+
+class DetailCache:
+    """SQLite-backed on-disk cache of notice detail pages, keyed by notice ID.
+
+    Entries younger than `ttl_seconds` are served without touching the network.
+    Older entries are revalidated with If-None-Match / If-Modified-Since when the
+    server sent an ETag or Last-Modified header, so an unchanged notice costs a
+    304 instead of a full download. Least recently used entries are evicted once
+    the stored pages exceed `max_bytes`.
+    """
+
+    def __init__(self, path, ttl_seconds, max_bytes):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS detail_pages (
+                notice_id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                body TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_detail_pages_last_used ON detail_pages (last_used)")
+        self.conn.commit()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM detail_pages").fetchone()[0]
+        self.hits = 0
+        self.revalidated = 0
+        self.downloaded = 0
+
+    def lookup(self, url):
+        """Return (fresh_body, conditional_headers) for a detail page URL.
+
+        fresh_body is the cached page when it is still within the TTL, in which case
+        no request is needed. Otherwise conditional_headers holds the validators to
+        send with the request (empty when nothing is cached).
+        """
+        notice_id = notice_id_from_url(url)
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM detail_pages WHERE notice_id = ?",
+                (notice_id,)
+            ).fetchone()
+            if row is None:
+                return None, {}
+
+            body, etag, last_modified, fetched_at = row
+            self.conn.execute("UPDATE detail_pages SET last_used = ? WHERE notice_id = ?", (now, notice_id))
+            self.conn.commit()
+            if now - fetched_at < self.ttl_seconds:
+                self.hits += 1
+                return body, {}
+
+        conditional_headers = {}
+        if etag:
+            conditional_headers['If-None-Match'] = etag
+        if last_modified:
+            conditional_headers['If-Modified-Since'] = last_modified
+        return None, conditional_headers
+
+    def store_response(self, url, status_code, body, response_headers):
+        """Record the result of a detail page fetch and return the page body to use.
+
+        A 304 refreshes the cached entry and returns its body; a 200 replaces the
+        entry. Any other status returns None.
+        """
+        notice_id = notice_id_from_url(url)
+        now = time.time()
+        with self.lock:
+            if status_code == 304:
+                row = self.conn.execute(
+                    "SELECT body FROM detail_pages WHERE notice_id = ?", (notice_id,)
+                ).fetchone()
+                if row is None:
+                    return None
+                self.conn.execute(
+                    "UPDATE detail_pages SET fetched_at = ?, last_used = ? WHERE notice_id = ?",
+                    (now, now, notice_id)
+                )
+                self.conn.commit()
+                self.revalidated += 1
+                return row[0]
+
+            if status_code != 200:
+                return None
+
+            self.downloaded += 1
+            size = len(body.encode('utf-8'))
+            old = self.conn.execute("SELECT size FROM detail_pages WHERE notice_id = ?", (notice_id,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO detail_pages "
+                "(notice_id, url, body, etag, last_modified, fetched_at, last_used, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (notice_id, url, body, response_headers.get('ETag'), response_headers.get('Last-Modified'),
+                 now, now, size)
+            )
+            self.total_bytes += size - (old[0] if old else 0)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+            self.conn.commit()
+            return body
+
+    def _evict(self):
+        # Drop least recently used pages until the cache is back under 90% of its budget
+        target = self.max_bytes * 0.9
+        rows = self.conn.execute("SELECT notice_id, size FROM detail_pages ORDER BY last_used").fetchall()
+        for notice_id, size in rows:
+            if self.total_bytes <= target:
+                break
+            self.conn.execute("DELETE FROM detail_pages WHERE notice_id = ?", (notice_id,))
+            self.total_bytes -= size
+
+    def summary(self):
+        return (f"Detail cache: {self.hits} hits, {self.revalidated} revalidated, {self.downloaded} downloaded, "
+                f"{self.total_bytes / (1024 * 1024):.1f} MB stored")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
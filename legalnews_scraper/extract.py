@@ -0,0 +1,387 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .extraction_cache import ExtractionCache, prompt_fingerprint
+from .llm_batches import (PROMPT_OVERHEAD_TOKENS, estimate_text_tokens, match_results, numbered_fields, pack_batches,
+                          parse_reply, serialize_batch)
+from .metrics import metrics
+from .profiling import profiler
+from .rate_limit import GroqRateLimiter
+from .rule_extraction import RuleExtractor
+from .settings import Settings
+from .sinks import AI_FIELDNAMES, ProcessedCsvSink, iter_batches, iter_records
+
+SYSTEM_PROMPT = "You are a data extraction expert. Extract structured data from foreclosure notices."
+
+
+# Prompt sent with the Groq client, asking only for `fields`
+def groq_prompt(batch, fields):
+    return f"""
+            I need to extract structured data from these foreclosure notices. Please parse the following JSON data and extract these fields:
+            
+{numbered_fields(fields, '            ')}
+            
+            Return the data as a JSON array with these fields for each record. If a field cannot be found, use null or N/A.
+            
+            IMPORTANT: 
+            1. Please use EXACTLY these field names in your response.
+            2. The original 'Name' field should be split into First Name, Middle Name, and Last Name.
+            3. If there is no middle name, return an empty string for Middle Name.
+            4. Use 'Street Address' instead of 'Address' for the street address field.
+            5. Give each result the same "id" as the notice it was extracted from.
+            
+            Here is the foreclosure data to parse:
+            {serialize_batch(batch)}
+            """
+
+
+# Prompt sent by the requests fallback
+def requests_prompt(batch, fields):
+    return f"""
+                Extract the following fields from these foreclosure notices and return as JSON: 
+{numbered_fields(fields, '                ')}
+                
+                IMPORTANT: 
+                1. Please use EXACTLY these field names in your response.
+                2. The original 'Name' field should be split into First Name, Middle Name, and Last Name.
+                3. If there is no middle name, return an empty string for Middle Name.
+                4. Use 'Street Address' instead of 'Address' for the street address field.
+                5. Return a JSON array with one object per notice, each with the same "id" as its notice.
+                
+                Here's the data: {serialize_batch(batch)}
+                """
+
+
+class Extractor:
+    """The Groq stage: turns scraped notices into the processed CSV (and Parquet / database copies).
+
+    Rule-based extraction and the extraction cache fill what they can; the
+    rest is sent to Groq in token-packed batches, `groq_workers` at a time.
+    The groq package is only imported when run() is called.
+    """
+
+    def __init__(self, settings=None, state_store=None, notice_db=None):
+        self.settings = settings = settings or Settings()
+        self.state_store = state_store
+        self.notice_db = notice_db
+        self.groq_limiter = GroqRateLimiter(settings.groq_requests_per_minute, settings.groq_tokens_per_minute)
+
+        # Cached extractions are only reused with the model and prompts that produced them
+        self.llm_cache = None
+        if settings.llm_cache:
+            self.llm_cache = ExtractionCache(settings.llm_cache, prompt_fingerprint(
+                settings.groq_model, groq_prompt([], AI_FIELDNAMES), requests_prompt([], AI_FIELDNAMES)
+            ))
+
+        # Fields with fixed legal wording are filled locally; the model is only asked for the rest
+        self.rule_extractor = RuleExtractor()
+
+    def pending_records(self):
+        """A fresh stream of the records waiting for processing."""
+        # Incremental runs also retry notices whose processing failed in earlier runs
+        if self.state_store:
+            return self.state_store.unprocessed_records()
+        return iter_records(self.settings.jsonl_filename)
+
+    @staticmethod
+    def unresolved_fields(record):
+        return [field for field in AI_FIELDNAMES if field not in record["_rule_values"]]
+
+    # Fields the model is asked for in a batch: everything unresolved in any of its notices
+    def batch_fields(self, batch):
+        needed = set()
+        for record in batch:
+            needed.update(self.unresolved_fields(record))
+        return [field for field in AI_FIELDNAMES if field in needed]
+
+    # Expected reply size for a notice, in proportion to the fields still asked for
+    def reply_tokens(self, record):
+        return (20 + self.settings.llm_output_tokens_per_record * len(self.unresolved_fields(record))
+                // len(AI_FIELDNAMES))
+
+    # Rough token count of a call (prompt plus expected reply), reserved from the
+    # shared Groq rate-limit bucket before the call is made
+    def estimate_tokens(self, prompt, batch):
+        return estimate_text_tokens(prompt) + sum(self.reply_tokens(record) for record in batch)
+
+    # The reply may use whatever context the prompt leaves, up to the output limit
+    def reply_token_limit(self, batch):
+        prompt_tokens = PROMPT_OVERHEAD_TOKENS + estimate_text_tokens(serialize_batch(batch))
+        return max(256, min(self.settings.llm_max_output_tokens, self.settings.llm_context_tokens - prompt_tokens))
+
+    # Send the batches groq_workers at a time and save the results in batch order
+    @metrics.timed("groq_batches")
+    def process_batches(self, records, extract_batch):
+        settings = self.settings
+        llm_cache = self.llm_cache
+        ai_csv_filename = settings.processed_csv_filename
+        print(f"Saving processed data to {ai_csv_filename}...")
+        processed_sink = ProcessedCsvSink(ai_csv_filename)
+        parquet_sink = None
+        if settings.parquet_dir:
+            try:
+                from .parquet_sink import ParquetSink
+                parquet_sink = ParquetSink(settings.parquet_dir)
+                print(f"Saving a Parquet copy to {settings.parquet_dir}/")
+            except ImportError:
+                print("pyarrow not installed, skipping the Parquet output. Install it with: pip install pyarrow")
+
+        # Rules only return values the notice's wording pins down, so they take
+        # precedence over what the model returned
+        def save_results(matched_records, processed_records):
+            results = [{**result, **record["_rule_values"]}
+                       for record, result in zip(matched_records, processed_records)]
+            with metrics.stage("csv_write"), profiler.stage("csv_write"):
+                processed_sink.write(results)
+            if parquet_sink:
+                with metrics.stage("parquet_write"):
+                    parquet_sink.write(matched_records, results)
+            if self.notice_db:
+                with metrics.stage("db_write"):
+                    self.notice_db.upsert_processed(matched_records, results)
+            metrics.count_records("processed", len(results))
+
+            # Remember which notices made it through the LLM
+            if self.state_store and matched_records:
+                self.state_store.mark_processed(matched_records)
+
+        # Run the rules on every notice. Notices with nothing left to resolve, or already
+        # extracted under the same prompt, are saved straight away; only the rest
+        # continue to the batches sent to Groq.
+        def local_misses(records):
+            hits = []
+            for record in records:
+                with metrics.stage("rules"):
+                    record["_rule_values"] = self.rule_extractor.extract(record)
+                fields = self.unresolved_fields(record)
+                if not fields:
+                    cached_result = {}
+                else:
+                    cached_result = llm_cache.lookup(record, fields) if llm_cache else None
+                if cached_result is None:
+                    yield record
+                    continue
+                hits.append((record, cached_result))
+                if len(hits) == 500:
+                    save_results([record for record, _ in hits], [result for _, result in hits])
+                    hits = []
+            if hits:
+                save_results([record for record, _ in hits], [result for _, result in hits])
+
+        # Pack as many notices into each call as the context window allows, keeping
+        # room for the reply; the output limit caps how many records a batch can hold
+        batches = pack_batches(local_misses(records), settings.llm_context_tokens - PROMPT_OVERHEAD_TOKENS,
+                               settings.llm_max_output_tokens - 200, self.reply_tokens)
+
+        # Results are matched back to their notices by id. Notices missing from a
+        # reply (usually a truncated one) are sent again in smaller batches.
+        # Profiled per batch on the worker threads, apart from the CSV writes on this one.
+        @profiler.profiled("groq_batches")
+        def extract_and_match(batch_number, batch):
+            matched_records, matched_results, missing = match_results(batch, extract_batch(batch_number, batch))
+            if missing and len(batch) > 1:
+                print(f"Batch {batch_number}: {len(missing)} notices missing from the reply, retrying them")
+                metrics.retry("llm_missing_records", len(missing))
+                half = (len(missing) + 1) // 2
+                for retry_batch in (missing[:half], missing[half:]):
+                    if retry_batch:
+                        retry_records, retry_results = extract_and_match(batch_number, retry_batch)
+                        matched_records.extend(retry_records)
+                        matched_results.extend(retry_results)
+            return matched_records, matched_results
+
+        numbered_batches = enumerate(batches, 1)
+        with ThreadPoolExecutor(max_workers=settings.groq_workers) as executor:
+            # Hand out a window of batches at a time so the records are still streamed
+            for window in iter_batches(numbered_batches, settings.groq_workers * 2):
+                results = executor.map(lambda item: extract_and_match(*item), window)
+                for (batch_number, batch), (matched_records, processed_records) in zip(window, results):
+                    save_results(matched_records, processed_records)
+                    if llm_cache:
+                        llm_cache.store(matched_records, processed_records,
+                                        [self.unresolved_fields(record) for record in matched_records])
+
+                    print(f"Processed batch {batch_number} of {len(batch)} notices "
+                          f"({processed_sink.records_written} records saved so far)")
+
+        processed_sink.close()
+        if parquet_sink:
+            parquet_sink.close()
+            print(f"Wrote {parquet_sink.records_written} records to the Parquet dataset in {settings.parquet_dir}/")
+        print(self.rule_extractor.summary())
+        if llm_cache:
+            print(llm_cache.summary())
+        return ai_csv_filename
+
+    def process_batch_with_requests(self, batch, api_key, processed_records):
+        """Send one batch with plain requests and add the parsed results to processed_records."""
+        import requests
+
+        settings = self.settings
+        api_url = f"{settings.groq_base_url}/openai/v1/chat/completions"
+
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
+
+        payload = {
+            "model": settings.groq_model,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": requests_prompt(batch, self.batch_fields(batch))}
+            ],
+            "temperature": 0.2,
+            "max_tokens": self.reply_token_limit(batch)
+        }
+
+        estimated_tokens = self.estimate_tokens(payload["messages"][1]["content"], batch)
+
+        try:
+            # Make the API call, waiting on the shared limiter and retrying on 429
+            for attempt in range(settings.groq_max_retries + 1):
+                self.groq_limiter.acquire(estimated_tokens)
+                response = requests.post(api_url, headers=headers, json=payload, timeout=settings.groq_timeout,
+                                         hooks={'response': metrics.observe_response})
+                self.groq_limiter.update(response.headers)
+                if response.status_code != 429 or attempt == settings.groq_max_retries:
+                    break
+                metrics.retry("groq_rate_limit")
+                delay = self.groq_limiter.backoff(response.headers, attempt)
+                print(f"Groq rate limit reached, retrying in {delay:.1f}s...")
+
+            if response.status_code == 200:
+                result = response.json()
+                usage = result.get("usage", {})
+                self.groq_limiter.record_usage(estimated_tokens, usage.get("total_tokens"))
+                metrics.add_tokens(usage.get("prompt_tokens"), usage.get("completion_tokens"))
+                content = result["choices"][0]["message"]["content"]
+
+                # Try to parse the response
+                batch_records = parse_reply(content)
+                if batch_records is None:
+                    print("Could not parse response for this batch")
+                else:
+                    processed_records.extend(batch_records)
+            else:
+                print(f"API call failed with status code {response.status_code}")
+                print(response.text)
+
+        except Exception as e:
+            print(f"Error making API request: {str(e)}")
+
+    def process_with_requests(self, records, api_key):
+        """Process every record with the requests fallback."""
+        if not api_key:
+            print("No API key provided for fallback processing")
+            return
+
+        # Each batch goes through process_batch_with_requests, so the fallback
+        # shares the Groq rate limiter with everything else
+        def extract_batch(batch_number, batch):
+            processed_records = []
+            self.process_batch_with_requests(batch, api_key, processed_records)
+            return processed_records
+
+        ai_csv_filename = self.process_batches(records, extract_batch)
+        print(f"AI processing completed with fallback method. Saved to {ai_csv_filename}")
+
+    def groq_extract_batch(self, client, rate_limit_error, batch_number, batch):
+        """Send one batch with the Groq client; several run at once from process_batches."""
+        settings = self.settings
+        processed_records = []
+
+        # Create a combined prompt with the current batch
+        combined_prompt = groq_prompt(batch, self.batch_fields(batch))
+
+        # Make API call to Groq, waiting on the shared limiter and retrying on 429
+        estimated_tokens = self.estimate_tokens(combined_prompt, batch)
+        try:
+            for attempt in range(settings.groq_max_retries + 1):
+                self.groq_limiter.acquire(estimated_tokens)
+                call_started = time.perf_counter()
+                try:
+                    raw_response = client.chat.completions.with_raw_response.create(
+                        model=settings.groq_model,
+                        messages=[
+                            {"role": "system", "content": SYSTEM_PROMPT},
+                            {"role": "user", "content": combined_prompt}
+                        ],
+                        temperature=0.2,
+                        max_tokens=self.reply_token_limit(batch)
+                    )
+                    metrics.observe_request("groq_chat", time.perf_counter() - call_started,
+                                            raw_response.status_code, len(raw_response.http_response.content))
+                    break
+                except rate_limit_error as e:
+                    metrics.observe_request("groq_chat", time.perf_counter() - call_started,
+                                            e.response.status_code, len(e.response.content))
+                    self.groq_limiter.update(e.response.headers)
+                    if attempt == settings.groq_max_retries:
+                        raise
+                    metrics.retry("groq_rate_limit")
+                    delay = self.groq_limiter.backoff(e.response.headers, attempt)
+                    print(f"Groq rate limit reached, retrying in {delay:.1f}s...")
+
+            self.groq_limiter.update(raw_response.headers)
+            response = raw_response.parse()
+            self.groq_limiter.record_usage(estimated_tokens, response.usage.total_tokens if response.usage else None)
+            if response.usage:
+                metrics.add_tokens(response.usage.prompt_tokens, response.usage.completion_tokens)
+
+            # Parse the response from Groq
+            result = response.choices[0].message.content
+
+            # Parse the AI's response to get structured data
+            batch_records = parse_reply(result)
+            if batch_records is None:
+                print(f"Received text response from Groq for batch {batch_number}, manual parsing needed.")
+                print(result[:500] + "..." if len(result) > 500 else result)
+            else:
+                processed_records.extend(batch_records)
+
+        except Exception as e:
+            print(f"Error calling Groq API: {str(e)}")
+            # If there's an error with the Groq client, fall back to using requests
+            print("Falling back to using requests for this batch...")
+            self.process_batch_with_requests(batch, settings.groq_api_key, processed_records)
+
+        return processed_records
+
+    def run(self, records=None):
+        """Process `records` (by default the ones waiting for processing) with Groq, falling back to requests.
+
+        The fallback goes over the records again, so `records` given as a
+        one-shot iterator is read into a list first. The default records are
+        streamed afresh from the state store or the JSONL file instead.
+        """
+        print("Starting data processing with Groq API...")
+        if records is not None and iter(records) is records:
+            records = list(records)
+        try:
+            from groq import Groq, RateLimitError
+
+            # Stream the foreclosure data instead of loading it all
+            foreclosure_data = records if records is not None else self.pending_records()
+
+            if not self.settings.groq_api_key:
+                print("GROQ_API_KEY not found in environment variables.")
+                raise ValueError("GROQ_API_KEY is required")
+
+            # Its own retries are turned off so every attempt goes through the shared rate limiter
+            client = Groq(api_key=self.settings.groq_api_key, base_url=self.settings.groq_base_url, max_retries=0,
+                          timeout=self.settings.groq_timeout)
+
+            ai_csv_filename = self.process_batches(
+                foreclosure_data, lambda batch_number, batch: self.groq_extract_batch(client, RateLimitError,
+                                                                                      batch_number, batch)
+            )
+            print(f"AI processing completed. Saved processed data to {ai_csv_filename}")
+
+        except ImportError:
+            print("Groq package not installed. Install it with: pip install groq")
+        except Exception as e:
+            print(f"Error during Groq processing: {str(e)}")
+            print("Falling back to using direct API calls with requests...")
+            self.process_with_requests(records if records is not None else self.pending_records(),
+                                       self.settings.groq_api_key)
@@ -0,0 +1,75 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from .llm_batches import compact_record
+
+
+def prompt_fingerprint(*parts):
+    """Short hash identifying a model and prompt combination."""
+    return hashlib.sha256("\n".join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+class ExtractionCache:
+    """SQLite cache of the structured records the LLM extracted, keyed by notice content.
+
+    The key is a hash of the notice fields sent to the model, the output fields
+    it was asked for and `prompt_version`, a fingerprint of the model name and
+    prompt text. Changing
+    either gives every notice a new key, and entries made under another prompt
+    version are dropped when the cache is opened.
+    """
+
+    def __init__(self, path, prompt_version):
+        self.prompt_version = prompt_version
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS extractions (
+                content_key TEXT PRIMARY KEY,
+                prompt_version TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("DELETE FROM extractions WHERE prompt_version != ?", (prompt_version,))
+        self.conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def content_key(self, record, fields):
+        notice = json.dumps(compact_record(record, 0), sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(f"{self.prompt_version}\n{'|'.join(fields)}\n{notice}".encode('utf-8')).hexdigest()
+
+    def lookup(self, record, fields):
+        """Return the cached result of asking the model for `fields` of a scraped record, or None."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT result FROM extractions WHERE content_key = ?", (self.content_key(record, fields),)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def store(self, records, results, fields_per_record):
+        """Save the result extracted for each record, along with the fields it was asked for."""
+        now = time.time()
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO extractions (content_key, prompt_version, result, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(self.content_key(record, fields), self.prompt_version, json.dumps(result), now)
+                 for record, result, fields in zip(records, results, fields_per_record)]
+            )
+            self.conn.commit()
+
+    def summary(self):
+        return f"LLM cache: {self.hits} hits, {self.misses} sent to Groq"
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,231 @@
+from datetime import datetime
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from .metrics import metrics
+
+# Base URL
+BASE_URL = "https://legalnews.com"
+
+# Seconds to wait for a response before a request counts as failed (and is retried where the caller retries)
+REQUEST_TIMEOUT = 30
+
+# Set headers to mimic a browser
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# Fallback list if the county dropdown is not found on the page
+FALLBACK_COUNTIES = [
+    "All Counties", "Alcona", "Alger", "Allegan", "Alpena", "Antrim", "Arenac", "Baraga",
+    "Barry", "Bay", "Benzie", "Berrien", "Branch", "Calhoun", "Cass", "Charlevoix",
+    "Cheboygan", "Chippewa", "Clare", "Clinton", "Crawford", "Delta", "Dickinson",
+    "Eaton", "Emmet", "Genesee", "Gladwin", "Gogebic", "Grand Traverse", "Gratiot",
+    "Hillsdale", "Houghton", "Huron", "Ingham", "Ionia", "Iosco", "Iron", "Isabella",
+    "Jackson", "Kalamazoo", "Kalkaska", "Kent", "Keweenaw", "Lake", "Lapeer", "Leelanau",
+    "Lenawee", "Livingston", "Luce", "Mackinac", "Macomb", "Manistee", "Marquette",
+    "Mason", "Mecosta", "Menominee", "Midland", "Missaukee", "Monroe", "Montcalm",
+    "Montmorency", "Muskegon", "Newaygo", "Oakland", "Oceana", "Ogemaw", "Ontonagon",
+    "Osceola", "Oscoda", "Otsego", "Ottawa", "Presque Isle", "Roscommon", "Saginaw",
+    "Saint Clair", "Saint Joseph", "Sanilac", "Schoolcraft", "Shiawassee", "Tuscola",
+    "Van Buren", "Washtenaw", "Wayne", "Wexford"
+]
+
+
+class SessionExpiredError(Exception):
+    """Raised when legalnews.com sends a request back to the login page."""
+
+
+class FetchError(Exception):
+    """Raised when the search or a results page still fails after its retries."""
+
+
+def check_logged_in(response_url):
+    """Raise SessionExpiredError if a request was redirected to the login page."""
+    if urlparse(str(response_url)).path.rstrip('/').lower() == '/home/login':
+        raise SessionExpiredError("legalnews.com session is no longer logged in")
+
+
+def public_notices_url(base_url=BASE_URL):
+    return f"{base_url}/Home/PublicNotices"
+
+
+def new_session(pool_size):
+    """Create a session whose connection pool fits `pool_size` parallel requests."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # Record the latency, status and size of every response
+    session.hooks['response'].append(metrics.observe_response)
+    return session
+
+
+def extract_token(soup):
+    token_input = soup.find('input', {'name': '__RequestVerificationToken'})
+    return token_input['value'] if token_input else None
+
+
+def login(session, username, password, base_url=BASE_URL):
+    """Log the session in. Returns (login_response, login_token)."""
+    # Step 1: Visit the login page to get the anti-forgery token
+    login_page_url = f"{base_url}/Home/Login"
+    print(f"Visiting login page at {login_page_url}...")
+    login_page = session.get(login_page_url, headers=HEADERS, timeout=REQUEST_TIMEOUT)
+    print(f"Login page status code: {login_page.status_code}")
+
+    # Step 2: Parse the login page to extract the token
+    token = extract_token(BeautifulSoup(login_page.text, 'html.parser'))
+    print(f"Extracted token: {token}")
+
+    # Step 3: Prepare the login payload
+    payload = {
+        "UserName": username,
+        "Password": password,
+        "__RequestVerificationToken": token
+    }
+
+    # Step 4: Submit the login form
+    login_url = f"{base_url}/Home/ValidateUser"
+    print(f"Sending login request to {login_url}...")
+    login_response = session.post(login_url, data=payload, headers=HEADERS, timeout=REQUEST_TIMEOUT)
+    print(f"Login response status code: {login_response.status_code}")
+    return login_response, token
+
+
+def open_search_form(session, login_token, base_url=BASE_URL):
+    """Load the Public Notices page. Returns (search_token, counties, counties_values)."""
+    # Step 6: Navigate to Public Notices page
+    notices_url = public_notices_url(base_url)
+    print(f"Navigating to Public Notices at {notices_url}...")
+    public_notices_page = session.get(notices_url, headers=HEADERS, timeout=REQUEST_TIMEOUT)
+    print(f"Public Notices page status code: {public_notices_page.status_code}")
+    check_logged_in(public_notices_page.url)
+
+    # Step 7: Get the search form token
+    search_soup = BeautifulSoup(public_notices_page.text, 'html.parser')
+    search_token = extract_token(search_soup)
+
+    # Debug token extraction
+    if search_token:
+        print(f"Extracted search token: {search_token}")
+    else:
+        print("Warning: Could not extract search token")
+        # Try to find any form with a token
+        forms = search_soup.find_all('form')
+        for form in forms:
+            token_input = form.find('input', {'name': '__RequestVerificationToken'})
+            if token_input and token_input.get('value'):
+                search_token = token_input.get('value')
+                print(f"Found alternative token: {search_token}")
+                break
+
+        # If still no token, reuse the login token as a fallback
+        if not search_token:
+            print("Using login token as fallback")
+            search_token = login_token
+
+    # Extract all counties from the dropdown
+    county_dropdown = search_soup.find('select', {'id': 'drpcounty'})
+    counties = []
+    counties_values = {}  # Store the values along with the display text
+
+    if county_dropdown:
+        print("Found county dropdown")
+        # First add "All Counties" option if it exists
+        all_counties_option = county_dropdown.find('option', {'value': 'all'})
+        if all_counties_option:
+            counties.append("All Counties")
+            counties_values["All Counties"] = "all"  # Store the value "all" for All Counties
+
+        # Then add individual counties
+        for option in county_dropdown.find_all('option'):
+            if option.get('data-isaccess') == "True":
+                county_name = option.text.strip()
+                counties.append(county_name)
+                # Store the value attribute if it exists, otherwise use the text
+                counties_values[county_name] = option.get('value', county_name)
+
+        print(f"Found {len(counties)} counties")
+    else:
+        counties = list(FALLBACK_COUNTIES)
+        # Set default values for fallback
+        counties_values = {county: county for county in counties}
+        counties_values["All Counties"] = "all"  # Special case for All Counties
+        print(f"Using fallback county list with {len(counties)} counties")
+
+    return search_token, counties, counties_values
+
+
+def format_search_dates(start_date, end_date):
+    """Convert MM/DD/YYYY dates to the YYYY-MM-DD format expected by the website."""
+    try:
+        start_date_obj = datetime.strptime(start_date, "%m/%d/%Y")
+        end_date_obj = datetime.strptime(end_date, "%m/%d/%Y")
+        return start_date_obj.strftime("%Y-%m-%d"), end_date_obj.strftime("%Y-%m-%d")
+    except ValueError:
+        print("Invalid date format. Using empty dates.")
+        return "", ""
+
+
+def build_search_form(search_token, county_value, formatted_start_date, formatted_end_date):
+    """Return the search form fields as a list of tuples (the form repeats some keys)."""
+    search_data = {
+        "action": "search",
+        "search": "",
+        "__RequestVerificationToken": search_token,
+        "foreclosurePrevention": "false",
+        "probates": "false",
+        "vehicleAbandonment": "false",
+        "other": "false",
+        "drpproximity": "county",
+        "drpcounty": county_value,
+        "city": "",
+        "zip": "",
+        "first_date_published": formatted_start_date,
+        "first_date_published_thru": formatted_end_date,
+        "last_date_published": "",
+        "last_date_published_thru": "",
+        "published_sale_date": "",
+        "published_sale_date_thru": "",
+        "nameOfNotice": "",
+        "addressOfNotice": "",
+        "attorney": "",
+        "fileNumber": "",
+        "internalId": "",
+        "advancedSearchResults": "1",
+        "proximity": "county",
+        "county": county_value
+    }
+
+    # We can't have duplicate keys in a Python dictionary, so we need to handle the form data differently
+    # Create a list of tuples for the form data to preserve duplicate keys
+    form_data = list(search_data.items())
+
+    # Add the special checkbox fields
+    # For "foreclosures", we want it checked (true)
+    form_data.append(("foreclosures", "true"))
+    form_data.append(("foreclosures", "false"))
+
+    # For other checkboxes, we want them unchecked (only false)
+    form_data.append(("foreclosurePrevention", "false"))
+    form_data.append(("probates", "false"))
+    form_data.append(("vehicleAbandonment", "false"))
+    form_data.append(("other", "false"))
+
+    return form_data
+
+
+def search_headers(base_url=BASE_URL):
+    # Update headers to include referer
+    headers = HEADERS.copy()
+    headers['Referer'] = public_notices_url(base_url)
+    headers['Content-Type'] = 'application/x-www-form-urlencoded'
+    return headers
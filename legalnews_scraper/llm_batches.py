@@ -0,0 +1,130 @@
+import json
+
+# Fields of a scraped record the model needs; url and foreclosure_number stay out of the prompt
+LLM_INPUT_FIELDS = ('name', 'address', 'published_dates', 'description')
+
+# How each output field is described to the model
+FIELD_DESCRIPTIONS = {
+    'First Name': "First Name (extracted from the person's name)",
+    'Middle Name': "Middle Name (extracted from the person's name, can be empty)",
+    'Last Name': "Last Name (extracted from the person's name)",
+    'Street Address': "Street Address (the full street address)",
+    'City': "City",
+    'State': "State",
+    'Zip': "Zip",
+    'Mortgage or a lien (Condo?)': "Mortgage or a lien (Condo?)",
+    'Sale Date': "Sale Date",
+    'Amount Due': "Amount Due",
+    'Redemption Period': "Redemption Period",
+    'Attorney Name': "Attorney Name",
+    'Attorney Address': "Attorney Address",
+    'Attorney phone number': "Attorney phone number (as 'Attorney phone number')",
+    'Attorney File #': "Attorney File #",
+    'First date published in Legal News': "First date published in Legal News (as 'First date published in Legal News')",
+    'Last Date Published in Legal News': "Last Date Published in Legal News",
+    "Lender/Mortgage company's name": "Lender/Mortgage company's name",
+    'Recorded Date': "Recorded Date",
+}
+
+# Tokens taken by the instructions around the notice data in each prompt
+PROMPT_OVERHEAD_TOKENS = 800
+
+
+def estimate_text_tokens(text):
+    """Rough token count of a text (Llama tokenizers average about 4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def numbered_fields(fields, indent):
+    """The prompt's numbered list of the fields to extract."""
+    return "\n".join(f"{indent}{number}) {FIELD_DESCRIPTIONS[field]}" for number, field in enumerate(fields, 1))
+
+
+def compact_record(record, record_id):
+    """Return the part of a scraped record sent to the model, tagged with its id in the batch."""
+    compact = {"id": record_id}
+    for field in LLM_INPUT_FIELDS:
+        if record.get(field):
+            compact[field] = record[field]
+    return compact
+
+
+def serialize_batch(batch):
+    """Compact JSON of a batch for the prompt. Each record's id is its 1-based position in the batch."""
+    return json.dumps([compact_record(record, record_id) for record_id, record in enumerate(batch, 1)],
+                      separators=(',', ':'), ensure_ascii=False)
+
+
+def pack_batches(records, token_budget, reply_budget, reply_tokens):
+    """Group records into batches whose prompt data and expected replies fit in token_budget.
+
+    `reply_tokens(record)` estimates the reply for one record; a batch's replies
+    together stay within reply_budget, so the reply fits the model's output
+    limit. A record too large for the budget on its own is sent in a batch by
+    itself.
+    """
+    batch = []
+    used_tokens = 0
+    used_reply_tokens = 0
+    for record in records:
+        reply = reply_tokens(record)
+        cost = estimate_text_tokens(json.dumps(compact_record(record, 0), separators=(',', ':'), ensure_ascii=False))
+        cost += reply
+        if batch and (used_tokens + cost > token_budget or used_reply_tokens + reply > reply_budget):
+            yield batch
+            batch = []
+            used_tokens = 0
+            used_reply_tokens = 0
+        batch.append(record)
+        used_tokens += cost
+        used_reply_tokens += reply
+    if batch:
+        yield batch
+
+
+def parse_reply(content):
+    """Return the records of a model reply: a JSON array, bare or in a ``` / ```json block.
+
+    Returns None when the reply holds no JSON.
+    """
+    if '```' in content:
+        content = content.split('```')[1]
+        if content.startswith('json'):
+            content = content[4:]
+    try:
+        batch_records = json.loads(content.strip())
+    except ValueError:
+        return None
+    return batch_records if isinstance(batch_records, list) else [batch_records]
+
+
+def match_results(batch, results):
+    """Map the model's results back onto the batch records by their id.
+
+    Returns (records, results, missing): the records that got a result with
+    their results, both in batch order, and the records that didn't. When the
+    reply has no ids at all but exactly one result per record, results are
+    matched by position.
+    """
+    results = [result for result in results if isinstance(result, dict)]
+    by_id = {}
+    for result in results:
+        id_key = next((key for key in result if key.lower() == 'id'), None)
+        if id_key is None:
+            continue
+        try:
+            result_id = int(result[id_key])
+        except (TypeError, ValueError):
+            continue
+        by_id[result_id] = {key: value for key, value in result.items() if key != id_key}
+    if not by_id and len(results) == len(batch):
+        by_id = dict(enumerate(results, 1))
+
+    matched_records, matched_results, missing = [], [], []
+    for record_id, record in enumerate(batch, 1):
+        if record_id in by_id:
+            matched_records.append(record)
+            matched_results.append(by_id[record_id])
+        else:
+            missing.append(record)
+    return matched_records, matched_results, missing
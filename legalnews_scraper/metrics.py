@@ -0,0 +1,216 @@
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+METRIC_PREFIX = "foreclosure_scraper"
+
+
+def endpoint_name(method, url):
+    """Short name of the legalnews.com / Groq endpoint a request went to, used as a metric label."""
+    path = urlparse(str(url)).path.rstrip('/').lower()
+    if path.endswith('/chat/completions'):
+        return 'groq_chat'
+    if path == '/home/login':
+        return 'login_page'
+    if path == '/home/validateuser':
+        return 'login'
+    if path.startswith('/home/publicnoticesdetails/'):
+        return 'detail'
+    if path == '/home/publicnotices':
+        if method.upper() == 'POST':
+            return 'search'
+        return 'results_page' if 'page=' in urlparse(str(url)).query else 'search_form'
+    return 'other'
+
+
+class Metrics:
+    """Thread-safe counters and timings for one run, written out as a Prometheus textfile and a JSON summary.
+
+    Stage times are summed over every call, so a stage run by several workers
+    at once can add up to more than the run's wall time.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        self.stage_seconds = defaultdict(float)
+        self.stage_calls = defaultdict(int)
+        self.latency_buckets = defaultdict(lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+        self.latency_sum = defaultdict(float)
+        self.responses = defaultdict(int)  # (endpoint, status) -> count
+        self.bytes_downloaded = defaultdict(int)
+        self.retries = defaultdict(int)
+        self.tokens = defaultdict(int)
+        self.records = defaultdict(int)
+
+    def add_stage(self, stage, seconds):
+        with self.lock:
+            self.stage_seconds[stage] += seconds
+            self.stage_calls[stage] += 1
+
+    @contextmanager
+    def stage(self, stage):
+        """Time the enclosed block as one call of `stage`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(stage, time.perf_counter() - start)
+
+    def timed(self, stage):
+        """Decorator timing every call of a function (or coroutine function) as `stage`."""
+        def decorator(func):
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.stage(stage):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def observe_request(self, endpoint, seconds, status, size):
+        with self.lock:
+            buckets = self.latency_buckets[endpoint]
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    buckets[i] += 1
+                    break
+            else:
+                buckets[-1] += 1
+            self.latency_sum[endpoint] += seconds
+            self.responses[(endpoint, str(status))] += 1
+            self.bytes_downloaded[endpoint] += size
+
+    def observe_response(self, response, *args, **kwargs):
+        """requests response hook recording a legalnews.com response."""
+        self.observe_request(endpoint_name(response.request.method, response.url),
+                             response.elapsed.total_seconds(), response.status_code, len(response.content))
+
+    def retry(self, kind, count=1):
+        with self.lock:
+            self.retries[kind] += count
+
+    def add_tokens(self, prompt_tokens, completion_tokens):
+        with self.lock:
+            self.tokens['prompt'] += prompt_tokens or 0
+            self.tokens['completion'] += completion_tokens or 0
+
+    def count_records(self, kind, count):
+        with self.lock:
+            self.records[kind] += count
+
+    def summary(self):
+        """The run's metrics as a JSON-ready dict."""
+        with self.lock:
+            elapsed = time.time() - self.started_at
+            requests = {}
+            for endpoint, buckets in self.latency_buckets.items():
+                count = sum(buckets)
+                requests[endpoint] = {
+                    "count": count,
+                    "mean_seconds": round(self.latency_sum[endpoint] / count, 4) if count else 0,
+                    "bytes": self.bytes_downloaded[endpoint],
+                    "status": {status: n for (name, status), n in self.responses.items() if name == endpoint},
+                }
+            return {
+                "started_at": self.started_at,
+                "duration_seconds": round(elapsed, 3),
+                "stages": {stage: {"seconds": round(seconds, 3), "calls": self.stage_calls[stage]}
+                           for stage, seconds in self.stage_seconds.items()},
+                "requests": requests,
+                "retries": dict(self.retries),
+                "groq_tokens": dict(self.tokens),
+                "records": dict(self.records),
+                "records_per_second": {kind: round(count / elapsed, 2) if elapsed else 0
+                                       for kind, count in self.records.items()},
+            }
+
+    def prometheus_text(self):
+        """The run's metrics in the Prometheus text exposition format."""
+        summary = self.summary()
+        lines = []
+
+        def metric(name, metric_type, help_text, samples):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {metric_type}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{label}"' for key, label in labels.items())
+                lines.append(f"{METRIC_PREFIX}_{name}{{{label_text}}} {value}" if labels
+                             else f"{METRIC_PREFIX}_{name} {value}")
+
+        metric("last_run_timestamp_seconds", "gauge", "Time the run started.", [({}, summary["started_at"])])
+        metric("run_duration_seconds", "gauge", "Wall time of the run.", [({}, summary["duration_seconds"])])
+        metric("stage_seconds_total", "counter", "Time spent in each pipeline stage, summed over workers.",
+               [({"stage": stage}, values["seconds"]) for stage, values in summary["stages"].items()])
+        metric("stage_calls_total", "counter", "Calls of each pipeline stage.",
+               [({"stage": stage}, values["calls"]) for stage, values in summary["stages"].items()])
+
+        with self.lock:
+            histogram = []
+            for endpoint, buckets in self.latency_buckets.items():
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), buckets):
+                    cumulative += count
+                    histogram.append(("_bucket", {"endpoint": endpoint, "le": str(bound)}, cumulative))
+                histogram.append(("_sum", {"endpoint": endpoint}, round(self.latency_sum[endpoint], 6)))
+                histogram.append(("_count", {"endpoint": endpoint}, cumulative))
+            responses = sorted(self.responses.items())
+        name = f"{METRIC_PREFIX}_request_duration_seconds"
+        lines.append(f"# HELP {name} Request latency per endpoint.")
+        lines.append(f"# TYPE {name} histogram")
+        for suffix, labels, value in histogram:
+            label_text = ",".join(f'{key}="{label}"' for key, label in labels.items())
+            lines.append(f"{name}{suffix}{{{label_text}}} {value}")
+
+        metric("responses_total", "counter", "Responses per endpoint and HTTP status.",
+               [({"endpoint": endpoint, "status": status}, count) for (endpoint, status), count in responses])
+        metric("downloaded_bytes_total", "counter", "Response bytes downloaded per endpoint.",
+               [({"endpoint": endpoint}, values["bytes"]) for endpoint, values in summary["requests"].items()])
+        metric("retries_total", "counter", "Retries by kind.",
+               [({"kind": kind}, count) for kind, count in summary["retries"].items()])
+        metric("groq_tokens_total", "counter", "Groq tokens used, as reported by each response.",
+               [({"type": kind}, count) for kind, count in summary["groq_tokens"].items()])
+        metric("records_total", "counter", "Notices handled by each stage.",
+               [({"stage": kind}, count) for kind, count in summary["records"].items()])
+        metric("records_per_second", "gauge", "Notices handled per second of the run.",
+               [({"stage": kind}, rate) for kind, rate in summary["records_per_second"].items()])
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """Write the Prometheus textfile atomically, so the node exporter never reads half a file."""
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+        os.replace(temp_path, path)
+
+    def write_summary(self, path):
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+        os.replace(temp_path, path)
+
+    def stage_report(self):
+        """One line per stage, slowest first, for the end-of-run output."""
+        with self.lock:
+            stages = sorted(self.stage_seconds.items(), key=lambda item: item[1], reverse=True)
+            return "\n".join(f"  {stage:18} {seconds:9.2f}s  {self.stage_calls[stage]:7} calls"
+                             for stage, seconds in stages)
+
+
+# Metrics of the current run, shared by every module
+metrics = Metrics()
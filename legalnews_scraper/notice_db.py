@@ -0,0 +1,157 @@
+import sqlite3
+import threading
+import time
+
+from .notice_fields import TYPED_COLUMNS, notice_row, typed_fields
+
+RAW_COLUMNS = ['url', 'county', 'published_dates', 'address', 'name', 'description']
+PROCESSED_COLUMNS = [name for name, _, _ in TYPED_COLUMNS]
+COLUMN_TYPES = {'text': 'TEXT', 'date': 'TEXT', 'amount': 'REAL'}
+
+# Columns the query CLI filters on. Names are matched case-insensitively, so their
+# columns use NOCASE collation and prefix LIKE queries can use the index.
+INDEXED_COLUMNS = ['zip', 'sale_date', 'attorney_name', 'lender', 'county']
+NOCASE_COLUMNS = {'attorney_name', 'lender', 'county'}
+
+# Full-text index over the notice text, kept in sync with the notices table by triggers
+# (an upsert that leaves the text unchanged doesn't touch it).
+# The prefix indexes serve 2- and 3-character prefix queries (e.g. "mo*", "mor*") directly;
+# longer ones such as "morg*" are a range scan of the sorted term index, which is cheap already.
+FTS_COLUMNS = ['name', 'description']
+FTS_SCHEMA = f"""
+    CREATE VIRTUAL TABLE notices_fts USING fts5(
+        {', '.join(FTS_COLUMNS)}, content='notices', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    );
+    CREATE TRIGGER notices_fts_insert AFTER INSERT ON notices BEGIN
+        INSERT INTO notices_fts (rowid, {', '.join(FTS_COLUMNS)})
+        VALUES (new.rowid, {', '.join('new.' + column for column in FTS_COLUMNS)});
+    END;
+    CREATE TRIGGER notices_fts_delete AFTER DELETE ON notices BEGIN
+        INSERT INTO notices_fts (notices_fts, rowid, {', '.join(FTS_COLUMNS)})
+        VALUES ('delete', old.rowid, {', '.join('old.' + column for column in FTS_COLUMNS)});
+    END;
+    CREATE TRIGGER notices_fts_update AFTER UPDATE OF {', '.join(FTS_COLUMNS)} ON notices
+    WHEN {' OR '.join(f'old.{column} IS NOT new.{column}' for column in FTS_COLUMNS)} BEGIN
+        INSERT INTO notices_fts (notices_fts, rowid, {', '.join(FTS_COLUMNS)})
+        VALUES ('delete', old.rowid, {', '.join('old.' + column for column in FTS_COLUMNS)});
+        INSERT INTO notices_fts (rowid, {', '.join(FTS_COLUMNS)})
+        VALUES (new.rowid, {', '.join('new.' + column for column in FTS_COLUMNS)});
+    END;
+"""
+
+
+def like_prefix(text):
+    """LIKE pattern matching values that start with `text`, taken literally (use with ESCAPE '\\')."""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+class NoticeDatabase:
+    """SQLite database of scraped notices and their processed fields, one row per notice ID.
+
+    Scraped records are upserted as pages are committed and the processed fields
+    are filled in when the Groq stage saves them. Dates are stored as ISO text
+    (YYYY-MM-DD) so they sort and compare as dates, the amount due as a number.
+    The name and description are also indexed for full-text search when SQLite
+    has FTS5; `full_text` tells whether it does.
+    """
+
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        raw_columns = ",\n".join(
+            f"{name} TEXT" + (" COLLATE NOCASE" if name in NOCASE_COLUMNS else "") for name in RAW_COLUMNS
+        )
+        processed_columns = ",\n".join(
+            f"{name} {COLUMN_TYPES[kind]}" + (" COLLATE NOCASE" if name in NOCASE_COLUMNS else "")
+            for name, kind, _ in TYPED_COLUMNS
+        )
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS notices (
+                notice_id TEXT PRIMARY KEY,
+                {raw_columns},
+                {processed_columns},
+                scraped_at REAL,
+                processed_at REAL
+            )
+        """)
+        for column in INDEXED_COLUMNS:
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS notices_{column} ON notices ({column})")
+        self.conn.commit()
+        self.full_text = self._create_full_text_index()
+
+    def _create_full_text_index(self):
+        if self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'notices_fts'").fetchone():
+            return True
+        try:
+            self.conn.executescript(FTS_SCHEMA)
+        except sqlite3.OperationalError as e:
+            print(f"Full-text search disabled, this SQLite build has no FTS5 ({e})")
+            self.conn.rollback()
+            return False
+        # Index the notices stored before the index existed
+        self.conn.execute("INSERT INTO notices_fts (notices_fts) VALUES ('rebuild')")
+        self.conn.commit()
+        return True
+
+    def _upsert(self, rows, columns):
+        placeholders = ", ".join("?" * (len(columns) + 1))
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns)
+        with self.lock:
+            self.conn.executemany(
+                f"INSERT INTO notices (notice_id, {', '.join(columns)}) VALUES ({placeholders}) "
+                f"ON CONFLICT(notice_id) DO UPDATE SET {updates}",
+                [[row['notice_id']] + [row.get(column) for column in columns] for row in rows]
+            )
+            self.conn.commit()
+
+    def upsert_scraped(self, records):
+        """Insert or update scraped records, keeping any processed fields already stored."""
+        now = time.time()
+        self._upsert([{**record, **notice_row(record), 'scraped_at': now} for record in records],
+                     RAW_COLUMNS + ['scraped_at'])
+
+    def upsert_processed(self, raw_records, results):
+        """Store the processed fields of each result, with the scraped record it was extracted from."""
+        now = time.time()
+        rows = []
+        for raw_record, result in zip(raw_records, results):
+            row = {**raw_record, **notice_row(raw_record), 'processed_at': now}
+            for name, value in typed_fields(result).items():
+                row[name] = value.isoformat() if hasattr(value, 'isoformat') else value
+            rows.append(row)
+        self._upsert(rows, RAW_COLUMNS + PROCESSED_COLUMNS + ['processed_at'])
+
+    def query(self, zip_code=None, county=None, attorney=None, lender=None, sale_from=None, sale_to=None,
+              text=None, limit=100):
+        """Return (columns, rows) of the notices matching every filter given, latest sale date first.
+
+        attorney and lender match names starting with the given text, ignoring
+        case; sale_from and sale_to are inclusive YYYY-MM-DD dates. `text` is an
+        FTS5 query over the name and description: words, "quoted phrases",
+        prefixes such as mortg*, AND / OR / NOT.
+        """
+        if text and not self.full_text:
+            raise ValueError("full-text search needs an SQLite build with FTS5")
+        conditions, params = [], []
+        for sql, value in (("rowid IN (SELECT rowid FROM notices_fts WHERE notices_fts MATCH ?)", text),
+                           ("zip = ?", zip_code), ("county = ?", county),
+                           ("attorney_name LIKE ? ESCAPE '\\'", attorney and like_prefix(attorney)),
+                           ("lender LIKE ? ESCAPE '\\'", lender and like_prefix(lender)),
+                           ("sale_date >= ?", sale_from), ("sale_date <= ?", sale_to)):
+            if value:
+                conditions.append(sql)
+                params.append(value)
+        where = " AND ".join(conditions) or "1"
+        with self.lock:
+            cursor = self.conn.execute(
+                f"SELECT * FROM notices WHERE {where} ORDER BY sale_date DESC LIMIT ?", params + [limit]
+            )
+            return [column[0] for column in cursor.description], cursor.fetchall()
+
+    def close(self):
+        with self.lock:
+            # Refresh the planner statistics so multi-filter queries pick the most selective index
+            self.conn.execute("PRAGMA optimize")
+            self.conn.close()
@@ -0,0 +1,113 @@
+import re
+from datetime import date
+
+from .legalnews_session import FALLBACK_COUNTIES
+from .parsing import notice_id_from_url
+from .rule_extraction import DATE
+from .sinks import standardize_record
+
+# Typed columns of the processed data as stored by the Parquet and database sinks: column
+# name, value kind ("text", "date" or "amount") and the foreclosures_processed.csv column
+TYPED_COLUMNS = [
+    ('first_name', 'text', 'First Name'),
+    ('middle_name', 'text', 'Middle Name'),
+    ('last_name', 'text', 'Last Name'),
+    ('street_address', 'text', 'Street Address'),
+    ('city', 'text', 'City'),
+    ('state', 'text', 'State'),
+    ('zip', 'text', 'Zip'),
+    ('mortgage_or_lien', 'text', 'Mortgage or a lien (Condo?)'),
+    ('sale_date', 'date', 'Sale Date'),
+    ('amount_due', 'amount', 'Amount Due'),
+    ('redemption_period', 'text', 'Redemption Period'),
+    ('attorney_name', 'text', 'Attorney Name'),
+    ('attorney_address', 'text', 'Attorney Address'),
+    ('attorney_phone', 'text', 'Attorney phone number'),
+    ('attorney_file_number', 'text', 'Attorney File #'),
+    ('first_published', 'date', 'First date published in Legal News'),
+    ('last_published', 'date', 'Last Date Published in Legal News'),
+    ('lender', 'text', "Lender/Mortgage company's name"),
+    ('recorded_date', 'date', 'Recorded Date'),
+]
+
+# Month-name ("June 5, 2025", "Sept. 5 2025"), numeric ("6/5/2025", "6/5/25") and ISO dates.
+# A single regex is much cheaper than trying strptime formats in turn on every "N/A".
+DATE_VALUE_RE = re.compile(r'([A-Za-z]{3})[a-z]*\.?\s+(\d{1,2}),?\s+(\d{4})$|(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})$'
+                           r'|(\d{4})-(\d{2})-(\d{2})$')
+MONTHS = {month: number for number, month in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), 1)}
+FIRST_DATE_RE = re.compile(DATE)
+COUNTY_RE = re.compile(r'\b(' + '|'.join(re.escape(county) for county in FALLBACK_COUNTIES[1:]) + r') County\b')
+
+
+def parse_date(value):
+    """Parse the date formats seen in notices ("June 5, 2025", "6/5/2025", ...); None if it isn't one."""
+    if not isinstance(value, str):
+        return None
+    match = DATE_VALUE_RE.match(value.strip())
+    if not match:
+        return None
+    month_name, day, year, month, numeric_day, numeric_year, iso_year, iso_month, iso_day = match.groups()
+    try:
+        if month_name:
+            if month_name.lower() not in MONTHS:
+                return None
+            return date(int(year), MONTHS[month_name.lower()], int(day))
+        if month:
+            year = int(numeric_year)
+            if len(numeric_year) == 2:
+                # Same pivot as strptime's %y
+                year += 2000 if year < 69 else 1900
+            return date(year, int(month), int(numeric_day))
+        return date(int(iso_year), int(iso_month), int(iso_day))
+    except ValueError:
+        return None
+
+
+def parse_amount(value):
+    """"$123,456.78" -> 123456.78; None if there is no number."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        return None
+    match = re.search(r'\d[\d,]*(?:\.\d+)?', value)
+    return float(match.group(0).replace(',', '')) if match else None
+
+
+def notice_county(record):
+    """County searched for the notice, or the one its description names for "All Counties" searches."""
+    county = record.get('county')
+    if county and county != "All Counties":
+        return county
+    match = COUNTY_RE.search(record.get('description') or '')
+    return match.group(1) if match else "Unknown"
+
+
+def typed_fields(result):
+    """Standardize a processed record and convert it to {column: value} for TYPED_COLUMNS.
+
+    Dates become datetime.date, the amount due a float and "N/A" None.
+    """
+    standardized_record = standardize_record(result)
+    fields = {}
+    for name, kind, field in TYPED_COLUMNS:
+        value = standardized_record[field]
+        if kind == 'date':
+            fields[name] = parse_date(value)
+        elif kind == 'amount':
+            fields[name] = parse_amount(value)
+        else:
+            fields[name] = None if value in (None, "N/A") else str(value)
+    return fields
+
+
+def first_published(raw_record, fields):
+    """First publication date scraped from the site, falling back to the one the model returned."""
+    match = FIRST_DATE_RE.search(raw_record.get('published_dates') or '')
+    return (parse_date(match.group(1)) if match else None) or fields['first_published']
+
+
+def notice_row(raw_record):
+    """The key columns every stored notice has: its ID, url and county."""
+    return {'notice_id': notice_id_from_url(raw_record['url']), 'url': raw_record['url'],
+            'county': notice_county(raw_record)}
@@ -0,0 +1,66 @@
+import time
+import uuid
+
+import pyarrow as pa
+import pyarrow.dataset as pa_dataset
+
+from .notice_fields import TYPED_COLUMNS, first_published, notice_row, typed_fields
+
+COLUMN_TYPES = {'text': pa.string(), 'date': pa.date32(), 'amount': pa.float64()}
+
+# county and first_published_month are the partition keys
+PARQUET_SCHEMA = pa.schema(
+    [('notice_id', pa.string()), ('url', pa.string())]
+    + [(name, COLUMN_TYPES[kind]) for name, kind, _ in TYPED_COLUMNS]
+    + [('county', pa.string()), ('first_published_month', pa.string())]
+)
+PARTITIONING = pa_dataset.partitioning(
+    pa.schema([('county', pa.string()), ('first_published_month', pa.string())]), flavor='hive'
+)
+
+
+class ParquetSink:
+    """Appends processed records to a Parquet dataset partitioned by county and first-published month.
+
+    Rows are buffered and written every `flush_rows` records as new files under
+    root_dir/county=<county>/first_published_month=<YYYY-MM>/, so later runs add
+    files next to the existing ones instead of rewriting them. Dates and the
+    amount due are stored as typed columns.
+    """
+
+    def __init__(self, root_dir, flush_rows=10000):
+        self.root_dir = root_dir
+        self.flush_rows = flush_rows
+        # Unique per sink, so two runs in the same second don't overwrite each other's files
+        self.run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.flushes = 0
+        self.rows = []
+        self.records_written = 0
+
+    def write(self, raw_records, results):
+        """Add the processed results, each with the scraped record it was extracted from."""
+        for raw_record, result in zip(raw_records, results):
+            fields = typed_fields(result)
+            row = {**notice_row(raw_record), **fields}
+            published = first_published(raw_record, fields)
+            row['first_published_month'] = published.strftime("%Y-%m") if published else "unknown"
+            self.rows.append(row)
+
+        if len(self.rows) >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        table = pa.Table.from_pylist(self.rows, schema=PARQUET_SCHEMA)
+        pa_dataset.write_dataset(
+            table, self.root_dir, format='parquet', partitioning=PARTITIONING,
+            basename_template=f"part-{self.run_id}-{self.flushes}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore'
+        )
+        self.records_written += len(self.rows)
+        self.flushes += 1
+        self.rows = []
+
+    def close(self):
+        self.flush()
@@ -0,0 +1,232 @@
+import math
+import os
+import re
+
+from bs4 import BeautifulSoup
+
+from .metrics import metrics
+
+try:
+    import lxml.html as lxml_html
+except ImportError:
+    lxml_html = None
+
+# HTML parser used for all legalnews.com pages
+HTML_PARSER = 'html.parser'
+
+PAGE_OF_RE = re.compile(r'Page\s+\d+\s+of\s+(\d+)', re.IGNORECASE)
+RESULTS_FOUND_RE = re.compile(r'([\d,]+)\s+results?\s+found', re.IGNORECASE)
+NOTICE_ID_RE = re.compile(r'/PublicNoticesDetails/([^/?#]+)')
+
+
+def notice_id_from_url(detail_url):
+    """Return the notice ID from a /Home/PublicNoticesDetails/<id> URL (the URL itself if it has none)."""
+    match = NOTICE_ID_RE.search(detail_url)
+    return match.group(1) if match else detail_url
+
+
+def extract_detail_urls(soup, base_url):
+    """Return the full detail page URLs listed on a results page, in result order."""
+    # Find the result items - based on the image, we need to look for different HTML structure
+    result_items = []
+
+    # First try the div.result-item approach
+    div_results = soup.find_all('div', {'class': 'result-item'})
+    if div_results:
+        result_items = div_results
+    else:
+        # If that doesn't work, try to find the results in the format shown in the image
+        # Look for links with foreclosure addresses
+        links = soup.find_all('a')
+        for link in links:
+            # Check if this is a foreclosure link (has href to PublicNoticesDetails)
+            href = link.get('href', '')
+            if '/Home/PublicNoticesDetails/' in href:
+                result_items.append(link.parent)  # Add the parent element containing the link
+
+    detail_urls = []
+    for item in result_items:
+        # Find the link to the detail page
+        link = item.find('a')
+        if link and link.get('href'):
+            # Construct the full URL
+            href = link.get('href')
+            if href.startswith('/'):
+                detail_urls.append(base_url + href)
+            else:
+                detail_urls.append(base_url + '/' + href)
+
+    return detail_urls
+
+
+def find_pagination(soup):
+    """Return the element holding the pagination / "results found" text, if any."""
+    pagination = soup.find('div', {'id': 'pagination'})
+
+    # If we can't find pagination div, try alternative methods
+    if not pagination:
+        # Look for text containing "Page X of Y" or "results found"
+        page_text = soup.find(string=lambda t: t and (('Page' in t and 'of' in t) or 'results found' in t))
+        if page_text:
+            pagination = page_text.parent
+
+    return pagination
+
+
+def read_total_pages(pagination_text, results_on_page):
+    """Work out the number of results pages from the pagination text.
+
+    "Page X of Y" is used when present; otherwise the "N results found" count
+    is divided by the number of results on the first page. Returns None when
+    neither is available.
+    """
+    page_of = PAGE_OF_RE.search(pagination_text)
+    if page_of:
+        return int(page_of.group(1))
+
+    results_found = RESULTS_FOUND_RE.search(pagination_text)
+    if results_found and results_on_page:
+        total_results = int(results_found.group(1).replace(',', ''))
+        return max(1, math.ceil(total_results / results_on_page))
+
+    return None
+
+
+@metrics.timed("parse_results")
+def parse_results_page(html, base_url):
+    """Parse a results page once.
+
+    Returns (detail_urls, total_pages, has_next). total_pages is None when the
+    page doesn't state it, in which case callers follow the "Next" link instead.
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+    detail_urls = extract_detail_urls(soup, base_url)
+
+    pagination = find_pagination(soup)
+    if not pagination:
+        print("No pagination found")
+        return detail_urls, None, False
+
+    pagination_text = pagination.get_text()
+    print(f"Pagination text: {pagination_text}")
+    total_pages = read_total_pages(pagination_text, len(detail_urls))
+    has_next = find_next_link(pagination) is not None
+    return detail_urls, total_pages, has_next
+
+
+def count_search_results(html, base_url):
+    """Return how many notices a search matched, from its first results page.
+
+    Uses the "N results found" count when shown; otherwise estimates from the
+    page count and the number of results on the page.
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+    detail_urls = extract_detail_urls(soup, base_url)
+    pagination = find_pagination(soup)
+    if not pagination:
+        return len(detail_urls)
+
+    pagination_text = pagination.get_text()
+    results_found = RESULTS_FOUND_RE.search(pagination_text)
+    if results_found:
+        return int(results_found.group(1).replace(',', ''))
+    return (read_total_pages(pagination_text, len(detail_urls)) or 1) * len(detail_urls)
+
+
+def find_next_link(pagination):
+    """Return the "Next" link inside the pagination element, or None on the last page."""
+    # Try different ways to find the next link
+    next_link = pagination.find('a', string=lambda t: t and ('≫' in t or 'Next' in t))
+    if not next_link:
+        next_link = pagination.find('a', string=lambda s: s and ('Next' in s or '>' in s))
+
+    return next_link
+
+
+def parse_detail_fields_bs4(html, features=HTML_PARSER):
+    """Return (published_dates, address, name, description) using BeautifulSoup."""
+    detail_soup = BeautifulSoup(html, features)
+
+    # The published dates, address and name are the first three p.meta elements
+    meta = detail_soup.find_all('p', {'class': 'meta'}, limit=3)
+    published_dates = meta[0].text if meta else "No dates found"
+    address = meta[1].text if len(meta) > 1 else "No address found"
+    name = meta[2].text if len(meta) > 2 else "No name found"
+
+    description_elem = detail_soup.find('div', {'id': 'noticeDescription'})
+    description = description_elem.text.strip() if description_elem else "No description found"
+
+    return published_dates, address, name, description
+
+
+def parse_detail_fields_lxml(html):
+    """Return (published_dates, address, name, description) using lxml XPath directly."""
+    if not html.strip():
+        return "No dates found", "No address found", "No name found", "No description found"
+    tree = lxml_html.fromstring(html)
+
+    meta = tree.xpath("//p[contains(concat(' ', normalize-space(@class), ' '), ' meta ')]")
+    published_dates = meta[0].text_content() if meta else "No dates found"
+    address = meta[1].text_content() if len(meta) > 1 else "No address found"
+    name = meta[2].text_content() if len(meta) > 2 else "No name found"
+
+    description_elem = tree.xpath("//div[@id='noticeDescription']")
+    description = description_elem[0].text_content().strip() if description_elem else "No description found"
+
+    return published_dates, address, name, description
+
+
+def available_detail_parsers():
+    """Return the detail parser backends that can run in this environment."""
+    parsers = {'html.parser': parse_detail_fields_bs4}
+    if lxml_html is not None:
+        parsers['lxml'] = parse_detail_fields_lxml
+        parsers['bs4-lxml'] = lambda html: parse_detail_fields_bs4(html, 'lxml')
+    return parsers
+
+
+def get_detail_parser(name):
+    """Resolve a DETAIL_PARSER setting to a backend, falling back to html.parser."""
+    parsers = available_detail_parsers()
+    if name == 'auto':
+        name = 'lxml' if 'lxml' in parsers else 'html.parser'
+    if name not in parsers:
+        print(f"Detail parser '{name}' is not available, using html.parser")
+        name = 'html.parser'
+    return parsers[name]
+
+
+# Backend used to pull fields out of notice detail pages: "lxml", "bs4-lxml",
+# "html.parser", or "auto" (lxml when installed, html.parser otherwise). Read from
+# DETAIL_PARSER on the first detail page rather than at import, so a value in .env
+# (loaded after the imports) is honored.
+_detail_parser = None
+
+
+def set_detail_parser(name):
+    """Choose the detail parser backend for the rest of the run."""
+    global _detail_parser
+    _detail_parser = get_detail_parser(name.lower())
+
+
+def parse_detail_fields(html):
+    """Return (published_dates, address, name, description) with the configured backend."""
+    if _detail_parser is None:
+        set_detail_parser(os.getenv("DETAIL_PARSER", "auto"))
+    return _detail_parser(html)
+
+
+@metrics.timed("parse_detail")
+def parse_foreclosure_details(html, detail_url, foreclosure_number):
+    """Extract the foreclosure fields from a notice detail page."""
+    published_dates, address, name, description = parse_detail_fields(html)
+
+    # Create a dictionary for this foreclosure
+    return {
+        "foreclosure_number": foreclosure_number,
+        "published_dates": published_dates,
+        "address": address,
+        "name": name,
+        "description": description,
+        "url": detail_url
+    }
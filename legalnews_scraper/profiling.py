@@ -0,0 +1,157 @@
+import cProfile
+import functools
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Python 3.12+ cProfile is built on sys.monitoring: one profile at a time, seeing every thread
+SINGLE_PROFILER = sys.version_info >= (3, 12)
+
+
+class StageProfiler:
+    """cProfile profiles of the pipeline stages, written as one .prof file per stage.
+
+    Off by default: a profiled function then costs one attribute check per
+    call. cProfile only sees the thread it was enabled on, so every worker
+    thread gets its own profile per stage and they are merged at the end.
+    A stage entered inside another on the same thread pauses the outer
+    profile, so each file holds the time of its own stage only.
+
+    From Python 3.12 cProfile allows one active profile per process and it
+    records every thread. A call starting while another stage is profiled
+    is then run unprofiled and counted as skipped, and the report says so;
+    stages are kept to short blocks of their own work so they rarely
+    overlap.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.profiles = []  # (stage, cProfile.Profile) for every thread that ran a stage
+        self.calls = {}
+        self.seconds = {}
+        self.skipped = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def _profile(self, stage):
+        """This thread's profile of `stage`, created on first use."""
+        profiles = getattr(self.local, 'profiles', None)
+        if profiles is None:
+            profiles = self.local.profiles = {}
+            self.local.active = []
+        if stage not in profiles:
+            profiles[stage] = cProfile.Profile()
+            with self.lock:
+                self.profiles.append((stage, profiles[stage]))
+        return profiles[stage]
+
+    @contextmanager
+    def stage(self, stage):
+        """Profile the enclosed block as one call of `stage` (a no-op unless enabled)."""
+        if not self.enabled:
+            yield
+            return
+        profile = self._profile(stage)
+        active = self.local.active
+        outer = active[-1] if active else None
+        if outer is profile:
+            # Recursive call of the same stage, already being profiled
+            yield
+            return
+        if outer is not None:
+            outer.disable()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ allows one active profiler per interpreter, so a call
+            # overlapping another thread's profiled call runs unprofiled
+            with self.lock:
+                self.skipped[stage] = self.skipped.get(stage, 0) + 1
+            try:
+                yield
+            finally:
+                self._resume(outer)
+            return
+        active.append(profile)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            profile.disable()
+            active.pop()
+            with self.lock:
+                self.calls[stage] = self.calls.get(stage, 0) + 1
+                self.seconds[stage] = self.seconds.get(stage, 0.0) + time.perf_counter() - start
+            self._resume(outer)
+
+    @staticmethod
+    def _resume(outer):
+        """Re-enable the profile paused by a nested stage."""
+        if outer is not None:
+            try:
+                outer.enable()
+            except ValueError:
+                pass
+
+    def profiled(self, stage):
+        """Decorator profiling every call of a function as `stage` when profiling is on."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.stage(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def stage_stats(self):
+        """Merged pstats.Stats of every stage that ran."""
+        with self.lock:
+            profiles = list(self.profiles)
+        stats = {}
+        for stage, profile in profiles:
+            # A profile whose calls all overlapped another thread's holds nothing
+            profile.create_stats()
+            if not profile.stats:
+                continue
+            if stage in stats:
+                stats[stage].add(profile)
+            else:
+                stats[stage] = pstats.Stats(profile)
+        return stats
+
+    def write(self, profile_dir, top=20):
+        """Write <stage>.prof per stage and report.txt with each stage's top functions. Returns the report."""
+        os.makedirs(profile_dir, exist_ok=True)
+        report = io.StringIO()
+        if SINGLE_PROFILER:
+            report.write("Python 3.12+ runs one profile at a time: a profile also holds the calls other threads "
+                         "made while it was active, and calls overlapping another stage's were skipped.\n")
+        stage_stats = self.stage_stats()
+        for stage in sorted(set(self.skipped) - set(stage_stats)):
+            report.write(f"=== {stage}: not profiled, all {self.skipped[stage]} calls overlapped another stage\n")
+        for stage, stats in stage_stats.items():
+            stats.dump_stats(os.path.join(profile_dir, f"{stage}.prof"))
+            report.write(f"=== {stage}: {self.calls.get(stage, 0)} calls, "
+                         f"{self.seconds.get(stage, 0.0):.2f}s profiled")
+            if self.skipped.get(stage):
+                report.write(f", {self.skipped[stage]} overlapping calls not profiled")
+            report.write(f" ({stage}.prof)\n")
+            stats.stream = report
+            stats.sort_stats('tottime').print_stats(top)
+        with open(os.path.join(profile_dir, "report.txt"), 'w', encoding='utf-8') as f:
+            f.write(report.getvalue())
+        return report.getvalue()
+
+
+# Profiler of the current run, enabled by --profile
+profiler = StageProfiler()
@@ -0,0 +1,247 @@
+import asyncio
+import random
+import re
+import threading
+import time
+
+
+class RateLimiter:
+    """Spaces requests out so no more than `rate` start per second across all threads.
+
+    One limiter is shared by every worker talking to the same host, whether it
+    runs in a thread (wait) or on an event loop (reserve + asyncio.sleep).
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = time.monotonic()
+
+    def reserve(self):
+        """Reserve the next free slot and return how many seconds to wait for it."""
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        return slot - now
+
+    def wait(self):
+        # Reserve under the lock, then sleep outside it
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def server_overloaded(status):
+    """True for the responses that mean the server wants fewer requests: 429 and 5xx."""
+    return status == 429 or status >= 500
+
+
+def retry_after_seconds(headers):
+    """The Retry-After header in seconds, or None when it is missing or an HTTP date."""
+    try:
+        return max(0.0, float(headers.get('retry-after')))
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt, base, cap, retry_after=None):
+    """Seconds to wait before retry `attempt` (0-based): exponential backoff with full jitter.
+
+    The random spread keeps workers that failed together from retrying
+    together; a Retry-After from the server is a lower bound.
+    """
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    return max(delay, retry_after or 0.0)
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on the requests in flight to one host, shared by every worker.
+
+    Each request is bracketed by acquire() and release(). The limit grows by
+    one per round of successful requests (additive increase) and is halved
+    (multiplicative decrease) on a 429, on a response slower than
+    `spike_factor` times the usual latency, and on 5xx / connection errors
+    once they make up more than `error_tolerance` of recent responses, so a
+    stray error doesn't throttle a healthy server; below that it only holds
+    the limit. Cuts happen at most once per round trip, so a burst of
+    failures only counts once. A Retry-After pauses everyone. With `adaptive` off the limit stays at `max_limit`.
+    """
+
+    def __init__(self, max_limit, initial=4, min_limit=1, spike_factor=3.0, error_tolerance=0.1, adaptive=True):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.adaptive = adaptive
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit) if adaptive else self.max_limit)
+        self.spike_factor = spike_factor
+        self.error_tolerance = error_tolerance
+        self.error_rate = 0.0  # moving average over roughly the last 20 responses
+        self.condition = threading.Condition()
+        self.in_flight = 0
+        self.baseline = None  # slow moving average of successful response times
+        self.decreased_at = 0.0
+        self.blocked_until = 0.0
+        self.peak = self.limit
+        self.decreases = 0
+
+    def try_acquire(self):
+        """Take a slot if one is free now. Returns False when the caller has to wait."""
+        with self.condition:
+            if time.monotonic() < self.blocked_until or self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+            return True
+
+    def acquire(self):
+        with self.condition:
+            while True:
+                wait = self.blocked_until - time.monotonic()
+                if wait <= 0 and self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                self.condition.wait(wait if wait > 0 else None)
+
+    async def acquire_async(self):
+        # Polls, since the controller is shared with threads and other event loops
+        delay = 0.005
+        while not self.try_acquire():
+            await asyncio.sleep(delay)
+            delay = min(0.05, delay * 2)
+
+    def release(self, latency, failed=False, retry_after=None, throttled=False):
+        """Free the slot and adjust the limit from how the request went.
+
+        `failed` marks a 5xx or connection error, `throttled` a 429.
+        """
+        with self.condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+            if self.adaptive:
+                failed = failed or throttled
+                self.error_rate += 0.05 * (failed - self.error_rate)
+                spike = not failed and self.baseline is not None and latency > self.spike_factor * self.baseline
+                if throttled or spike or (failed and self.error_rate > self.error_tolerance):
+                    if now - self.decreased_at > (self.baseline or latency):
+                        self.limit = max(self.min_limit, self.limit / 2)
+                        self.decreased_at = now
+                        self.decreases += 1
+                elif not failed:
+                    self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+                    self.peak = max(self.peak, self.limit)
+                if not failed:
+                    self.baseline = latency if self.baseline is None else self.baseline + 0.05 * (latency - self.baseline)
+            self.condition.notify_all()
+
+    def release_unsent(self):
+        """Free the slot of a request that was never sent; the limit is left as it is."""
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def summary(self):
+        with self.condition:
+            if not self.adaptive:
+                return f"Detail fetch concurrency: fixed at {self.max_limit}"
+            baseline = f"{self.baseline * 1000:.0f} ms" if self.baseline is not None else "n/a"
+            return (f"Detail fetch concurrency: limit {int(self.limit)} (peak {int(self.peak)} of {self.max_limit}, "
+                    f"cut {self.decreases} times), typical response time {baseline}")
+
+
+# Groq reports reset times as durations such as "7.66s", "2m59.56s" or "120ms"
+DURATION_PART_RE = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+
+
+def parse_duration(value):
+    """Return a Groq reset duration header in seconds (None when missing)."""
+    if not value:
+        return None
+    return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in DURATION_PART_RE.findall(value))
+
+
+class GroqRateLimiter:
+    """Token and request bucket shared by every thread calling the Groq API.
+
+    Each call reserves an estimate of the tokens it will use; the bucket refills
+    at the tokens-per-minute limit and requests are spaced to the
+    requests-per-minute limit. `update()` syncs the bucket with the
+    x-ratelimit-* headers Groq returns, and `backoff()` pauses every caller
+    after a 429.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.request_interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self.tokens_per_minute = tokens_per_minute
+        self.tokens = tokens_per_minute
+        self.lock = threading.Lock()
+        self.refilled_at = time.monotonic()
+        self.next_request_at = self.refilled_at
+        self.blocked_until = self.refilled_at
+
+    def _refill(self, now):
+        self.tokens = min(self.tokens_per_minute,
+                          self.tokens + (now - self.refilled_at) * self.tokens_per_minute / 60.0)
+        self.refilled_at = now
+
+    def acquire(self, estimated_tokens):
+        """Block until a request expected to use about estimated_tokens may be sent."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                delay = max(self.blocked_until, self.next_request_at) - now
+                # A limit of 0 means no token budget, like RateLimiter's 0 requests per second;
+                # the request spacing and 429 pauses still apply
+                if self.tokens_per_minute <= 0 and delay <= 0:
+                    self.next_request_at = now + self.request_interval
+                    return
+                # A single request bigger than the whole budget only needs a full bucket
+                needed = min(estimated_tokens, self.tokens_per_minute)
+                if delay <= 0 and self.tokens >= needed:
+                    self.tokens -= estimated_tokens
+                    self.next_request_at = now + self.request_interval
+                    return
+                if delay <= 0:
+                    delay = (needed - self.tokens) * 60.0 / self.tokens_per_minute
+            time.sleep(delay)
+
+    def record_usage(self, estimated_tokens, used_tokens):
+        """Give back (or take) the difference between the estimate and the tokens the call really used."""
+        if used_tokens is None:
+            return
+        with self.lock:
+            self.tokens = min(self.tokens_per_minute, self.tokens + estimated_tokens - used_tokens)
+
+    def update(self, headers):
+        """Sync with the x-ratelimit-* headers of a Groq response."""
+        limit_tokens = headers.get('x-ratelimit-limit-tokens')
+        remaining_tokens = headers.get('x-ratelimit-remaining-tokens')
+        remaining_requests = headers.get('x-ratelimit-remaining-requests')
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            if limit_tokens:
+                self.tokens_per_minute = int(limit_tokens)
+            if remaining_tokens:
+                self.tokens = min(self.tokens, int(remaining_tokens))
+            if remaining_requests == '0':
+                # The request allowance is used up until the reset time Groq reports
+                reset = parse_duration(headers.get('x-ratelimit-reset-requests')) or 60
+                self.blocked_until = max(self.blocked_until, now + reset)
+
+    def backoff(self, headers, attempt):
+        """Pause every caller after a 429 and return the delay in seconds.
+
+        Uses the retry-after header when Groq sends one, otherwise doubles the
+        delay with each attempt.
+        """
+        retry_after = headers.get('retry-after')
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = min(60.0, 2.0 ** attempt)
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+        return delay
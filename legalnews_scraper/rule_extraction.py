@@ -0,0 +1,87 @@
+import re
+import threading
+
+# Month-name dates ("June 5, 2025", "Sept. 5 2025") and numeric ones ("6/5/2025")
+DATE = (r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2},?\s+\d{4}'
+        r'|\d{1,2}/\d{1,2}/\d{2,4})')
+MONEY = r'(\$\s?[\d,]+(?:\.\d{2})?)'
+PHONE = r'(\(\d{3}\)\s?\d{3}-\d{4}|\b\d{3}[-.]\d{3}[-.]\d{4}\b)'
+
+# Patterns for fields that follow fixed legal-notice wording in the description, tried in
+# order; group 1 of the first match is the value. Rule values replace the model's answer, so
+# a pattern only matches where the wording pins the value down; anything looser is left to
+# the model.
+DESCRIPTION_RULES = {
+    'Sale Date': [
+        re.compile(r'(?:foreclosed by a sale|public (?:vendue|auction|sale))[\s\S]{0,150}?\bon\s+'
+                   r'(?:(?:Mon|Tues|Wednes|Thurs|Fri|Satur|Sun)day,?\s+)?' + DATE, re.IGNORECASE),
+        re.compile(r'\bsale date:?\s+' + DATE, re.IGNORECASE),
+    ],
+    'Amount Due': [
+        re.compile(r'claimed to be due[\s\S]{0,120}?' + MONEY, re.IGNORECASE),
+        re.compile(r'\bamount due[\s\S]{0,60}?' + MONEY, re.IGNORECASE),
+    ],
+    'Redemption Period': [
+        re.compile(r'redemption period (?:shall|will) be\s+(\d+\s+(?:months?|days?|years?)|one year|six months'
+                   r'|thirty days)', re.IGNORECASE),
+    ],
+    'Attorney File #': [
+        re.compile(r'\bFile\s*(?:No\.?|Number|#)\s*:?\s*([A-Z0-9][A-Z0-9.-]*\d[A-Z0-9-]*)', re.IGNORECASE),
+    ],
+    'Attorney phone number': [
+        # The number in the attorney's signature ("..., Attorneys for Servicer, <address>, <phone>"),
+        # not the first one in the notice, which can be a hotline or a housing counselor
+        re.compile(r'\bAttorneys?\s+for\b[\s\S]{0,200}?' + PHONE, re.IGNORECASE),
+    ],
+    'Recorded Date': [
+        re.compile(r'\brecorded\s+(?:on\s+)?' + DATE, re.IGNORECASE),
+    ],
+}
+
+# The property's zip follows the state in the scraped address ("..., Flint, MI 48502"); a house
+# number such as "12345 Woodward Ave" is not a zip
+ZIP_RE = re.compile(r'\b(?:MI|Mich\.?|Michigan),?\s+(\d{5})(?:-\d{4})?\b')
+
+RULE_FIELDS = list(DESCRIPTION_RULES) + ['Zip']
+
+
+class RuleExtractor:
+    """Fills the fixed-wording fields of a notice locally, before anything is sent to the LLM.
+
+    `extract()` returns the fields it could resolve with certainty; the rest
+    are left to the model. Hit counts per field are kept for `summary()`.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.records = 0
+        self.hits = dict.fromkeys(RULE_FIELDS, 0)
+
+    def extract(self, record):
+        """Return {field: value} for the RULE_FIELDS found in a scraped record."""
+        values = {}
+        description = record.get('description') or ''
+        for field, patterns in DESCRIPTION_RULES.items():
+            for pattern in patterns:
+                match = pattern.search(description)
+                if match:
+                    values[field] = ' '.join(match.group(1).split())
+                    break
+
+        zip_codes = ZIP_RE.findall(record.get('address') or '')
+        if zip_codes:
+            values['Zip'] = zip_codes[-1]
+
+        with self.lock:
+            self.records += 1
+            for field in values:
+                self.hits[field] += 1
+        return values
+
+    def summary(self):
+        if not self.records:
+            return "Rule extraction: no notices"
+        rates = ", ".join(f"{field} {self.hits[field] / self.records:.0%}" for field in RULE_FIELDS)
+        resolved = sum(self.hits.values())
+        return (f"Rule extraction over {self.records} notices: {rates} "
+                f"({resolved} of {self.records * len(RULE_FIELDS)} fields filled without the LLM)")
@@ -0,0 +1,167 @@
+import json
+import os
+import queue
+import threading
+import time
+
+from .legalnews_session import SessionExpiredError, login, new_session, open_search_form
+from .metrics import metrics
+
+
+class AuthenticatedSession:
+    """A logged-in requests session together with the search form state it was issued."""
+
+    def __init__(self, slot, session):
+        self.slot = slot
+        self.session = session
+        self.search_token = None
+        self.counties = []
+        self.counties_values = {}
+        self.verified_at = 0
+        # What the session file holds for this session, snapshotted by the thread using it
+        self.saved_state = None
+
+
+class SessionPool:
+    """Pool of logged-in legalnews.com sessions that parallel workers borrow.
+
+    Cookies and search tokens are saved to `path` after every login and
+    restored on the next run, so a warm start skips the login round-trips.
+    Sessions restored or used longer than `max_age_seconds` ago are checked
+    with one request to the search form first; a session only logs in again
+    when that check (or a crawl request) lands on the login page.
+    """
+
+    def __init__(self, size, username, password, base_url, connections, path=None, max_age_seconds=1200):
+        self.username = username
+        self.password = password
+        self.base_url = base_url
+        self.path = path
+        self.max_age_seconds = max_age_seconds
+        self.lock = threading.Lock()
+        # Last in, first out: sessions that were just used (and are known to work) are handed out first
+        self.idle = queue.LifoQueue()
+        self.sessions = []
+
+        saved = self._load()
+        for slot in range(size):
+            auth = AuthenticatedSession(slot, new_session(connections))
+            state = saved.get(str(slot))
+            if state:
+                for cookie in state["cookies"]:
+                    auth.session.cookies.set(cookie["name"], cookie["value"],
+                                             domain=cookie["domain"], path=cookie["path"])
+                auth.search_token = state["search_token"]
+                auth.counties = state["counties"]
+                auth.counties_values = state["counties_values"]
+                auth.verified_at = state["verified_at"]
+                auth.saved_state = state
+            self.sessions.append(auth)
+            self.idle.put(auth)
+        if saved:
+            print(f"Restored {len(saved)} saved login session(s) from {self.path}")
+
+    def acquire(self):
+        """Borrow a logged-in session, logging in first if needed. Returns None if login fails."""
+        auth = self.idle.get()
+        try:
+            if auth.search_token and time.time() - auth.verified_at > self.max_age_seconds:
+                self._revalidate(auth)
+            if not auth.search_token:
+                self._authenticate(auth)
+        except BaseException:
+            self.idle.put(auth)
+            raise
+
+        if not auth.search_token:
+            self.idle.put(auth)
+            return None
+        return auth
+
+    def release(self, auth):
+        """Return a session borrowed with acquire()."""
+        # A session that just finished a crawl is known to work; save any cookies it picked up
+        auth.verified_at = time.time()
+        self._save(auth)
+        self.idle.put(auth)
+
+    def refresh(self, auth):
+        """Log a borrowed session in again after the server expired it."""
+        print(f"Session {auth.slot + 1} expired, logging in again...")
+        auth.session.cookies.clear()
+        auth.search_token = None
+        self._authenticate(auth)
+        if not auth.search_token:
+            raise SessionExpiredError("Logging in again failed")
+
+    def _revalidate(self, auth):
+        # One GET of the search form replaces the full login when the cookies still work
+        try:
+            auth.search_token, auth.counties, auth.counties_values = open_search_form(
+                auth.session, auth.search_token, self.base_url
+            )
+            auth.verified_at = time.time()
+            self._save(auth)
+        except SessionExpiredError:
+            print(f"Saved session {auth.slot + 1} has expired")
+            auth.session.cookies.clear()
+            auth.search_token = None
+
+    @metrics.timed("login")
+    def _authenticate(self, auth):
+        login_response, login_token = login(auth.session, self.username, self.password, self.base_url)
+        if login_response.status_code != 200:
+            print("Login failed!")
+            print(f"Response: {login_response.text[:500]}...")
+            return
+        print("Login successful!")
+
+        try:
+            auth.search_token, auth.counties, auth.counties_values = open_search_form(
+                auth.session, login_token, self.base_url
+            )
+        except SessionExpiredError:
+            print("Login failed! The site sent the search page back to the login form.")
+            auth.search_token = None
+            return
+        auth.verified_at = time.time()
+        self._save(auth)
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # Sessions saved for another site (e.g. a local test server) are useless here
+        if saved.get("base_url") != self.base_url:
+            return {}
+        return saved["sessions"]
+
+    def _save(self, auth):
+        """Snapshot `auth`, which the calling thread holds, and write every session's last snapshot.
+
+        Sessions other threads have borrowed are not read: their cookie jars
+        may be changing under a running crawl.
+        """
+        if not self.path:
+            return
+        auth.saved_state = {
+            "cookies": [{"name": c.name, "value": c.value, "domain": c.domain, "path": c.path}
+                        for c in auth.session.cookies],
+            "search_token": auth.search_token,
+            "counties": auth.counties,
+            "counties_values": auth.counties_values,
+            "verified_at": auth.verified_at,
+        } if auth.search_token else None
+        with self.lock:
+            sessions = {str(saved.slot): saved.saved_state for saved in self.sessions if saved.saved_state}
+
+            # The file holds login cookies, so keep it readable by the owner only
+            tmp_path = self.path + ".tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"base_url": self.base_url, "sessions": sessions}, f)
+            os.replace(tmp_path, self.path)
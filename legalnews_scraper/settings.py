@@ -0,0 +1,134 @@
+import os
+
+# Same default as legalnews_session.BASE_URL, kept here so reading the settings doesn't import requests
+DEFAULT_BASE_URL = "https://legalnews.com"
+
+
+class Settings:
+    """Scraper settings, read from the environment variables documented in the README.
+
+    Keyword arguments override the environment, e.g.
+    `Settings(detail_workers=16, notice_db="foreclosures.db")`. Call
+    dotenv.load_dotenv() first to pick up a .env file, as the CLI does.
+    """
+
+    def __init__(self, **overrides):
+        # legalnews.com login
+        self.user_name = os.getenv("USER_NAME")
+        self.password = os.getenv("PASSWORD")
+
+        # Site to scrape; point it at replay_server.py to run the scraper offline
+        self.base_url = os.getenv("LEGALNEWS_BASE_URL", DEFAULT_BASE_URL).rstrip("/")
+
+        # Crawl tuning: number of detail pages fetched in parallel and the overall
+        # request rate allowed against legalnews.com (shared by all workers)
+        self.detail_workers = int(os.getenv("DETAIL_WORKERS", "8"))
+        self.requests_per_second = float(os.getenv("REQUESTS_PER_SECOND", "2"))
+
+        # Crawl engine: "threads" (default) or "async" (needs aiohttp). The async engine
+        # keeps up to max_concurrency requests in flight over one connection pool.
+        self.crawl_engine = os.getenv("CRAWL_ENGINE", "threads").lower()
+        self.max_concurrency = int(os.getenv("MAX_CONCURRENCY", "100"))
+
+        # Adaptive detail-fetch concurrency: starting from detail_workers, the number of detail
+        # fetches in flight grows while responses stay fast and is halved on a 429/5xx or a
+        # response latency_spike_factor times slower than usual, up to detail_max_workers
+        # (max_concurrency for the async engine). ADAPTIVE_CONCURRENCY=0 keeps it fixed.
+        self.adaptive_concurrency = os.getenv("ADAPTIVE_CONCURRENCY", "1") == "1"
+        self.detail_max_workers = int(os.getenv("DETAIL_MAX_WORKERS", "32"))
+        self.latency_spike_factor = float(os.getenv("LATENCY_SPIKE_FACTOR", "3"))
+
+        # Failed detail fetches are retried with jittered exponential backoff, then re-queued
+        # for one more try at the end of the search; the ones that still fail are listed in
+        # failed_details_file
+        self.detail_max_retries = int(os.getenv("DETAIL_MAX_RETRIES", "3"))
+        self.detail_retry_seconds = float(os.getenv("DETAIL_RETRY_SECONDS", "0.5"))
+        self.failed_details_file = os.getenv("FAILED_DETAILS_FILE", "failed_details.jsonl")
+
+        # Seconds without a response before a request counts as failed and is retried. A search or
+        # results page that still fails stops the crawl at the last finished page (see --resume).
+        self.request_timeout = float(os.getenv("REQUEST_TIMEOUT_SECONDS", "30"))
+
+        # Backend that parses notice detail pages: "lxml", "bs4-lxml", "html.parser" or "auto"
+        # (lxml when installed, html.parser otherwise)
+        self.detail_parser = os.getenv("DETAIL_PARSER", "auto").lower()
+
+        # Number of results pages fetched in parallel once the page count is known
+        self.page_workers = int(os.getenv("PAGE_WORKERS", "4"))
+
+        # Number of searches (counties or date shards) crawled at the same time
+        self.search_workers = int(os.getenv("SEARCH_WORKERS", "4"))
+
+        # Sharding splits a search into week or day shards of at most this many results
+        self.shard_max_results = int(os.getenv("SHARD_MAX_RESULTS", "500"))
+
+        # On-disk cache of notice detail pages (an empty path disables it)
+        self.detail_cache = os.getenv("DETAIL_CACHE", "detail_cache.db")
+        self.detail_cache_ttl_days = float(os.getenv("DETAIL_CACHE_TTL_DAYS", "30"))
+        self.detail_cache_max_mb = float(os.getenv("DETAIL_CACHE_MAX_MB", "500"))
+
+        # Incremental mode: SQLite record of notices already scraped / processed. When set,
+        # known notices are skipped and paging stops at the first page with no new notices.
+        self.state_db = os.getenv("STATE_DB", "")
+
+        # Checkpoint written after every results page so an interrupted crawl can be resumed
+        self.checkpoint_file = os.getenv("CHECKPOINT_FILE", "crawl_checkpoint.json")
+
+        # Groq stage: batches in flight at once, the account's rate limits (kept in sync with
+        # Groq's x-ratelimit-* response headers) and how often a 429 is retried
+        self.groq_api_key = os.getenv("GROQ_API_KEY")
+        self.groq_workers = int(os.getenv("GROQ_WORKERS", "4"))
+        self.groq_requests_per_minute = float(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30"))
+        self.groq_tokens_per_minute = int(os.getenv("GROQ_TOKENS_PER_MINUTE", "30000"))
+        self.groq_max_retries = int(os.getenv("GROQ_MAX_RETRIES", "5"))
+        # Seconds to wait for a Groq reply before the batch is given up (its notices are then retried)
+        self.groq_timeout = float(os.getenv("GROQ_TIMEOUT_SECONDS", "120"))
+
+        # LLM batch packing: the model's context window, the most tokens a reply may use and
+        # the reply size expected per notice
+        self.llm_context_tokens = int(os.getenv("LLM_CONTEXT_TOKENS", "8192"))
+        self.llm_max_output_tokens = int(os.getenv("LLM_MAX_OUTPUT_TOKENS", "4000"))
+        self.llm_output_tokens_per_record = int(os.getenv("LLM_OUTPUT_TOKENS_PER_RECORD", "350"))
+
+        # Model used for extraction, and the cache of its results (an empty path disables the cache).
+        # groq_base_url can point both Groq clients at an OpenAI-compatible stand-in such as mock_groq_server.py.
+        self.groq_model = os.getenv("GROQ_MODEL", "llama3-8b-8192")
+        self.groq_base_url = os.getenv("GROQ_BASE_URL", "https://api.groq.com").rstrip("/")
+        self.llm_cache = os.getenv("LLM_CACHE", "llm_cache.db")
+
+        # SQLite database of every notice and its processed fields, indexed for query_notices.py
+        # (empty value disables it)
+        self.notice_db = os.getenv("NOTICE_DB", "")
+
+        # Folder of the partitioned Parquet copy of the processed records (empty value disables it)
+        self.parquet_dir = os.getenv("PARQUET_DIR", "")
+
+        # Prometheus textfile (for the node exporter's textfile collector) and JSON summary of
+        # the run's stage timings, request latencies, retries and token use (empty values disable them)
+        self.metrics_textfile = os.getenv("METRICS_TEXTFILE", "")
+        self.metrics_summary = os.getenv("METRICS_SUMMARY", "")
+
+        # When profiling: folder for the per-stage .prof files and report.txt, and how many of
+        # the hottest functions the report lists per stage
+        self.profile_dir = os.getenv("PROFILE_DIR", "profiles")
+        self.profile_top = int(os.getenv("PROFILE_TOP", "20"))
+
+        # Saved login cookies and search tokens, reused by later runs (empty value disables saving).
+        # Saved sessions older than session_check_minutes are checked with one request before use.
+        self.session_file = os.getenv("SESSION_FILE", "legalnews_sessions.json")
+        self.session_check_minutes = float(os.getenv("SESSION_CHECK_MINUTES", "20"))
+
+        # Output files, plus the folder holding each search's part while a parallel run is in progress
+        self.jsonl_filename = "foreclosures.jsonl"
+        self.csv_filename = "foreclosures.csv"
+        self.processed_csv_filename = "foreclosures_processed.csv"
+        self.parts_dir = "foreclosures_parts"
+
+        for name, value in overrides.items():
+            if not hasattr(self, name):
+                raise TypeError(f"Unknown setting: {name}")
+            setattr(self, name, value)
+
+    @property
+    def parts_plan_file(self):
+        return os.path.join(self.parts_dir, "plan.json")
@@ -0,0 +1,97 @@
+import time
+from datetime import datetime, timedelta
+
+import requests
+
+from .legalnews_session import (REQUEST_TIMEOUT, FetchError, build_search_form, check_logged_in, format_search_dates,
+                                public_notices_url, search_headers)
+from .metrics import metrics
+from .parsing import count_search_results
+from .rate_limit import backoff_delay, retry_after_seconds, server_overloaded
+
+DATE_FORMAT = "%m/%d/%Y"
+
+# Longest wait between two attempts of a probe, in seconds
+RETRY_MAX_DELAY = 30
+
+
+class ShardPlanner:
+    """Splits a search's date range into week or day shards that can be crawled in parallel.
+
+    Every candidate range is probed with a real search and its "results found"
+    count read. Ranges above `max_results` are split into weeks, weeks that are
+    still too big into single days. Ranges without results are dropped. Probes
+    run one after another on `session`, which must have the search form open.
+
+    A probe failing with a 429/5xx or a network error is retried like the
+    crawlers' requests; one that still fails raises FetchError, since taking
+    the error page for "no results" would drop the range from the crawl.
+    """
+
+    def __init__(self, session, base_url, search_token, limiter, max_results, max_retries=3, retry_base=0.5,
+                 timeout=REQUEST_TIMEOUT):
+        self.session = session
+        self.base_url = base_url
+        self.search_token = search_token
+        self.limiter = limiter
+        self.max_results = max_results
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.timeout = timeout
+
+    def count_results(self, county_value, start_date, end_date):
+        """Run the search for one county and date range and return its result count."""
+        formatted_start_date, formatted_end_date = format_search_dates(start_date, end_date)
+        form_data = build_search_form(self.search_token, county_value, formatted_start_date, formatted_end_date)
+        for attempt in range(self.max_retries + 1):
+            self.limiter.wait()
+            retry_after = None
+            try:
+                response = self.session.post(public_notices_url(self.base_url), data=form_data,
+                                             headers=search_headers(self.base_url), timeout=self.timeout)
+            except requests.RequestException as e:
+                error = str(e)
+            else:
+                check_logged_in(response.url)
+                if response.ok:
+                    return count_search_results(response.text, self.base_url)
+                error = f"status {response.status_code}"
+                if not server_overloaded(response.status_code):
+                    break
+                retry_after = retry_after_seconds(response.headers)
+
+            if attempt < self.max_retries:
+                delay = backoff_delay(attempt, self.retry_base, RETRY_MAX_DELAY, retry_after)
+                print(f"Result count of {start_date} - {end_date} failed ({error}), retrying in {delay:.1f}s...")
+                metrics.retry("shard_probe")
+                time.sleep(delay)
+        raise FetchError(f"Result count of {start_date} - {end_date} failed ({error})")
+
+    @metrics.timed("shard_planning")
+    def plan(self, county, county_value, start_date, end_date):
+        """Return the (start_date, end_date) shards, as MM/DD/YYYY strings, covering the range."""
+        count = self.count_results(county_value, start_date, end_date)
+        print(f"{county} {start_date} - {end_date}: {count} results")
+        if count == 0:
+            return []
+
+        try:
+            start = datetime.strptime(start_date, DATE_FORMAT)
+            end = datetime.strptime(end_date, DATE_FORMAT)
+        except ValueError:
+            return [(start_date, end_date)]
+
+        span_days = (end - start).days
+        if count <= self.max_results or span_days < 1:
+            return [(start_date, end_date)]
+
+        # Wide ranges are cut into weeks first; a week still over the limit is cut into days
+        step = timedelta(days=7 if span_days >= 7 else 1)
+        shards = []
+        shard_start = start
+        while shard_start <= end:
+            shard_end = min(shard_start + step - timedelta(days=1), end)
+            shards.extend(self.plan(county, county_value,
+                                    shard_start.strftime(DATE_FORMAT), shard_end.strftime(DATE_FORMAT)))
+            shard_start = shard_end + timedelta(days=1)
+        return shards
@@ -0,0 +1,160 @@
+import csv
+import json
+import os
+
+# Columns of foreclosures.csv
+RAW_FIELDNAMES = ['foreclosure_number', 'published_dates', 'address', 'name', 'description', 'url', 'county']
+
+
+class RawRecordSink:
+    """Appends scraped records to foreclosures.jsonl and foreclosures.csv as soon as they exist.
+
+    Nothing is kept in memory. `offsets()` returns the current size of both files
+    so a checkpoint can record them; passing those offsets back in `resume_from`
+    truncates the files to that point and continues appending.
+    """
+
+    def __init__(self, jsonl_path, csv_path, resume_from=None):
+        self.jsonl_path = jsonl_path
+        self.csv_path = csv_path
+        self.records_written = 0
+
+        if resume_from:
+            for path, offset in ((jsonl_path, resume_from["jsonl"]), (csv_path, resume_from["csv"])):
+                with open(path, 'r+b') as f:
+                    f.truncate(offset)
+            self.jsonl_file = open(jsonl_path, 'a', encoding='utf-8')
+            self.csv_file = open(csv_path, 'a', newline='', encoding='utf-8')
+            self.csv_writer = csv.DictWriter(self.csv_file, fieldnames=RAW_FIELDNAMES)
+        else:
+            self.jsonl_file = open(jsonl_path, 'w', encoding='utf-8')
+            self.csv_file = open(csv_path, 'w', newline='', encoding='utf-8')
+            self.csv_writer = csv.DictWriter(self.csv_file, fieldnames=RAW_FIELDNAMES)
+            self.csv_writer.writeheader()
+
+    def write(self, records):
+        for record in records:
+            self.jsonl_file.write(json.dumps(record) + "\n")
+            self.csv_writer.writerow(record)
+            self.records_written += 1
+        self.jsonl_file.flush()
+        self.csv_file.flush()
+
+    def offsets(self):
+        """Flush both files to disk and return their sizes."""
+        for f in (self.jsonl_file, self.csv_file):
+            f.flush()
+            os.fsync(f.fileno())
+        return {"jsonl": os.path.getsize(self.jsonl_path), "csv": os.path.getsize(self.csv_path)}
+
+    def close(self):
+        self.jsonl_file.close()
+        self.csv_file.close()
+
+
+def iter_records(jsonl_path):
+    """Yield the records of a JSONL file one at a time."""
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_batches(records, batch_size):
+    """Group an iterable of records into lists of at most batch_size."""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# Columns of foreclosures_processed.csv, with exactly the names the model is asked to use
+AI_FIELDNAMES = [
+    'First Name', 'Middle Name', 'Last Name', 'Street Address', 'City', 'State', 'Zip',
+    'Mortgage or a lien (Condo?)', 'Sale Date', 'Amount Due', 'Redemption Period',
+    'Attorney Name', 'Attorney Address', 'Attorney phone number', 'Attorney File #',
+    'First date published in Legal News', 'Last Date Published in Legal News',
+    'Lender/Mortgage company\'s name', 'Recorded Date'
+]
+
+
+# Spellings the model uses for a field other than its AI_FIELDNAMES name. Every field
+# also matches case-insensitively.
+FIELD_ALIASES = {
+    'Address': 'Street Address',
+    'Attorney Phone Number': 'Attorney phone number',
+    'First Date Published in Legal News': 'First date published in Legal News',
+}
+
+# Lowercased key -> canonical field, built once at import
+ALIAS_TABLE = {field.lower(): field for field in AI_FIELDNAMES}
+ALIAS_TABLE.update({alias.lower(): field for alias, field in FIELD_ALIASES.items()})
+
+NAME_FIELDS = ('First Name', 'Middle Name', 'Last Name')
+
+
+def split_name(name):
+    """Split a full name into First, Middle (possibly several words) and Last Name."""
+    name_parts = name.split()
+    if len(name_parts) == 0:
+        return "", "", ""
+    if len(name_parts) == 1:
+        # Only one name part available
+        return name_parts[0], "", ""
+    # First, Middle (possibly multiple or none), and Last name
+    return name_parts[0], " ".join(name_parts[1:-1]), name_parts[-1]
+
+
+def standardize_record(record):
+    """Map a record returned by the model onto AI_FIELDNAMES in one pass over its keys.
+
+    A key spelled exactly like the canonical field wins over aliases and other
+    capitalisations. A single 'Name' is split into First/Middle/Last Name when
+    the model didn't return those, and missing fields are set to "N/A".
+    """
+    standardized_record = {}
+    exact_keys = set()
+    full_name = None
+    for key, value in record.items():
+        field = ALIAS_TABLE.get(key.lower())
+        if field is None:
+            if key.lower() == 'name':
+                full_name = value
+            continue
+        if key == field:
+            standardized_record[field] = value
+            exact_keys.add(field)
+        elif field not in exact_keys and field not in standardized_record:
+            standardized_record[field] = value
+
+    if isinstance(full_name, str) and not ('First Name' in standardized_record and 'Last Name' in standardized_record):
+        standardized_record.update(zip(NAME_FIELDS, split_name(full_name)))
+
+    for field in AI_FIELDNAMES:
+        if field not in standardized_record:
+            standardized_record[field] = "N/A"
+    return standardized_record
+
+
+class ProcessedCsvSink:
+    """Writes standardized AI-processed records to foreclosures_processed.csv as each batch returns."""
+
+    def __init__(self, csv_path):
+        self.csv_path = csv_path
+        self.records_written = 0
+        self.csv_file = open(csv_path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.csv_file, fieldnames=AI_FIELDNAMES)
+        self.writer.writeheader()
+
+    def write(self, records):
+        for record in records:
+            self.writer.writerow(standardize_record(record))
+            self.records_written += 1
+        self.csv_file.flush()
+
+    def close(self):
+        self.csv_file.close()
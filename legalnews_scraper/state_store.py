@@ -0,0 +1,85 @@
+import json
+import sqlite3
+import threading
+import time
+
+from .parsing import notice_id_from_url
+
+
+class StateStore:
+    """SQLite record of the notices already scraped and already processed by the LLM.
+
+    Incremental runs use it to skip detail fetches for notices seen before and to
+    stop paging once a whole results page is made of known notices. The raw
+    record is kept alongside, so notices whose LLM processing failed in an
+    earlier run are picked up again by the next one.
+    """
+
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS notices (
+                notice_id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                record TEXT NOT NULL,
+                scraped_at REAL NOT NULL,
+                processed_at REAL
+            )
+        """)
+        self.conn.commit()
+
+    def known_ids(self, notice_ids):
+        """Return the subset of notice_ids that have already been scraped."""
+        notice_ids = list(notice_ids)
+        known = set()
+        with self.lock:
+            # Stay well under SQLite's bound parameter limit
+            for i in range(0, len(notice_ids), 500):
+                chunk = notice_ids[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT notice_id FROM notices WHERE notice_id IN ({placeholders})", chunk
+                ).fetchall()
+                known.update(row[0] for row in rows)
+        return known
+
+    def mark_scraped(self, records):
+        now = time.time()
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO notices (notice_id, url, record, scraped_at) VALUES (?, ?, ?, ?)",
+                [(notice_id_from_url(record["url"]), record["url"], json.dumps(record), now) for record in records]
+            )
+            self.conn.commit()
+
+    def mark_processed(self, records):
+        now = time.time()
+        with self.lock:
+            self.conn.executemany(
+                "UPDATE notices SET processed_at = ? WHERE notice_id = ?",
+                [(now, notice_id_from_url(record["url"])) for record in records]
+            )
+            self.conn.commit()
+
+    def unprocessed_records(self):
+        """Yield every scraped record that hasn't been processed by the LLM yet, oldest first.
+
+        Rows are read in chunks so the backlog never has to fit in memory.
+        """
+        last_rowid = 0
+        while True:
+            with self.lock:
+                rows = self.conn.execute(
+                    "SELECT rowid, record FROM notices WHERE processed_at IS NULL AND rowid > ? "
+                    "ORDER BY rowid LIMIT 500", (last_rowid,)
+                ).fetchall()
+            if not rows:
+                return
+            for rowid, record in rows:
+                yield json.loads(record)
+            last_rowid = rows[-1][0]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
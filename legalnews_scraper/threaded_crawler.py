@@ -0,0 +1,290 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .legalnews_session import REQUEST_TIMEOUT, FetchError, check_logged_in
+from .metrics import metrics
+from .parsing import notice_id_from_url, parse_foreclosure_details, parse_results_page
+from .profiling import profiler
+from .rate_limit import AdaptiveConcurrency, backoff_delay, retry_after_seconds, server_overloaded
+
+# Longest wait between two attempts of a detail fetch, in seconds
+RETRY_MAX_DELAY = 30
+
+
+class ThreadedCrawler:
+    """Runs the search, pagination and detail fetches for one search over a requests session.
+
+    Results pages and detail pages are fetched by thread pools; every request
+    waits on the shared rate limiter, detail fetches only once they hold a
+    slot of the shared concurrency controller. Finished pages are handed to
+    `on_page_done(page, last_foreclosure_number, records)` in page order.
+
+    Detail fetches that hit a 429/5xx or a network error are retried
+    `max_retries` times with jittered backoff; the ones still failing are
+    re-queued and tried once more after the last page. Those that fail again
+    are left in `failed`. The search and results pages are retried the same
+    way, but one that still fails raises FetchError: the crawl stops after
+    the last finished page, so --resume picks it up from there.
+    """
+
+    def __init__(self, session, base_url, headers, limiter, detail_workers, page_workers,
+                 detail_cache=None, state_store=None, concurrency=None, max_retries=3, retry_base=0.5,
+                 timeout=REQUEST_TIMEOUT, search_response_file=None):
+        self.session = session
+        self.base_url = base_url
+        self.headers = headers
+        self.limiter = limiter
+        self.detail_workers = detail_workers
+        self.page_workers = page_workers
+        self.detail_cache = detail_cache
+        self.state_store = state_store
+        self.concurrency = concurrency or AdaptiveConcurrency(detail_workers, adaptive=False)
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.timeout = timeout
+        # The search response is saved here for inspection (None to skip)
+        self.search_response_file = search_response_file
+        self.detail_executor = None  # thread pool of the running crawl
+        self.requeue = []  # (detail_url, foreclosure_number) of fetches that ran out of retries
+        self.failed = []
+
+    # Function to scrape foreclosure details
+    @metrics.timed("detail_fetch")
+    @profiler.profiled("detail_fetch")
+    def scrape_foreclosure_details(self, detail_url, foreclosure_number):
+        print(f"Scraping Foreclosure {foreclosure_number}: {detail_url}")
+
+        # Serve the page from the on-disk cache when possible
+        cached_body, conditional_headers = self.detail_cache.lookup(detail_url) if self.detail_cache else (None, {})
+        if cached_body is not None:
+            return parse_foreclosure_details(cached_body, detail_url, foreclosure_number)
+
+        detail_page = self.fetch_detail_page(detail_url, {**self.headers, **conditional_headers})
+        if detail_page is None:
+            self.requeue.append((detail_url, foreclosure_number))
+            return None
+        check_logged_in(detail_page.url)
+
+        if self.detail_cache:
+            body = self.detail_cache.store_response(detail_url, detail_page.status_code, detail_page.text,
+                                                    detail_page.headers)
+        else:
+            body = detail_page.text if detail_page.status_code == 200 else None
+
+        if body is not None:
+            return parse_foreclosure_details(body, detail_url, foreclosure_number)
+        else:
+            print(f"Failed to access detail page: {detail_url}")
+            return None
+
+    def fetch_detail_page(self, detail_url, headers):
+        """GET a detail page, retrying 429/5xx and network errors. Returns None once the retries run out."""
+        for attempt in range(self.max_retries + 1):
+            # The rate slot is taken once a concurrency slot is free, so a low limit doesn't burn slots
+            self.concurrency.acquire()
+            self.limiter.wait()
+            start = time.perf_counter()
+            try:
+                detail_page = self.session.get(detail_url, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                self.concurrency.release(time.perf_counter() - start, failed=True)
+                error, retry_after = str(e), None
+            else:
+                retry_after = retry_after_seconds(detail_page.headers)
+                failed = server_overloaded(detail_page.status_code)
+                self.concurrency.release(time.perf_counter() - start, failed, retry_after if failed else None,
+                                         detail_page.status_code == 429)
+                if not failed:
+                    return detail_page
+                error = f"status {detail_page.status_code}"
+
+            if attempt < self.max_retries:
+                delay = backoff_delay(attempt, self.retry_base, RETRY_MAX_DELAY, retry_after)
+                print(f"Detail page {detail_url} failed ({error}), retrying in {delay:.1f}s...")
+                metrics.retry("detail_fetch")
+                time.sleep(delay)
+        print(f"Failed to access detail page: {detail_url} ({error}), re-queued")
+        return None
+
+    # Function to process a page of results
+    # Returns the next foreclosure number and whether every notice on the page was already known
+    # Only the notice filtering and the page commit are profiled as results_page: the detail
+    # fetches in between are their own stage
+    @metrics.timed("results_page")
+    def process_results_page(self, detail_urls, current_page, foreclosure_count, on_page_done):
+        print(f"Found {len(detail_urls)} results on page {current_page}")
+
+        # In incremental mode skip notices scraped by an earlier run
+        if self.state_store:
+            with profiler.stage("results_page"):
+                known = self.state_store.known_ids(notice_id_from_url(url) for url in detail_urls)
+                if detail_urls and all(notice_id_from_url(url) in known for url in detail_urls):
+                    print(f"All {len(detail_urls)} notices on page {current_page} were already scraped")
+                    return foreclosure_count, True
+                detail_urls = [url for url in detail_urls if notice_id_from_url(url) not in known]
+                print(f"{len(known)} known notices skipped on page {current_page}")
+
+        page_records = []
+
+        # Scrape the foreclosure details in parallel on the crawl's detail pool; the
+        # shared rate limiter keeps the overall request rate within bounds. map()
+        # returns results in submission order, so numbering stays the same as a serial crawl.
+        results = self.detail_executor.map(
+            self.scrape_foreclosure_details,
+            detail_urls,
+            range(foreclosure_count, foreclosure_count + len(detail_urls))
+        )
+        for foreclosure_data in results:
+            if foreclosure_data:
+                # Renumber so failed fetches don't leave gaps
+                foreclosure_data["foreclosure_number"] = foreclosure_count
+                page_records.append(foreclosure_data)
+                foreclosure_count += 1
+
+        with profiler.stage("results_page"):
+            on_page_done(current_page, foreclosure_count - 1, page_records)
+
+        return foreclosure_count, False
+
+    def request_with_retries(self, method, url, description, retry_name, **kwargs):
+        """Send the search or a results page request, retrying 429/5xx and network errors.
+
+        Raises FetchError when the retries run out or the server answers with
+        another error status, rather than handing back an error page that would
+        parse as a page without results.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.limiter.wait()
+            retry_after = None
+            try:
+                response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except requests.RequestException as e:
+                error = str(e)
+            else:
+                check_logged_in(response.url)
+                if response.ok:
+                    return response
+                error = f"status {response.status_code}"
+                if not server_overloaded(response.status_code):
+                    break
+                retry_after = retry_after_seconds(response.headers)
+
+            if attempt < self.max_retries:
+                delay = backoff_delay(attempt, self.retry_base, RETRY_MAX_DELAY, retry_after)
+                print(f"{description} failed ({error}), retrying in {delay:.1f}s...")
+                metrics.retry(retry_name)
+                time.sleep(delay)
+        raise FetchError(f"{description} failed ({error})")
+
+    # Function to fetch and parse one page of search results
+    @metrics.timed("results_fetch")
+    def fetch_results_page(self, public_notices_url, page_number):
+        page_response = self.request_with_retries('GET', f"{public_notices_url}?page={page_number}",
+                                                  f"Results page {page_number}", "results_page", headers=self.headers)
+        with profiler.stage("pagination"):
+            return parse_results_page(page_response.text, self.base_url)
+
+    @metrics.timed("pagination")
+    def crawl(self, public_notices_url, form_data, search_headers, on_page_done, start_page=1, first_number=1):
+        """Submit the search and walk every results page, then retry the re-queued detail fetches.
+
+        Pages before `start_page` are skipped (they were scraped by an interrupted
+        run) and numbering continues from `first_number`.
+        """
+        last_done = [start_page - 1, first_number - 1]
+
+        def page_done(current_page, last_foreclosure_number, page_records):
+            last_done[:] = [current_page, last_foreclosure_number]
+            on_page_done(current_page, last_foreclosure_number, page_records)
+
+        self.requeue, self.failed = [], []
+        # One detail pool for the whole crawl, sized for the concurrency ceiling; the controller
+        # decides how many fetch at once
+        with ThreadPoolExecutor(max_workers=self.concurrency.max_limit) as detail_executor:
+            self.detail_executor = detail_executor
+            try:
+                self.crawl_pages(public_notices_url, form_data, search_headers, page_done, start_page, first_number)
+            except BaseException:
+                # The pages holding the re-queued fetches are already committed, so list them as failed
+                self.failed = [detail_url for detail_url, _ in self.requeue]
+                raise
+            self.retry_requeued(*last_done, page_done)
+
+    def retry_requeued(self, last_page, last_foreclosure_number, on_page_done):
+        """Fetch the re-queued detail pages once more and hand the results on with the last page."""
+        if not self.requeue:
+            return
+        requeued, self.requeue = self.requeue, []
+        print(f"Retrying {len(requeued)} detail pages that failed during the crawl...")
+        metrics.retry("detail_requeue", len(requeued))
+        foreclosure_count = last_foreclosure_number + 1
+        page_records = []
+        for foreclosure_data in self.detail_executor.map(lambda item: self.scrape_foreclosure_details(*item),
+                                                         requeued):
+            if foreclosure_data:
+                foreclosure_data["foreclosure_number"] = foreclosure_count
+                page_records.append(foreclosure_data)
+                foreclosure_count += 1
+        self.failed, self.requeue = [detail_url for detail_url, _ in self.requeue], []
+        print(f"Recovered {len(page_records)} of {len(requeued)} re-queued detail pages")
+        on_page_done(last_page, foreclosure_count - 1, page_records)
+
+    def crawl_pages(self, public_notices_url, form_data, search_headers, on_page_done, start_page, first_number):
+        print("Submitting search form...")
+        search_response = self.request_with_retries('POST', public_notices_url, "Search", "search",
+                                                    data=form_data, headers=search_headers)
+        print(f"Search response status code: {search_response.status_code}")
+
+        # Debug: Save the search response to a file for inspection
+        if self.search_response_file:
+            with open(self.search_response_file, "w", encoding="utf-8") as f:
+                f.write(search_response.text)
+            print(f"Saved search response to {self.search_response_file} for inspection")
+
+        # Page 1 is the search response itself
+        foreclosure_count = first_number
+        with profiler.stage("pagination"):
+            detail_urls, total_pages, has_next = parse_results_page(search_response.text, self.base_url)
+        if start_page == 1:
+            print("Processing page 1...")
+            foreclosure_count, all_known = self.process_results_page(detail_urls, 1, foreclosure_count, on_page_done)
+            if all_known:
+                print("Stopping: no new notices on the first page")
+                return
+        else:
+            print(f"Skipping pages 1-{start_page - 1}, already scraped")
+
+        if total_pages:
+            # The page count is known up front, so fetch the remaining pages in
+            # parallel and process them in page order as they arrive. Incremental
+            # runs fetch a window of pages at a time so they can stop early.
+            print(f"Search returned {total_pages} pages of results")
+            window = self.page_workers if self.state_store else total_pages
+            with ThreadPoolExecutor(max_workers=self.page_workers) as executor:
+                for window_start in range(max(2, start_page), total_pages + 1, window):
+                    page_numbers = range(window_start, min(window_start + window, total_pages + 1))
+                    pages = executor.map(lambda page: self.fetch_results_page(public_notices_url, page), page_numbers)
+                    for current_page, (detail_urls, _, _) in zip(page_numbers, pages):
+                        print(f"Processing page {current_page}...")
+                        foreclosure_count, all_known = self.process_results_page(
+                            detail_urls, current_page, foreclosure_count, on_page_done
+                        )
+                        if all_known:
+                            print(f"Stopping at page {current_page}: the remaining pages hold older notices")
+                            return
+        else:
+            # No page count on the page: follow the "Next" link one page at a time
+            current_page = start_page - 1
+            has_next = has_next or start_page > 1
+            while has_next:
+                current_page += 1
+                print(f"Processing page {current_page}...")
+                detail_urls, _, has_next = self.fetch_results_page(public_notices_url, current_page)
+                foreclosure_count, all_known = self.process_results_page(
+                    detail_urls, current_page, foreclosure_count, on_page_done
+                )
+                if all_known:
+                    print(f"Stopping at page {current_page}: the remaining pages hold older notices")
+                    return
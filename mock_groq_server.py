@@ -0,0 +1,266 @@
+"""Local OpenAI-compatible stand-in for the Groq chat completions API.
+
+Answers POST /openai/v1/chat/completions with JSON synthesized from the notices
+in the prompt, so the extraction stage can be run and tuned without spending
+real Groq calls. Latency, 429 responses, replies that leave records out and
+malformed (truncated or unfenced) replies can all be configured:
+
+    python mock_groq_server.py --port 8900 --latency-ms 300 --rate-limit-rate 0.05 --malformed-rate 0.02
+    GROQ_BASE_URL=http://127.0.0.1:8900 GROQ_API_KEY=mock python requests-sessions.py ...
+
+GET /__stats returns call counts as JSON (add ?reset=1 to zero them).
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from legalnews_scraper.llm_batches import FIELD_DESCRIPTIONS, estimate_text_tokens
+
+# "3) City" lines of the prompt's field list -> field name
+FIELD_BY_DESCRIPTION = {description: field for field, description in FIELD_DESCRIPTIONS.items()}
+FIELD_LINE_RE = re.compile(r'^\s*\d+\)\s+(.+?)\s*$', re.MULTILINE)
+ADDRESS_RE = re.compile(r'^(.*?),\s*([^,]+),\s*([A-Z]{2})\s+(\d{5})')
+DATE_RE = re.compile(r'\d{1,2}/\d{1,2}/\d{4}')
+LENDER_RE = re.compile(r'\bto\s+(.+?),\s+Mortgagee')
+ATTORNEY_RE = re.compile(r'([A-Z][^.]*?(?:P\.C\.|PC|PLLC|LLC|Law)),\s+Attorneys? for', re.IGNORECASE)
+
+# Ways a reply can be malformed, as seen from real models
+MALFORMED_KINDS = ("truncated", "prose", "trailing_comma")
+
+
+def prompt_batch(prompt):
+    """The compact notice list at the end of a prompt, or [] if there isn't one."""
+    start = prompt.rfind('[{"id":')
+    if start == -1:
+        return []
+    try:
+        batch, _ = json.JSONDecoder().raw_decode(prompt, start)
+    except ValueError:
+        return []
+    return batch
+
+
+def prompt_fields(prompt):
+    return [FIELD_BY_DESCRIPTION[line] for line in FIELD_LINE_RE.findall(prompt) if line in FIELD_BY_DESCRIPTION]
+
+
+def extract_fields(notice, fields):
+    """Fill the requested fields for one compact notice the way a model would, "N/A" when not found."""
+    values = {}
+    name_parts = (notice.get("name") or "").split()
+    if name_parts:
+        values["First Name"] = name_parts[0]
+        values["Middle Name"] = " ".join(name_parts[1:-1])
+        values["Last Name"] = name_parts[-1] if len(name_parts) > 1 else ""
+    address = ADDRESS_RE.match(notice.get("address") or "")
+    if address:
+        values.update(zip(("Street Address", "City", "State", "Zip"), address.groups()))
+    published = DATE_RE.findall(notice.get("published_dates") or "")
+    if published:
+        values["First date published in Legal News"] = published[0]
+        values["Last Date Published in Legal News"] = published[-1]
+    description = notice.get("description") or ""
+    lender = LENDER_RE.search(description)
+    if lender:
+        values["Lender/Mortgage company's name"] = lender.group(1)
+    attorney = ATTORNEY_RE.search(description)
+    if attorney:
+        values["Attorney Name"] = attorney.group(1).strip()
+    values["Mortgage or a lien (Condo?)"] = "Mortgage" if "mortgage" in description.lower() else "N/A"
+    return {"id": notice["id"], **{field: values.get(field, "N/A") for field in fields}}
+
+
+class MockGroqServer:
+    """Threaded HTTP server answering chat completions like Groq.
+
+    Each call waits `latency` seconds plus `per_record` seconds per notice. A
+    fraction `rate_limit_rate` of calls get a 429 with a retry-after of
+    `retry_after` seconds, `drop_rate` of the notices are left out of replies
+    and `malformed_rate` of replies can't be parsed as JSON. x-ratelimit-*
+    headers are reported against `requests_per_minute` / `tokens_per_minute`.
+    """
+
+    def __init__(self, port=0, latency=0.0, per_record=0.0, rate_limit_rate=0.0, retry_after=1.0, drop_rate=0.0,
+                 malformed_rate=0.0, requests_per_minute=30, tokens_per_minute=30000, seed=1):
+        self.latency = latency
+        self.per_record = per_record
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.drop_rate = drop_rate
+        self.malformed_rate = malformed_rate
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.rng = random.Random(seed)
+
+        self.lock = threading.Lock()
+        self.window = deque()  # (time, tokens) of the calls in the last minute
+        self.reset_stats()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.thread = None
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats = {"calls": 0, "rate_limited": 0, "completions": 0, "records_requested": 0,
+                          "records_returned": 0, "malformed": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                          "max_in_flight": 0, "in_flight": 0, "first_call_at": None, "last_reply_at": None}
+
+    def rate_limit_headers(self, tokens):
+        now = time.time()
+        with self.lock:
+            self.window.append((now, tokens))
+            while self.window and self.window[0][0] < now - 60:
+                self.window.popleft()
+            used_tokens = sum(window_tokens for _, window_tokens in self.window)
+            reset = 60 - (now - self.window[0][0])
+            return {
+                "x-ratelimit-limit-requests": str(self.requests_per_minute),
+                "x-ratelimit-remaining-requests": str(max(0, self.requests_per_minute - len(self.window))),
+                "x-ratelimit-reset-requests": f"{reset:.2f}s",
+                "x-ratelimit-limit-tokens": str(self.tokens_per_minute),
+                "x-ratelimit-remaining-tokens": str(max(0, self.tokens_per_minute - used_tokens)),
+                "x-ratelimit-reset-tokens": f"{reset:.2f}s",
+            }
+
+    def complete(self, body):
+        """Return (status, headers, payload) for a chat completion request."""
+        now = time.time()
+        with self.lock:
+            self.stats["calls"] += 1
+            call_number = self.stats["calls"]
+            self.stats["first_call_at"] = self.stats["first_call_at"] or now
+            if self.rate_limit_rate and self.rng.random() < self.rate_limit_rate:
+                self.stats["rate_limited"] += 1
+                return 429, {"retry-after": f"{self.retry_after:g}"}, {
+                    "error": {"message": "Rate limit reached", "type": "tokens", "code": "rate_limit_exceeded"}}
+            self.stats["in_flight"] += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+
+        prompt = "\n".join(message.get("content", "") for message in body.get("messages", []))
+        batch = prompt_batch(prompt)
+        fields = prompt_fields(prompt)
+        time.sleep(self.latency + self.per_record * len(batch))
+
+        with self.lock:
+            returned = [notice for notice in batch if not (self.drop_rate and self.rng.random() < self.drop_rate)]
+            malformed = bool(returned) and self.malformed_rate and self.rng.random() < self.malformed_rate
+            kind = self.rng.choice(MALFORMED_KINDS) if malformed else None
+        records = json.dumps([extract_fields(notice, fields) for notice in returned], indent=2)
+        if kind == "truncated":
+            content = f"```json\n{records[:len(records) // 2]}"
+        elif kind == "prose":
+            content = f"Here is the extracted data for {len(returned)} notices. Let me know if you need anything else."
+        elif kind == "trailing_comma":
+            content = f"```json\n{records[:-1].rstrip()},\n]\n```"
+        else:
+            content = f"Here is the extracted data:\n\n```json\n{records}\n```"
+
+        prompt_tokens = estimate_text_tokens(prompt)
+        completion_tokens = estimate_text_tokens(content)
+        with self.lock:
+            self.stats["in_flight"] -= 1
+            self.stats["completions"] += 1
+            self.stats["records_requested"] += len(batch)
+            self.stats["records_returned"] += 0 if malformed else len(returned)
+            self.stats["malformed"] += 1 if malformed else 0
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["completion_tokens"] += completion_tokens
+            self.stats["last_reply_at"] = time.time()
+        return 200, self.rate_limit_headers(prompt_tokens + completion_tokens), {
+            "id": f"chatcmpl-mock-{call_number}",
+            "object": "chat.completion",
+            "created": int(now),
+            "model": body.get("model", "mock"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                         "finish_reason": "length" if kind == "truncated" else "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def send_json(self, status, payload, headers=None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path != "/__stats":
+                    return self.send_json(404, {"error": {"message": "Not found"}})
+                if "reset" in parse_qs(url.query):
+                    server.reset_stats()
+                with server.lock:
+                    self.send_json(200, server.stats)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length)
+                if urlparse(self.path).path != "/openai/v1/chat/completions":
+                    return self.send_json(404, {"error": {"message": "Not found"}})
+                try:
+                    body = json.loads(body)
+                except ValueError:
+                    return self.send_json(400, {"error": {"message": "Invalid JSON body"}})
+                status, headers, payload = server.complete(body)
+                self.send_json(status, payload, headers)
+
+        return Handler
+
+    def start(self):
+        """Serve from a background thread."""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the Groq chat completions API")
+    parser.add_argument("--port", type=int, default=8900, help="Port to listen on (default 8900)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay added to every completion")
+    parser.add_argument("--ms-per-record", type=float, default=0, help="Extra delay per notice in the batch")
+    parser.add_argument("--rate-limit-rate", type=float, default=0, help="Fraction of calls answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1, help="retry-after seconds sent with a 429")
+    parser.add_argument("--drop-rate", type=float, default=0, help="Fraction of notices left out of replies")
+    parser.add_argument("--malformed-rate", type=float, default=0, help="Fraction of replies that aren't valid JSON")
+    parser.add_argument("--requests-per-minute", type=int, default=30, help="Limit reported in x-ratelimit-*")
+    parser.add_argument("--tokens-per-minute", type=int, default=30000, help="Limit reported in x-ratelimit-*")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the injected failures")
+    args = parser.parse_args()
+
+    server = MockGroqServer(args.port, args.latency_ms / 1000, args.ms_per_record / 1000, args.rate_limit_rate,
+                            args.retry_after, args.drop_rate, args.malformed_rate, args.requests_per_minute,
+                            args.tokens_per_minute, args.seed)
+    print(f"Serving a mock Groq API at {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Look up notices in the database written by the scraper (NOTICE_DB).
+
+Filters can be combined; attorney and lender match names starting with the
+given text, ignoring case, and --text searches the notice names and
+descriptions (phrases in double quotes, prefixes ending in *):
+
+    python query_notices.py --zip 48201
+    python query_notices.py --attorney "trott" --sale-from 2025-01-01 --format csv
+    python query_notices.py --text '"Quicken Loans" AND mortg*'
+
+--load adds the records of an existing foreclosures.jsonl to the database.
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from dotenv import load_dotenv
+
+from legalnews_scraper.notice_db import PROCESSED_COLUMNS, NoticeDatabase
+from legalnews_scraper.sinks import iter_batches, iter_records
+
+# Columns shown by the default table format
+TABLE_COLUMNS = ['notice_id', 'county', 'sale_date', 'amount_due', 'zip', 'street_address', 'attorney_name', 'lender']
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Query the scraped foreclosure notices database")
+    parser.add_argument("--db", default=os.getenv("NOTICE_DB") or "foreclosures.db",
+                        help="Database file (default: NOTICE_DB from .env, else foreclosures.db)")
+    parser.add_argument("--zip", help="Property zip code")
+    parser.add_argument("--county", help="County name")
+    parser.add_argument("--attorney", help="Attorney name prefix")
+    parser.add_argument("--lender", help="Lender/mortgage company name prefix")
+    parser.add_argument("--sale-from", help="Earliest sale date (YYYY-MM-DD)")
+    parser.add_argument("--sale-to", help="Latest sale date (YYYY-MM-DD)")
+    parser.add_argument("--text", help="Full-text query over notice names and descriptions")
+    parser.add_argument("--load", metavar="JSONL", help="Add the scraped records of a JSONL file, then exit")
+    parser.add_argument("--limit", type=int, default=100, help="Most notices to return (default 100)")
+    parser.add_argument("--format", choices=["table", "csv", "json"], default="table", help="Output format")
+    args = parser.parse_args()
+
+    if args.load:
+        db = NoticeDatabase(args.db)
+        loaded = 0
+        for batch in iter_batches(iter_records(args.load), 1000):
+            db.upsert_scraped(batch)
+            loaded += len(batch)
+        db.close()
+        print(f"Loaded {loaded} notices from {args.load} into {args.db}")
+        return
+
+    if not os.path.exists(args.db):
+        parser.error(f"{args.db} not found; set NOTICE_DB when scraping to build it")
+
+    db = NoticeDatabase(args.db)
+    start = time.perf_counter()
+    try:
+        columns, rows = db.query(args.zip, args.county, args.attorney, args.lender, args.sale_from, args.sale_to,
+                                 args.text, args.limit)
+    except (ValueError, sqlite3.OperationalError) as e:
+        db.close()
+        parser.error(f"invalid query: {e}")
+    elapsed = time.perf_counter() - start
+    db.close()
+
+    if args.format == "json":
+        for row in rows:
+            print(json.dumps(dict(zip(columns, row))))
+    elif args.format == "csv":
+        writer = csv.writer(sys.stdout)
+        writer.writerow(['notice_id', 'url', 'county'] + PROCESSED_COLUMNS)
+        for row in rows:
+            record = dict(zip(columns, row))
+            writer.writerow([record[column] for column in ['notice_id', 'url', 'county'] + PROCESSED_COLUMNS])
+    else:
+        for row in rows:
+            record = dict(zip(columns, row))
+            print(" | ".join(str(record[column] or "") for column in TABLE_COLUMNS))
+    print(f"{len(rows)} notices in {elapsed * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""Local stand-in for legalnews.com, for running and benchmarking the scraper offline.
+
+Serves the login, search, results and detail pages from the HTML fixtures in
+fixtures/legalnews, filled in for a deterministic set of synthetic notices.
+Searches are filtered by county and first-published date like the real site,
+so --shard and multi-county runs behave as they would live:
+
+    python replay_server.py --port 8800 --notices 2000 --latency-ms 50 --error-rate 0.01
+    LEGALNEWS_BASE_URL=http://127.0.0.1:8800 python requests-sessions.py --counties Wayne ...
+
+Any user name and password log in. GET /__stats returns request counts as JSON
+(add ?reset=1 to zero them).
+"""
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "legalnews")
+OPTION_RE = re.compile(r'<option value="(\d+)" data-isaccess="True">([^<]+)</option>')
+
+FIRST_NAMES = ["JOHN", "MARY", "ROBERT", "PATRICIA", "MICHAEL", "LINDA", "DAVID", "ELIZABETH", "JAMES", "SUSAN"]
+LAST_NAMES = ["SMITH", "JOHNSON", "WILLIAMS", "BROWN", "JONES", "GARCIA", "MILLER", "DAVIS", "WILSON", "TAYLOR"]
+STREETS = ["Main St", "Woodward Ave", "Gratiot Ave", "Grand River Ave", "Maple Rd", "Jefferson Ave", "Oak St"]
+CITIES = {"Genesee": "Flint", "Kent": "Grand Rapids", "Macomb": "Warren", "Oakland": "Southfield",
+          "Washtenaw": "Ann Arbor", "Wayne": "Detroit"}
+LENDERS = ["Quicken Loans Inc.", "Wells Fargo Bank, N.A.", "JPMorgan Chase Bank, N.A.", "Rocket Mortgage, LLC",
+           "Flagstar Bank, FSB", "Mortgage Electronic Registration Systems, Inc."]
+ATTORNEYS = [("Trott Law, P.C.", "31440 Northwestern Hwy Ste 145, Farmington Hills, MI 48334", "(248) 642-2515"),
+             ("Schneiderman & Sherman, P.C.", "23938 Research Dr Ste 300, Farmington Hills, MI 48335",
+              "(248) 539-7400"),
+             ("Orlans PC", "PO Box 5041, Troy, MI 48007", "(248) 502-1400"),
+             ("Potestivo & Associates, P.C.", "251 Diversion St, Rochester, MI 48307", "(248) 853-4400")]
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), 'r', encoding='utf-8') as f:
+        return Template(f.read())
+
+
+def short_date(day):
+    return f"{day.month}/{day.day}/{day.year}"
+
+
+def long_date(day):
+    return f"{day.strftime('%B')} {day.day}, {day.year}"
+
+
+def synthetic_notices(count, counties, first_day, last_day, seed):
+    """Build `count` notices spread evenly over the counties and first-published dates."""
+    rng = random.Random(seed)
+    span = (last_day - first_day).days + 1
+    notices = []
+    for i in range(count):
+        county = counties[i % len(counties)]
+        first_published = first_day + timedelta(days=i * span // count)
+        attorney, attorney_address, attorney_phone = rng.choice(ATTORNEYS)
+        city = CITIES.get(county, county)
+        mortgage_date = first_published - timedelta(days=rng.randrange(1000, 7000))
+        notices.append({
+            "notice_id": str(100000 + i),
+            "county": county,
+            "first_published": first_published,
+            "published_dates": ", ".join(
+                short_date(first_published + timedelta(weeks=week)) for week in range(4)),
+            "address": f"{rng.randrange(100, 99999)} {rng.choice(STREETS)}, {city}, MI {48000 + rng.randrange(1000)}",
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice('ABCDEFGHJKLMNPRSTW')} {rng.choice(LAST_NAMES)}",
+            "city": city,
+            "lender": rng.choice(LENDERS),
+            "mortgage_date": long_date(mortgage_date),
+            "recorded_date": long_date(mortgage_date + timedelta(days=rng.randrange(5, 40))),
+            "liber": rng.randrange(10000, 60000),
+            "page_number": rng.randrange(1, 999),
+            "amount_due": f"${rng.randrange(20000, 600000):,}.{rng.randrange(100):02d}",
+            "sale_date": long_date(first_published + timedelta(days=rng.randrange(35, 60))),
+            "lot": rng.randrange(1, 400),
+            "subdivision": f"{rng.choice(LAST_NAMES).title()} Park No. {rng.randrange(1, 9)}",
+            "redemption_period": rng.choice(["6 months", "6 months", "12 months", "30 days"]),
+            "attorney": attorney,
+            "attorney_address": attorney_address,
+            "attorney_phone": attorney_phone,
+            "file_number": f"{first_published.year % 100}-{rng.randrange(100000, 999999):06d}",
+        })
+    return notices
+
+
+class ReplayServer:
+    """Threaded HTTP server standing in for legalnews.com.
+
+    `latency` seconds (plus up to `jitter` more) are added to every response and
+    a fraction `error_rate` of searches, results and detail requests fail with a 503.
+    Sessions are tracked by cookie; a request without a logged-in session is
+    redirected to /Home/Login like on the real site.
+    """
+
+    def __init__(self, port=0, notices=1000, page_size=10, latency=0.0, jitter=0.0, error_rate=0.0,
+                 first_day=date(2025, 1, 1), last_day=date(2025, 6, 30), seed=1):
+        self.page_size = page_size
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.templates = {name: load_fixture(f"{name}.html")
+                          for name in ("login", "public_notices", "results", "result_item", "detail")}
+        self.county_values = dict(OPTION_RE.findall(self.templates["public_notices"].template))
+        self.notices = synthetic_notices(notices, list(self.county_values.values()), first_day, last_day, seed)
+        self.notices_by_id = {notice["notice_id"]: notice for notice in self.notices}
+
+        self.lock = threading.Lock()
+        self.sessions = {}  # session id -> notices matched by its last search
+        self.reset_stats()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.thread = None
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats = {"requests": 0, "logins": 0, "searches": 0, "results_pages": 0, "details": 0,
+                          "not_modified": 0, "other": 0, "redirects": 0, "errors": 0,
+                          "first_request_at": None, "last_request_at": None}
+
+    def count(self, key):
+        with self.lock:
+            now = time.time()
+            self.stats["requests"] += 1
+            self.stats[key] += 1
+            if self.stats["first_request_at"] is None:
+                self.stats["first_request_at"] = now
+            self.stats["last_request_at"] = now
+
+    def delay(self):
+        time.sleep(self.latency + (self.rng.random() * self.jitter if self.jitter else 0))
+
+    def failed(self):
+        if self.error_rate and self.rng.random() < self.error_rate:
+            with self.lock:
+                self.stats["errors"] += 1
+            return True
+        return False
+
+    def search(self, form):
+        """Notices matching a submitted search form, in the site's newest-first order."""
+        county = self.county_values.get(form.get("drpcounty", ["all"])[0])
+        start = form.get("first_date_published", [""])[0]
+        end = form.get("first_date_published_thru", [""])[0]
+        start = date.fromisoformat(start) if start else date.min
+        end = date.fromisoformat(end) if end else date.max
+        matches = [notice for notice in self.notices
+                   if (county is None or notice["county"] == county) and start <= notice["first_published"] <= end]
+        return matches[::-1]
+
+    def results_page(self, matches, page):
+        total_pages = max(1, -(-len(matches) // self.page_size))
+        items = "".join(
+            self.templates["result_item"].substitute(notice_id=notice["notice_id"], address=notice["address"],
+                                                     county=notice["county"],
+                                                     first_published=notice["first_published"].isoformat())
+            for notice in matches[(page - 1) * self.page_size:page * self.page_size]
+        )
+        next_link = f'<a href="/Home/PublicNotices?page={page + 1}">Next &gt;</a>' if page < total_pages else ""
+        return self.templates["results"].substitute(results_found=f"{len(matches):,}", page=page,
+                                                    total_pages=total_pages, next_link=next_link, items=items)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def send(self, body, status=200, headers=None):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def session_id(self):
+                match = re.search(r'replay_session=([0-9a-f]+)', self.headers.get("Cookie", ""))
+                if match and match.group(1) in server.sessions:
+                    return match.group(1)
+                return None
+
+            def redirect_to_login(self):
+                self.send("", 302, {"Location": "/Home/Login"})
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                if url.path == "/__stats":
+                    if "reset" in query:
+                        server.reset_stats()
+                    with server.lock:
+                        return self.send(json.dumps(server.stats), headers={"Content-Type": "application/json"})
+
+                server.delay()
+                if url.path == "/Home/Login":
+                    server.count("other")
+                    return self.send(server.templates["login"].substitute(token=uuid.uuid4().hex))
+
+                session_id = self.session_id()
+                if session_id is None:
+                    server.count("redirects")
+                    return self.redirect_to_login()
+
+                if url.path == "/Home/PublicNotices":
+                    if "page" not in query:
+                        server.count("other")
+                        return self.send(server.templates["public_notices"].substitute(token=uuid.uuid4().hex))
+                    server.count("results_pages")
+                    if server.failed():
+                        return self.send("Service Unavailable", 503)
+                    return self.send(server.results_page(server.sessions[session_id], int(query["page"][0])))
+
+                match = re.match(r'/Home/PublicNoticesDetails/(\d+)$', url.path)
+                if match and match.group(1) in server.notices_by_id:
+                    etag = f'"{match.group(1)}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        server.count("not_modified")
+                        return self.send("", 304, {"ETag": etag})
+                    server.count("details")
+                    if server.failed():
+                        return self.send("Service Unavailable", 503)
+                    notice = server.notices_by_id[match.group(1)]
+                    return self.send(server.templates["detail"].substitute(notice), headers={"ETag": etag})
+                self.send("Not Found", 404)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                form = parse_qs(self.rfile.read(length).decode("utf-8"), keep_blank_values=True)
+                url = urlparse(self.path)
+                server.delay()
+                if url.path == "/Home/ValidateUser":
+                    server.count("logins")
+                    session_id = uuid.uuid4().hex
+                    with server.lock:
+                        server.sessions[session_id] = []
+                    return self.send("<html><body>Welcome</body></html>",
+                                     headers={"Set-Cookie": f"replay_session={session_id}; Path=/"})
+
+                session_id = self.session_id()
+                if session_id is None:
+                    server.count("redirects")
+                    return self.redirect_to_login()
+                if url.path == "/Home/PublicNotices":
+                    server.count("searches")
+                    if server.failed():
+                        return self.send("Service Unavailable", 503)
+                    matches = server.search(form)
+                    with server.lock:
+                        server.sessions[session_id] = matches
+                    return self.send(server.results_page(matches, 1))
+                self.send("Not Found", 404)
+
+        return Handler
+
+    def start(self):
+        """Serve from a background thread."""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for legalnews.com")
+    parser.add_argument("--port", type=int, default=8800, help="Port to listen on (default 8800)")
+    parser.add_argument("--notices", type=int, default=1000, help="Number of synthetic notices")
+    parser.add_argument("--page-size", type=int, default=10, help="Results per results page")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Up to this much extra random delay")
+    parser.add_argument("--error-rate", type=float, default=0,
+                        help="Fraction of search and page requests answered with 503")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the notices and errors")
+    args = parser.parse_args()
+
+    server = ReplayServer(args.port, args.notices, args.page_size, args.latency_ms / 1000, args.jitter_ms / 1000,
+                          args.error_rate, seed=args.seed)
+    print(f"Serving {len(server.notices)} notices at {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from legalnews_scraper.async_crawler import AsyncCrawler
+from legalnews_scraper.legalnews_session import HEADERS, SessionExpiredError, build_search_form, search_headers
+from legalnews_scraper.rate_limit import RateLimiter
+from replay_server import ReplayServer
+
+
+@pytest.fixture
+def server():
+    server = ReplayServer(notices=200, page_size=10, latency=0.005).start()
+    yield server
+    server.stop()
+
+
+def test_session_expiry_stops_the_crawl(server):
+    session_id = "ab12"
+    server.sessions[session_id] = []
+
+    # The server forgets the session after 15 detail pages, so later requests go to the login page
+    count = server.count
+
+    def count_and_expire(key):
+        count(key)
+        if key == "details" and server.stats["details"] == 15:
+            server.sessions.clear()
+
+    server.count = count_and_expire
+
+    crawler = AsyncCrawler(server.base_url, HEADERS, {"replay_session": session_id}, 4, RateLimiter(0),
+                           max_retries=0)
+    committed = []
+
+    async def crawl():
+        with pytest.raises(SessionExpiredError):
+            await crawler.crawl(f"{server.base_url}/Home/PublicNotices", build_search_form("token", "all", "", ""),
+                                search_headers(server.base_url),
+                                lambda page, last_number, records: committed.append((page, last_number)))
+        # No detail fetch outlives the crawl
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    asyncio.run(crawl())
+    # Detail fetches finish in any order, so only the pages that got all theirs before the expiry are committed
+    assert len(committed) < 2
+    assert committed == [(page, page * 10) for page in range(1, len(committed) + 1)]
+    # Only the requests already in flight reached the server after the session had expired
+    assert server.stats["redirects"] <= 4
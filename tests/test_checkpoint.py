@@ -0,0 +1,116 @@
+import csv
+import json
+import re
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from legalnews_scraper.checkpoint import CrawlCheckpoint
+from legalnews_scraper.crawl import Scraper
+from legalnews_scraper.legalnews_session import FetchError
+from legalnews_scraper.session_pool import AuthenticatedSession
+from legalnews_scraper.settings import Settings
+from legalnews_scraper.sinks import iter_records
+from replay_server import ReplayServer
+
+BASE_URL = "https://legalnews.com"
+
+
+class CannedResponse:
+    def __init__(self, url, status_code, text):
+        self.url = url
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.headers = {}
+        self.text = text
+
+
+class CannedSession:
+    """Answers the crawler's requests with replay_server pages, without a server.
+
+    Results pages listed in `failing_pages` answer 503.
+    """
+
+    def __init__(self, site):
+        self.site = site
+        self.matches = []
+        self.failing_pages = set()
+
+    def request(self, method, url, timeout=None, data=None, **kwargs):
+        if method == 'POST':
+            form = {}
+            for key, value in data:
+                form.setdefault(key, []).append(value)
+            self.matches = self.site.search(form)
+            return CannedResponse(url, 200, self.site.results_page(self.matches, 1))
+        page = int(parse_qs(urlparse(url).query)["page"][0])
+        if page in self.failing_pages:
+            return CannedResponse(url, 503, "Service Unavailable")
+        return CannedResponse(url, 200, self.site.results_page(self.matches, page))
+
+    def get(self, url, timeout=None, **kwargs):
+        notice_id = re.search(r'/PublicNoticesDetails/(\d+)$', url).group(1)
+        return CannedResponse(url, 200, self.site.templates["detail"].substitute(self.site.notices_by_id[notice_id]))
+
+
+@pytest.fixture
+def site():
+    site = ReplayServer(notices=45, page_size=10)
+    yield site
+    site.httpd.server_close()
+
+
+def test_resume_after_a_failed_results_page(site, tmp_path):
+    settings = Settings(base_url=BASE_URL, crawl_engine="threads", requests_per_second=0, detail_workers=4,
+                        adaptive_concurrency=False, detail_max_retries=1, detail_retry_seconds=0, detail_cache="",
+                        state_db="", notice_db="", session_file="",
+                        failed_details_file=str(tmp_path / "failed_details.jsonl"))
+    scraper = Scraper(settings)
+    auth = AuthenticatedSession(0, CannedSession(site))
+    auth.search_token = "token"
+    jsonl_path, csv_path = str(tmp_path / "foreclosures.jsonl"), str(tmp_path / "foreclosures.csv")
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+    search = ("All Counties", "01/01/2025", "06/30/2025")
+
+    # Results page 3 keeps failing: the crawl stops after page 2
+    auth.session.failing_pages = {3}
+    with pytest.raises(FetchError):
+        scraper.run_search(auth, *search, jsonl_path, csv_path, CrawlCheckpoint(checkpoint_path))
+    checkpoint = CrawlCheckpoint(checkpoint_path)
+    state = checkpoint.load()
+    assert (state["last_page"], state["last_foreclosure_number"]) == (2, 20)
+
+    # A page half-written when the process died is cut off on resume
+    with open(jsonl_path, 'a', encoding='utf-8') as f:
+        f.write('{"foreclosure_number": 21, "url": "torn')
+    with open(csv_path, 'a', encoding='utf-8') as f:
+        f.write('21,torn')
+
+    auth.session.failing_pages = set()
+    assert scraper.run_search(auth, *search, jsonl_path, csv_path, checkpoint) == 45
+    scraper.close()
+
+    records = list(iter_records(jsonl_path))
+    expected_ids = [notice["notice_id"] for notice in site.notices[::-1]]
+    assert [record["url"].rsplit("/", 1)[1] for record in records] == expected_ids
+    assert [record["foreclosure_number"] for record in records] == list(range(1, 46))
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert [row["url"] for row in rows] == [record["url"] for record in records]
+    assert not (tmp_path / "checkpoint.json").exists()
+
+
+def test_checkpoint_for_another_search_starts_over(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    checkpoint = CrawlCheckpoint(path)
+    checkpoint.start({"county": "Wayne", "start_date": "01/01/2025", "end_date": "01/31/2025"})
+    checkpoint.page_done(4, 40, {"jsonl": 100, "csv": 80})
+
+    resumed = CrawlCheckpoint(path)
+    assert resumed.load()["last_page"] == 4
+    assert not resumed.start({"county": "Kent", "start_date": "01/01/2025", "end_date": "01/31/2025"})
+    assert resumed.state["last_page"] == 0
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)["output_offsets"] is None
+    # A checkpoint without a finished page is not worth resuming
+    assert CrawlCheckpoint(path).load() is None
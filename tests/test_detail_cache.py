@@ -0,0 +1,71 @@
+import pytest
+
+from legalnews_scraper.detail_cache import DetailCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("legalnews_scraper.detail_cache.time", clock)
+    return clock
+
+
+def url(notice_id):
+    return f"https://legalnews.com/Home/PublicNoticesDetails/{notice_id}"
+
+
+def test_fresh_page_is_served_until_the_ttl_runs_out(tmp_path, clock):
+    cache = DetailCache(str(tmp_path / "cache.db"), 60, 10 ** 6)
+    assert cache.lookup(url(1)) == (None, {})
+    cache.store_response(url(1), 200, "<html>1</html>", {"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025"})
+
+    clock.now += 59
+    assert cache.lookup(url(1)) == ("<html>1</html>", {})
+    clock.now += 2
+    assert cache.lookup(url(1)) == (None, {"If-None-Match": '"v1"', "If-Modified-Since": "Wed, 01 Jan 2025"})
+    cache.close()
+
+
+def test_not_modified_revalidates_the_cached_page(tmp_path, clock):
+    cache = DetailCache(str(tmp_path / "cache.db"), 60, 10 ** 6)
+    cache.store_response(url(1), 200, "<html>1</html>", {"ETag": '"v1"'})
+    clock.now += 120
+    assert cache.store_response(url(1), 304, "", {}) == "<html>1</html>"
+    # The 304 starts a new TTL
+    assert cache.lookup(url(1)) == ("<html>1</html>", {})
+    # Nothing to revalidate against, and errors aren't cached
+    assert cache.store_response(url(2), 304, "", {}) is None
+    assert cache.store_response(url(2), 503, "busy", {}) is None
+    assert cache.lookup(url(2)) == (None, {})
+    assert (cache.hits, cache.revalidated, cache.downloaded) == (1, 1, 1)
+    cache.close()
+
+
+def test_least_recently_used_pages_are_evicted(tmp_path, clock):
+    cache = DetailCache(str(tmp_path / "cache.db"), 3600, 250)
+    for notice_id in (1, 2):
+        clock.now += 1
+        cache.store_response(url(notice_id), 200, str(notice_id) * 100, {})
+    clock.now += 1
+    cache.lookup(url(1))
+    clock.now += 1
+    cache.store_response(url(3), 200, "3" * 100, {})
+
+    assert cache.total_bytes == 200
+    assert cache.lookup(url(2)) == (None, {})
+    assert cache.lookup(url(1))[0] == "1" * 100
+    assert cache.lookup(url(3))[0] == "3" * 100
+    cache.close()
+
+    # The size is read back from the file on the next run
+    reopened = DetailCache(str(tmp_path / "cache.db"), 3600, 250)
+    assert reopened.total_bytes == 200
+    reopened.close()
@@ -0,0 +1,51 @@
+from legalnews_scraper.extraction_cache import ExtractionCache, prompt_fingerprint
+
+FIELDS = ['Sale Date', 'Amount Due']
+
+
+def notice(description="Mortgage sale on June 5, 2025 for $120,000.00"):
+    return {"foreclosure_number": 1, "url": "https://legalnews.com/Home/PublicNoticesDetails/1",
+            "name": "JOHN DOE", "description": description}
+
+
+def row_count(cache):
+    return cache.conn.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+
+
+def test_same_notice_and_fields_hit(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "llm.db"), prompt_fingerprint("llama3-8b-8192", "prompt v1"))
+    result = {"Sale Date": "June 5, 2025", "Amount Due": "$120,000.00"}
+    cache.store([notice()], [result], [FIELDS])
+
+    # The foreclosure number isn't sent to the model, so it isn't part of the key
+    assert cache.lookup({**notice(), "foreclosure_number": 7}, FIELDS) == result
+    assert cache.lookup(notice(), FIELDS + ['Zip']) is None
+    assert cache.lookup(notice("Land contract forfeiture"), FIELDS) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+    cache.close()
+
+
+def test_new_model_or_prompt_gets_new_keys_and_drops_old_entries(tmp_path):
+    path = str(tmp_path / "llm.db")
+    old_version = prompt_fingerprint("llama3-8b-8192", "prompt v1")
+    cache = ExtractionCache(path, old_version)
+    cache.store([notice()], [{"Sale Date": "June 5, 2025"}], [FIELDS])
+    old_key = cache.content_key(notice(), FIELDS)
+    cache.close()
+
+    for model, prompt in (("llama-3.1-8b-instant", "prompt v1"), ("llama3-8b-8192", "prompt v2")):
+        version = prompt_fingerprint(model, prompt)
+        assert version != old_version
+        cache = ExtractionCache(path, version)
+        assert cache.content_key(notice(), FIELDS) != old_key
+        assert row_count(cache) == 0
+        assert cache.lookup(notice(), FIELDS) is None
+        cache.close()
+
+    # Reopening under the same version keeps the entries
+    cache = ExtractionCache(path, old_version)
+    cache.store([notice()], [{"Sale Date": "June 5, 2025"}], [FIELDS])
+    cache.close()
+    cache = ExtractionCache(path, old_version)
+    assert row_count(cache) == 1
+    cache.close()
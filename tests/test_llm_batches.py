@@ -0,0 +1,49 @@
+import json
+
+from legalnews_scraper.llm_batches import estimate_text_tokens, match_results, pack_batches, serialize_batch
+
+
+def notice(number, description_length=100):
+    return {"foreclosure_number": number, "url": f"https://legalnews.com/Home/PublicNoticesDetails/{number}",
+            "name": f"NAME {number}", "address": "1 Main St, Detroit, MI 48201", "published_dates": "1/1/2025",
+            "description": "x" * description_length}
+
+
+def test_batches_stay_within_the_token_budget():
+    records = [notice(number, 400 + 50 * (number % 7)) for number in range(50)]
+    batches = list(pack_batches(records, 2000, 10000, lambda record: 50))
+    assert [record for batch in batches for record in batch] == records
+    for batch in batches:
+        assert estimate_text_tokens(serialize_batch(batch)) + 50 * len(batch) <= 2000
+
+
+def test_reply_budget_caps_the_batch_size():
+    batches = list(pack_batches([notice(number) for number in range(10)], 100000, 300, lambda record: 100))
+    assert [len(batch) for batch in batches] == [3, 3, 3, 1]
+
+
+def test_oversized_record_goes_alone():
+    records = [notice(1), notice(2, 20000), notice(3)]
+    batches = list(pack_batches(records, 1000, 10000, lambda record: 10))
+    assert [[record["foreclosure_number"] for record in batch] for batch in batches] == [[1], [2], [3]]
+
+
+def test_serialized_batch_is_compact_and_numbered():
+    data = json.loads(serialize_batch([notice(7), notice(8)]))
+    assert [item["id"] for item in data] == [1, 2]
+    # The url and foreclosure number are not sent to the model
+    assert "url" not in data[0] and "foreclosure_number" not in data[0]
+
+
+def test_results_are_matched_by_id_and_missing_ones_reported():
+    batch = [notice(1), notice(2), notice(3)]
+    records, results, missing = match_results(batch, [{"id": "3", "City": "C"}, {"ID": 1, "City": "A"}, "junk"])
+    assert records == [batch[0], batch[2]]
+    assert results == [{"City": "A"}, {"City": "C"}]
+    assert missing == [batch[1]]
+
+
+def test_results_without_ids_are_matched_by_position_only_when_complete():
+    batch = [notice(1), notice(2)]
+    assert match_results(batch, [{"City": "A"}, {"City": "B"}])[1] == [{"City": "A"}, {"City": "B"}]
+    assert match_results(batch, [{"City": "A"}])[2] == batch
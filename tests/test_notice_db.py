@@ -0,0 +1,62 @@
+import pytest
+
+from legalnews_scraper.notice_db import NoticeDatabase, like_prefix
+
+
+def raw(notice_id, name="JOHN DOE", description="Mortgage sale of 1 Main St"):
+    return {"url": f"https://legalnews.com/Home/PublicNoticesDetails/{notice_id}", "county": "Wayne",
+            "published_dates": "1/1/2025", "address": "1 Main St", "name": name, "description": description}
+
+
+def notice_ids(db, **filters):
+    columns, rows = db.query(**filters)
+    return sorted(row[columns.index("notice_id")] for row in rows)
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = NoticeDatabase(str(tmp_path / "notices.db"))
+    yield db
+    db.close()
+
+
+def test_name_prefixes_are_taken_literally(db):
+    attorneys = {1: "100% Legal, P.C.", 2: "100 Legal Group", 3: "Trott_Law", 4: "TrottXLaw", 5: "C:\\Law"}
+    db.upsert_processed([raw(notice_id) for notice_id in attorneys],
+                        [{"Attorney Name": attorney} for attorney in attorneys.values()])
+    assert like_prefix("50%_\\") == "50\\%\\_\\\\%"
+    assert notice_ids(db, attorney="100%") == ["1"]
+    assert notice_ids(db, attorney="100") == ["1", "2"]
+    assert notice_ids(db, attorney="trott_") == ["3"]
+    assert notice_ids(db, attorney="c:\\") == ["5"]
+
+
+def test_processed_fields_survive_a_rescrape(db):
+    db.upsert_processed([raw(1)], [{"Attorney Name": "Orlans PC", "Sale Date": "June 5, 2025", "Zip": "48201"}])
+    db.upsert_scraped([raw(1)])
+    assert notice_ids(db, attorney="orlans", zip_code="48201", sale_from="2025-06-01", sale_to="2025-06-30") == ["1"]
+
+
+def test_full_text_index_follows_updates_and_deletes(db):
+    if not db.full_text:
+        pytest.skip("SQLite built without FTS5")
+    db.upsert_scraped([raw(1, "MARY SMITH"), raw(2, "ROBERT JONES", "Land contract forfeiture")])
+    assert notice_ids(db, text="mortgage") == ["1"]
+    assert notice_ids(db, text="mort*") == ["1"]
+
+    # A re-scrape with new text replaces the indexed words
+    db.upsert_scraped([raw(1, "MARY SMITH", "Condominium lien sale")])
+    assert notice_ids(db, text="mortgage") == []
+    assert notice_ids(db, text="condominium AND smith") == ["1"]
+
+    # Storing the processed fields leaves the text, and its index entry, as it is
+    db.upsert_processed([raw(2, "ROBERT JONES", "Land contract forfeiture")], [{"Zip": "48201"}])
+    assert notice_ids(db, text="forfeiture") == ["2"]
+
+    with db.lock:
+        db.conn.execute("DELETE FROM notices WHERE notice_id = '2'")
+        db.conn.commit()
+    assert notice_ids(db, text="forfeiture OR condominium") == ["1"]
+    # Raises if the index and the notices table disagree
+    with db.lock:
+        db.conn.execute("INSERT INTO notices_fts (notices_fts, rank) VALUES ('integrity-check', 1)")
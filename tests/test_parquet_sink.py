@@ -0,0 +1,42 @@
+import datetime
+import os
+
+import pytest
+
+pa_dataset = pytest.importorskip("pyarrow.dataset")
+
+from legalnews_scraper.parquet_sink import PARTITIONING, ParquetSink  # noqa: E402
+
+
+def raw(notice_id, county="Wayne", published_dates="6/5/2025, 6/12/2025", description=""):
+    return {"url": f"https://legalnews.com/Home/PublicNoticesDetails/{notice_id}", "county": county,
+            "published_dates": published_dates, "description": description}
+
+
+def test_rows_land_in_county_and_month_partitions(tmp_path):
+    root = str(tmp_path / "processed")
+    sink = ParquetSink(root, flush_rows=2)
+    sink.write([raw(1), raw(2, published_dates="7/1/2025")],
+               [{"Sale Date": "July 10, 2025", "Amount Due": "$120,000.50"}, {}])
+    # An "All Counties" search takes the county from the notice; no date at all gives "unknown"
+    sink.write([raw(3, "All Counties", "", "Oakland County sale")], [{"Zip": "48075"}])
+    sink.close()
+    # A later run adds files next to the existing ones
+    sink = ParquetSink(root)
+    sink.write([raw(4)], [{"First date published in Legal News": "June 19, 2025"}])
+    sink.close()
+
+    assert sorted(os.path.relpath(directory, root) for directory, _, files in os.walk(root) if files) == [
+        os.path.join("county=Oakland", "first_published_month=unknown"),
+        os.path.join("county=Wayne", "first_published_month=2025-06"),
+        os.path.join("county=Wayne", "first_published_month=2025-07"),
+    ]
+    assert len(os.listdir(os.path.join(root, "county=Wayne", "first_published_month=2025-06"))) == 2
+
+    rows = {row["notice_id"]: row for row in
+            pa_dataset.dataset(root, format="parquet", partitioning=PARTITIONING).to_table().to_pylist()}
+    assert sorted(rows) == ["1", "2", "3", "4"]
+    assert rows["1"]["sale_date"] == datetime.date(2025, 7, 10)
+    assert rows["1"]["amount_due"] == 120000.5
+    assert rows["3"]["zip"] == "48075" and rows["3"]["county"] == "Oakland"
+    assert rows["2"]["sale_date"] is None
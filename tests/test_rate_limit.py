@@ -0,0 +1,109 @@
+import time
+
+from legalnews_scraper.rate_limit import (AdaptiveConcurrency, GroqRateLimiter, backoff_delay, retry_after_seconds,
+                                         server_overloaded)
+
+
+def settle(controller, requests, latency=0.1):
+    """Run `requests` successful requests through the controller."""
+    for _ in range(requests):
+        controller.acquire()
+        controller.release(latency)
+
+
+def test_limit_grows_with_successes_up_to_the_ceiling():
+    controller = AdaptiveConcurrency(10, initial=4)
+    settle(controller, 20)
+    assert controller.limit > 4
+    settle(controller, 500)
+    assert controller.limit == 10
+
+
+def test_stray_failure_holds_the_limit():
+    controller = AdaptiveConcurrency(32, initial=8)
+    settle(controller, 20)
+    limit = controller.limit
+    controller.acquire()
+    controller.release(0.1, failed=True)
+    assert controller.limit == limit
+
+
+def test_throttled_response_halves_the_limit():
+    controller = AdaptiveConcurrency(32, initial=8)
+    controller.acquire()
+    controller.release(0.1, failed=True, throttled=True)
+    assert controller.limit == 4
+
+
+def test_failures_over_the_tolerance_cut_once_per_round_trip():
+    controller = AdaptiveConcurrency(32, initial=16, error_tolerance=0.1)
+    settle(controller, 5)
+    limit = controller.limit
+    for _ in range(10):
+        controller.acquire()
+        controller.release(0.1, failed=True)
+    # A burst within one round trip only counts once
+    assert controller.limit == limit / 2
+    assert controller.decreases == 1
+
+
+def test_latency_spike_halves_the_limit():
+    controller = AdaptiveConcurrency(32, initial=8, spike_factor=3)
+    settle(controller, 20, latency=0.1)
+    limit = controller.limit
+    controller.acquire()
+    controller.release(1.0)
+    assert controller.limit == limit / 2
+
+
+def test_limit_never_drops_below_the_minimum():
+    controller = AdaptiveConcurrency(32, initial=2, min_limit=2)
+    controller.acquire()
+    controller.release(0.1, failed=True, throttled=True)
+    assert controller.limit == 2
+
+
+def test_fixed_limit_when_not_adaptive():
+    controller = AdaptiveConcurrency(6, adaptive=False)
+    controller.acquire()
+    controller.release(0.1, failed=True, throttled=True)
+    settle(controller, 50)
+    assert controller.limit == 6
+
+
+def test_try_acquire_respects_the_limit_and_retry_after():
+    controller = AdaptiveConcurrency(2, initial=2)
+    assert controller.try_acquire() and controller.try_acquire()
+    assert not controller.try_acquire()
+    controller.release(0.1, retry_after=60)
+    # A Retry-After pauses everyone, even with a free slot
+    assert not controller.try_acquire()
+
+
+def test_unsent_request_frees_its_slot_without_adjusting():
+    controller = AdaptiveConcurrency(2, initial=2)
+    assert controller.try_acquire() and controller.try_acquire()
+    controller.release_unsent()
+    assert controller.limit == 2 and controller.error_rate == 0.0
+    assert controller.try_acquire()
+
+
+def test_retry_helpers():
+    assert server_overloaded(429) and server_overloaded(503)
+    assert not server_overloaded(404)
+    assert retry_after_seconds({'retry-after': '2'}) == 2.0
+    assert retry_after_seconds({'retry-after': 'Wed, 21 Oct 2015 07:28:00 GMT'}) is None
+    assert retry_after_seconds({}) is None
+    for attempt in range(6):
+        assert 0 <= backoff_delay(attempt, 0.5, 4) <= 4
+    assert backoff_delay(0, 0.5, 4, retry_after=10) == 10
+
+
+def test_groq_token_limit_of_zero_is_unlimited():
+    limiter = GroqRateLimiter(0, 0)
+    started = time.monotonic()
+    for _ in range(3):
+        limiter.acquire(5000)
+    limiter.update({'x-ratelimit-limit-tokens': '0', 'x-ratelimit-remaining-tokens': '0'})
+    limiter.acquire(5000)
+    assert time.monotonic() - started < 0.5
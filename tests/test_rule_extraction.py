@@ -0,0 +1,47 @@
+from legalnews_scraper.rule_extraction import RULE_FIELDS, RuleExtractor
+
+DESCRIPTION = (
+    "Default has been made in the conditions of a mortgage made by JOHN SMITH to Quicken Loans, recorded on "
+    "March 3, 2019 in Wayne County Records. The amount claimed to be due at the date hereof is $123,456.78. "
+    "The mortgage will be foreclosed by a sale of the mortgaged premises at public auction at the Wayne County "
+    "Courthouse on Thursday, June 5, 2025 at 10:00 AM. The redemption period shall be 6 months from the date of "
+    "such sale. Questions about foreclosure prevention? Call (800) 555-1212. Trott Law, P.C., Attorneys for "
+    "Servicer, 31440 Northwestern Hwy Ste 145, Farmington Hills, MI 48334, (248) 642-2515 File No. 25-012345"
+)
+
+
+def test_fixed_wording_fields_are_filled():
+    values = RuleExtractor().extract({"description": DESCRIPTION, "address": "123 Main St, Detroit, MI 48201"})
+    assert values == {
+        "Sale Date": "June 5, 2025",
+        "Amount Due": "$123,456.78",
+        "Redemption Period": "6 months",
+        "Attorney File #": "25-012345",
+        "Attorney phone number": "(248) 642-2515",
+        "Recorded Date": "March 3, 2019",
+        "Zip": "48201",
+    }
+
+
+def test_phone_comes_from_the_attorney_signature():
+    # The hotline number earlier in the notice is not the attorney's
+    values = RuleExtractor().extract({"description": "Call (800) 555-1212 for help with your mortgage."})
+    assert "Attorney phone number" not in values
+
+
+def test_zip_must_follow_the_state():
+    extractor = RuleExtractor()
+    assert "Zip" not in extractor.extract({"address": "12345 Woodward Ave"})
+    assert extractor.extract({"address": "12345 Woodward Ave, Detroit, MI 48201-1234"})["Zip"] == "48201"
+
+
+def test_unmatched_fields_are_left_to_the_model():
+    assert RuleExtractor().extract({"description": "", "address": ""}) == {}
+
+
+def test_summary_counts_hits():
+    extractor = RuleExtractor()
+    extractor.extract({"description": DESCRIPTION, "address": "123 Main St, Detroit, MI 48201"})
+    extractor.extract({"description": "", "address": ""})
+    assert all(extractor.hits[field] == 1 for field in RULE_FIELDS)
+    assert "7 of 14 fields filled" in extractor.summary()
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from legalnews_scraper.legalnews_session import FetchError
+from legalnews_scraper.shard_planner import DATE_FORMAT, ShardPlanner
+
+
+class CountingPlanner(ShardPlanner):
+    """Answers each probe from the number of notices published per day instead of a search."""
+
+    def __init__(self, per_day, max_results):
+        super().__init__(None, "https://legalnews.com", "token", None, max_results)
+        self.per_day = per_day
+        self.probes = []
+
+    def count_results(self, county_value, start_date, end_date):
+        self.probes.append((start_date, end_date))
+        start = datetime.strptime(start_date, DATE_FORMAT)
+        end = datetime.strptime(end_date, DATE_FORMAT)
+        return sum(self.per_day((start + timedelta(days=offset)).day) for offset in range((end - start).days + 1))
+
+
+def test_no_results_gives_no_shards():
+    assert CountingPlanner(lambda day: 0, 100).plan("Wayne", "82", "01/01/2025", "01/31/2025") == []
+
+
+def test_small_range_stays_whole():
+    planner = CountingPlanner(lambda day: 1, 100)
+    assert planner.plan("Wayne", "82", "01/01/2025", "01/31/2025") == [("01/01/2025", "01/31/2025")]
+    assert len(planner.probes) == 1
+
+
+def test_large_range_splits_into_weeks_then_days():
+    # Only the week of the 8th is over the limit on its own
+    planner = CountingPlanner(lambda day: 30 if 8 <= day <= 14 else 5, 100)
+    shards = planner.plan("Wayne", "82", "01/01/2025", "01/20/2025")
+    assert shards == [("01/01/2025", "01/07/2025")] + \
+        [(f"01/{day:02d}/2025", f"01/{day:02d}/2025") for day in range(8, 15)] + \
+        [("01/15/2025", "01/20/2025")]
+
+
+def test_empty_weeks_are_dropped():
+    planner = CountingPlanner(lambda day: 10 if day <= 7 or day >= 22 else 0, 100)
+    assert planner.plan("Wayne", "82", "01/01/2025", "01/28/2025") == [("01/01/2025", "01/07/2025"),
+                                                                       ("01/22/2025", "01/28/2025")]
+
+
+def test_unparseable_dates_keep_the_range():
+    class FixedCount(ShardPlanner):
+        def count_results(self, county_value, start_date, end_date):
+            return 5000
+
+    planner = FixedCount(None, "https://legalnews.com", "token", None, 100)
+    assert planner.plan("Wayne", "82", "2025-01-01", "2025-01-31") == [("2025-01-01", "2025-01-31")]
+
+
+class FailingSession:
+    """A session whose searches always answer 503."""
+
+    def __init__(self):
+        self.posts = 0
+
+    def post(self, url, **kwargs):
+        self.posts += 1
+        return type("Response", (), {"url": url, "ok": False, "status_code": 503, "headers": {}, "text": ""})()
+
+
+class NoWait:
+    def wait(self):
+        pass
+
+
+def test_failed_probe_is_retried_then_raises():
+    session = FailingSession()
+    planner = ShardPlanner(session, "https://legalnews.com", "token", NoWait(), 100, max_retries=2, retry_base=0)
+    with pytest.raises(FetchError):
+        planner.count_results("82", "01/01/2025", "01/31/2025")
+    assert session.posts == 3
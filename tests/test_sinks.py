@@ -0,0 +1,32 @@
+from legalnews_scraper.sinks import AI_FIELDNAMES, standardize_record
+
+
+def test_aliases_and_capitalisations_map_to_the_canonical_fields():
+    record = standardize_record({"Address": "1 Main St", "attorney phone number": "(248) 502-1400",
+                                 "ZIP": "48201", "First Date Published in Legal News": "1/1/2025"})
+    assert record["Street Address"] == "1 Main St"
+    assert record["Attorney phone number"] == "(248) 502-1400"
+    assert record["Zip"] == "48201"
+    assert record["First date published in Legal News"] == "1/1/2025"
+
+
+def test_exact_spelling_wins_over_an_alias():
+    record = standardize_record({"Address": "alias", "Street Address": "exact", "street address": "lower"})
+    assert record["Street Address"] == "exact"
+
+
+def test_single_name_is_split():
+    record = standardize_record({"Name": "MARY ANN LEE SMITH"})
+    assert (record["First Name"], record["Middle Name"], record["Last Name"]) == ("MARY", "ANN LEE", "SMITH")
+
+
+def test_name_does_not_override_returned_name_parts():
+    record = standardize_record({"Name": "JOHN DOE", "First Name": "JANE", "Last Name": "ROE"})
+    assert (record["First Name"], record["Last Name"]) == ("JANE", "ROE")
+    assert record["Middle Name"] == "N/A"
+
+
+def test_missing_fields_are_na_and_unknown_keys_dropped():
+    record = standardize_record({"City": "Detroit", "Comment": "unrelated"})
+    assert set(record) == set(AI_FIELDNAMES)
+    assert all(record[field] == "N/A" for field in AI_FIELDNAMES if field != "City")
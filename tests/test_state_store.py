@@ -0,0 +1,38 @@
+from legalnews_scraper.state_store import StateStore
+
+
+def record(notice_id, name="JOHN DOE"):
+    return {"url": f"https://legalnews.com/Home/PublicNoticesDetails/{notice_id}", "name": name}
+
+
+def test_known_ids(tmp_path):
+    store = StateStore(str(tmp_path / "state.db"))
+    store.mark_scraped([record(notice_id) for notice_id in range(0, 1200, 2)])
+    # More ids than one query takes at a time
+    assert store.known_ids(str(notice_id) for notice_id in range(1200)) == {str(n) for n in range(0, 1200, 2)}
+    assert store.known_ids([]) == set()
+    store.close()
+
+
+def test_failed_notices_are_processed_again_next_run(tmp_path):
+    path = str(tmp_path / "state.db")
+    store = StateStore(path)
+    store.mark_scraped([record(notice_id) for notice_id in range(1, 6)])
+    # A notice seen again keeps its first record
+    store.mark_scraped([record(1, "SOMEONE ELSE")])
+    # Notices 2 and 4 failed in the Groq step
+    store.mark_processed([record(1), record(3), record(5)])
+    store.close()
+
+    store = StateStore(path)
+    assert list(store.unprocessed_records()) == [record(2), record(4)]
+    store.mark_processed([record(2), record(4)])
+    assert list(store.unprocessed_records()) == []
+    store.close()
+
+
+def test_unprocessed_records_stream_in_scrape_order(tmp_path):
+    store = StateStore(str(tmp_path / "state.db"))
+    store.mark_scraped([record(notice_id) for notice_id in range(1300, 0, -1)])
+    assert [r["url"] for r in store.unprocessed_records()] == [record(n)["url"] for n in range(1300, 0, -1)]
+    store.close()